@@ -0,0 +1,134 @@
+import os
+import pickle
+import struct
+import sys
+
+import numpy as np
+
+from src.config import BOARD_COLS, BOARD_ROWS, WIN_LENGTH
+from src.game_logic.lines import get_line_table
+from src.game_logic.state_index import NUM_CODES, code_of_flat
+
+# Formato binario versionado: cabecera fija + un registro de ancho fijo por código base 3 del tablero
+MAGIC = b"TTTLKUP\x00"
+FORMAT_VERSION = 1
+# magic, versión, filas, columnas, k en raya, tamaño de registro, número de registros
+HEADER_STRUCT = struct.Struct("<8sHBBBxHI")
+HEADER_SIZE = 32
+
+# Mejor jugada (índice de casilla, -1 si no hay), puntaje minimax (perspectiva del jugador 1)
+# y máscara de bits con todas las jugadas óptimas
+RECORD_DTYPE = np.dtype([("move", "i1"), ("score", "i1"), ("optimal_mask", "<u2")])
+
+
+def empty_records(num_records=NUM_CODES):
+    records = np.zeros(num_records, dtype=RECORD_DTYPE)
+    records["move"] = -1
+    return records
+
+
+def write_header(f, num_records, rows=BOARD_ROWS, cols=BOARD_COLS, win_length=WIN_LENGTH):
+    header = HEADER_STRUCT.pack(MAGIC, FORMAT_VERSION, rows, cols, win_length, RECORD_DTYPE.itemsize, num_records)
+    f.write(header.ljust(HEADER_SIZE, b"\x00"))
+
+
+def write_table(path, records, rows=BOARD_ROWS, cols=BOARD_COLS, win_length=WIN_LENGTH):
+    """Escribe la cabecera y los registros en disco."""
+    with open(path, "wb") as f:
+        write_header(f, len(records), rows, cols, win_length)
+        f.write(np.ascontiguousarray(records, dtype=RECORD_DTYPE).tobytes())
+
+
+def read_header(path):
+    with open(path, "rb") as f:
+        raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE:
+        raise ValueError(f"{path}: archivo demasiado corto para ser una tabla de juego")
+
+    magic, version, rows, cols, win_length, record_size, num_records = HEADER_STRUCT.unpack_from(raw)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: no es una tabla de juego (magic {magic!r})")
+    if version != FORMAT_VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path}: versión de formato no soportada ({version}, registro de {record_size} bytes)")
+    return {"rows": rows, "cols": cols, "win_length": win_length, "num_records": num_records}
+
+
+class LookupTable:
+    """
+    Tabla de juego perfecto mapeada en memoria (solo lectura).
+    Al usar numpy.memmap todos los procesos comparten las mismas páginas a través del sistema operativo.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        header = read_header(path)
+        self.rows = header["rows"]
+        self.cols = header["cols"]
+        self.win_length = header["win_length"]
+        self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(header["num_records"],))
+
+    def best_move(self, code):
+        """(fila, col) de la mejor jugada para el jugador en turno, o None."""
+        move = int(self.records["move"][code])
+        return divmod(move, self.cols) if move >= 0 else None
+
+    def score(self, code) -> int:
+        """Puntaje minimax (+1 gana el jugador 1, -1 gana el jugador 2, 0 empate)."""
+        return int(self.records["score"][code])
+
+    def optimal_moves(self, code):
+        """Todas las jugadas que conservan el puntaje minimax."""
+        mask = int(self.records["optimal_mask"][code])
+        return [divmod(cell, self.cols) for cell in range(self.rows * self.cols) if mask >> cell & 1]
+
+    def moves_by_code(self):
+        """Lista de jugadas por código (None si no hay) para consultas rápidas desde Python."""
+        cells = [divmod(cell, self.cols) for cell in range(self.rows * self.cols)]
+        return [cells[move] if move >= 0 else None for move in self.records["move"].tolist()]
+
+    def scores_by_code(self):
+        """Lista de puntajes minimax por código, análoga a moves_by_code."""
+        return self.records["score"].tolist()
+
+
+def convert_pickle(pickle_path="tictactoe_lookup.pkl", output_path="tictactoe_lookup.bin"):
+    """Convierte la tabla {tupla_plana: {"move", "score"}} al formato binario, calculando la máscara óptima."""
+    with open(pickle_path, "rb") as f:
+        lookup_table = pickle.load(f)
+
+    geometry = get_line_table()
+    records = empty_records()
+    for state_hash, move_data in lookup_table.items():
+        code = code_of_flat(state_hash)
+        score = move_data["score"]
+        move = move_data["move"]
+
+        p1_bits = sum(1 << cell for cell, value in enumerate(state_hash) if value == 1)
+        p2_bits = sum(1 << cell for cell, value in enumerate(state_hash) if value == 2)
+        turn = 1 if bin(p1_bits).count("1") == bin(p2_bits).count("1") else 2
+
+        optimal_mask = 0
+        for cell, value in enumerate(state_hash):
+            if value != 0:
+                continue
+            mover_bits = (p1_bits if turn == 1 else p2_bits) | 1 << cell
+            if geometry.winning_line(mover_bits) is not None:
+                child_score = 1 if turn == 1 else -1
+            elif (p1_bits | p2_bits | 1 << cell) == geometry.full_mask:
+                child_score = 0
+            else:
+                child_score = lookup_table[state_hash[:cell] + (turn,) + state_hash[cell + 1 :]]["score"]
+            if child_score == score:
+                optimal_mask |= 1 << cell
+
+        records[code] = (move[0] * BOARD_COLS + move[1], score, optimal_mask)
+
+    write_table(output_path, records)
+    return len(lookup_table)
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else "tictactoe_lookup.pkl"
+    target = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(source)[0] + ".bin"
+    count = convert_pickle(source, target)
+    print(f"Hecho. {count} estados convertidos a {target} ({os.path.getsize(target)} bytes)")
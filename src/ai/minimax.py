@@ -1,7 +1,8 @@
 import math
-from copy import deepcopy
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
+from src.ai.search import build_search_tree, search
+from src.ai.transposition import MoveOrdering, TranspositionTable
 from src.game_logic.board import Board
 
 
@@ -11,6 +12,7 @@ def minimax_bruteforce(
     is_maximizing: bool,
     counter: Dict[str, int],
     maximizing_player_id: int,
+    tt: Optional[TranspositionTable] = None,
 ) -> int:
     counter["nodes"] += 1
 
@@ -20,6 +22,13 @@ def minimax_bruteforce(
     if board.is_full():
         return 0
 
+    # Sin poda todos los valores son exactos: la tabla actúa como memoización
+    if tt is not None:
+        key = (board.code, maximizing_player_id)
+        cached, _, _ = tt.probe(key, -math.inf, math.inf)
+        if cached is not None:
+            return cached
+
     if is_maximizing:
         best_score = -math.inf
         for move in board.get_available_moves():
@@ -27,12 +36,11 @@ def minimax_bruteforce(
 
             board.make_move(move[0], move[1])
 
-            score = minimax_bruteforce(board, depth + 1, False, counter, maximizing_player_id)
+            score = minimax_bruteforce(board, depth + 1, False, counter, maximizing_player_id, tt)
 
             board.undo_move(move[0], move[1], *prev_state)
 
             best_score = max(score, best_score)
-        return best_score
     else:
         best_score = math.inf
         for move in board.get_available_moves():
@@ -40,12 +48,15 @@ def minimax_bruteforce(
 
             board.make_move(move[0], move[1])
 
-            score = minimax_bruteforce(board, depth + 1, True, counter, maximizing_player_id)
+            score = minimax_bruteforce(board, depth + 1, True, counter, maximizing_player_id, tt)
 
             board.undo_move(move[0], move[1], *prev_state)
 
             best_score = min(score, best_score)
-        return best_score
+
+    if tt is not None:
+        tt.store(key, best_score, -math.inf, math.inf)
+    return best_score
 
 
 def minimax_alpha_beta(
@@ -56,6 +67,8 @@ def minimax_alpha_beta(
     is_maximizing: bool,
     counter: Dict[str, int],
     maximizing_player_id: int,
+    tt: Optional[TranspositionTable] = None,
+    ordering: Optional[MoveOrdering] = None,
 ) -> int:
     counter["nodes"] += 1
 
@@ -64,34 +77,54 @@ def minimax_alpha_beta(
     if board.is_full():
         return 0
 
+    if tt is not None:
+        key = (board.code, maximizing_player_id)
+        cached, alpha, beta = tt.probe(key, alpha, beta)
+        if cached is not None:
+            return cached
+    # Ventana efectivamente buscada: define el tipo de cota que se guarda
+    alpha_orig, beta_orig = alpha, beta
+
+    moves = board.get_available_moves()
+    if ordering is not None:
+        moves = ordering.order(moves)
+
     if is_maximizing:
         best_score = -math.inf
-        for move in board.get_available_moves():
+        for move in moves:
             prev_state = (board.turn, board.winner, board.game_over, board.win_info)
 
             board.make_move(move[0], move[1])
 
-            score = minimax_alpha_beta(board, depth + 1, alpha, beta, False, counter, maximizing_player_id)
+            score = minimax_alpha_beta(
+                board, depth + 1, alpha, beta, False, counter, maximizing_player_id, tt, ordering
+            )
 
             board.undo_move(move[0], move[1], *prev_state)
 
             best_score = max(score, best_score)
             alpha = max(alpha, best_score)
             if beta <= alpha:
+                if ordering is not None:
+                    ordering.record_cutoff(move, len(moves))
                 break
-        return best_score
     else:
         best_score = math.inf
-        for move in board.get_available_moves():
+        for move in moves:
             prev_state = (board.turn, board.winner, board.game_over, board.win_info)
             board.make_move(move[0], move[1])
-            score = minimax_alpha_beta(board, depth + 1, alpha, beta, True, counter, maximizing_player_id)
+            score = minimax_alpha_beta(board, depth + 1, alpha, beta, True, counter, maximizing_player_id, tt, ordering)
             board.undo_move(move[0], move[1], *prev_state)
             best_score = min(score, best_score)
             beta = min(beta, best_score)
             if beta <= alpha:
+                if ordering is not None:
+                    ordering.record_cutoff(move, len(moves))
                 break
-        return best_score
+
+    if tt is not None:
+        tt.store(key, best_score, alpha_orig, beta_orig)
+    return best_score
 
 
 def find_best_move_bruteforce(
@@ -128,7 +161,11 @@ def find_best_move_bruteforce(
     return best_move, graph_data
 
 
-def find_best_move_alpha_beta(board: Board) -> Tuple[Tuple[int, int], List[dict]]:
+def find_best_move_alpha_beta(
+    board: Board,
+    tt: Optional[TranspositionTable] = None,
+    ordering: Optional[MoveOrdering] = None,
+) -> Tuple[Tuple[int, int], List[dict]]:
     best_score = -math.inf
     best_move = None
     graph_data = []
@@ -145,7 +182,7 @@ def find_best_move_alpha_beta(board: Board) -> Tuple[Tuple[int, int], List[dict]
 
         current_board_snapshot = [row[:] for row in board.board]
 
-        score = minimax_alpha_beta(board, 0, -math.inf, math.inf, False, {"nodes": 0}, ai_player_id)
+        score = minimax_alpha_beta(board, 0, -math.inf, math.inf, False, {"nodes": 0}, ai_player_id, tt, ordering)
 
         board.undo_move(move[0], move[1], *prev_state)
 
@@ -156,13 +193,33 @@ def find_best_move_alpha_beta(board: Board) -> Tuple[Tuple[int, int], List[dict]
     return best_move, graph_data
 
 
+def _score_position(board: Board, is_maximizing: bool, ai_player_id: int, scoring_function, tt, ordering) -> int:
+    """Valor minimax exacto de la posición actual con la función de puntaje elegida (ventana completa)."""
+    if scoring_function.__name__ == "minimax_bruteforce":
+        return scoring_function(board, 0, is_maximizing, {"nodes": 0}, ai_player_id, tt)
+    return scoring_function(board, 0, -math.inf, math.inf, is_maximizing, {"nodes": 0}, ai_player_id, tt, ordering)
+
+
 def get_focused_tree(
     board: Board,
     ai_player_id: int,
     scoring_function,
     current_depth=0,
     max_viz_depth=3,
+    tt: Optional[TranspositionTable] = None,
+    ordering: Optional[MoveOrdering] = None,
+    memo: Optional[Dict[int, int]] = None,
 ):
+    """
+    Árbol enfocado para la GUI: puntúa todas las jugadas del nodo y expande solo la elegida.
+    Trabaja con make/undo sobre el mismo tablero (sin copias) y memoiza, dentro de una llamada,
+    los puntajes por código de posición; la tabla de transposición reutiliza los subárboles ya resueltos.
+    """
+    if tt is None:
+        tt = TranspositionTable()
+    if memo is None:
+        memo = {}
+
     # Caso base: Juego terminado o profundidad máxima alcanzada
     if board.game_over or current_depth >= max_viz_depth:
         score = 0
@@ -190,23 +247,16 @@ def get_focused_tree(
         }
 
     for move in moves:
-        temp_board = deepcopy(board)
-        temp_board.make_move(move[0], move[1])
+        prev_state = (board.turn, board.winner, board.game_over, board.win_info)
+        board.make_move(move[0], move[1])
 
-        if scoring_function.__name__ == "minimax_bruteforce":
-            score = scoring_function(temp_board, 0, not is_maximizing, {"nodes": 0}, ai_player_id)
-        else:
-            score = scoring_function(
-                temp_board,
-                0,
-                -math.inf,
-                math.inf,
-                not is_maximizing,
-                {"nodes": 0},
-                ai_player_id,
-            )
+        score = memo.get(board.code)
+        if score is None:
+            score = _score_position(board, not is_maximizing, ai_player_id, scoring_function, tt, ordering)
+            memo[board.code] = score
+        candidates.append({"move": move, "score": score, "board_matrix": [row[:] for row in board.board]})
 
-        candidates.append({"move": move, "score": score, "board": temp_board})
+        board.undo_move(move[0], move[1], *prev_state)
 
     # Elegir mejor candidato para el camino principal
     if is_maximizing:
@@ -226,21 +276,29 @@ def get_focused_tree(
         is_best_path = cand["move"] == best_candidate["move"]
 
         if is_best_path:
+            move = cand["move"]
+            prev_state = (board.turn, board.winner, board.game_over, board.win_info)
+            board.make_move(move[0], move[1])
             child_node = get_focused_tree(
-                cand["board"],  # Aquí pasamos el objeto Board porque la recursión lo necesita
+                board,
                 ai_player_id,
                 scoring_function,
                 current_depth + 1,
                 max_viz_depth,
+                tt,
+                ordering,
+                memo,
             )
+            board.undo_move(move[0], move[1], *prev_state)
+
             child_node["score"] = cand["score"]
             child_node["is_chosen"] = True
-            child_node["move"] = cand["move"]
+            child_node["move"] = move
             node["children"].append(child_node)
         else:
             leaf_node = {
                 "score": cand["score"],
-                "board_matrix": [row[:] for row in cand["board"].board],
+                "board_matrix": cand["board_matrix"],
                 "children": [],
                 "is_chosen": False,
                 "move": cand["move"],
@@ -250,23 +308,36 @@ def get_focused_tree(
     return node
 
 
-def find_best_move_and_viz(board: Board, use_alpha_beta: bool):
+def find_best_move_and_viz(
+    board: Board,
+    use_alpha_beta: bool,
+    tt: Optional[TranspositionTable] = None,
+    ordering: Optional[MoveOrdering] = None,
+    deadline_ms: Optional[float] = None,
+):
     """
     Calcula el mejor movimiento y genera el árbol visual.
+    Con deadline_ms usa la búsqueda anytime (latencia acotada) y el árbol muestra su variante principal.
     Retorna: (best_move, tree_root_node)
     """
+    if deadline_ms is not None:
+        best_move, info = search(board, deadline_ms=deadline_ms)
+        return best_move, build_search_tree(board, best_move, info)
+
     ai_player_id = board.turn
 
     scoring_func = minimax_alpha_beta if use_alpha_beta else minimax_bruteforce
 
-    root_node = get_focused_tree(board, ai_player_id, scoring_func, max_viz_depth=3)
+    root_node = get_focused_tree(board, ai_player_id, scoring_func, max_viz_depth=3, tt=tt, ordering=ordering)
 
     best_move = root_node.get("best_move_coordinate")
 
     return best_move, root_node
 
 
-def get_simulation_move_bruteforce(board: Board) -> Tuple[Tuple[int, int], int]:
+def get_simulation_move_bruteforce(
+    board: Board, tt: Optional[TranspositionTable] = None
+) -> Tuple[Tuple[int, int], int]:
     """Retorna (mejor_movimiento, total_nodos_evaluados) para la simulación."""
 
     ai_player_id = board.turn
@@ -280,11 +351,13 @@ def get_simulation_move_bruteforce(board: Board) -> Tuple[Tuple[int, int], int]:
     total_nodes = 0
 
     for move in moves:
-        temp_board = deepcopy(board)
-        temp_board.make_move(move[0], move[1])
+        prev_state = (board.turn, board.winner, board.game_over, board.win_info)
+        board.make_move(move[0], move[1])
         counter = {"nodes": 0}
 
-        score = minimax_bruteforce(temp_board, 0, False, counter, ai_player_id)
+        score = minimax_bruteforce(board, 0, False, counter, ai_player_id, tt)
+
+        board.undo_move(move[0], move[1], *prev_state)
 
         total_nodes += counter["nodes"]
         if score > best_score:
@@ -294,7 +367,11 @@ def get_simulation_move_bruteforce(board: Board) -> Tuple[Tuple[int, int], int]:
     return best_move, total_nodes
 
 
-def get_simulation_move_alpha_beta(board: Board) -> Tuple[Tuple[int, int], int]:
+def get_simulation_move_alpha_beta(
+    board: Board,
+    tt: Optional[TranspositionTable] = None,
+    ordering: Optional[MoveOrdering] = None,
+) -> Tuple[Tuple[int, int], int]:
     """
     Retorna (mejor_movimiento, total_nodos_evaluados). Para la simulación
     """
@@ -305,16 +382,21 @@ def get_simulation_move_alpha_beta(board: Board) -> Tuple[Tuple[int, int], int]:
     if not moves:
         return (0, 0), 0
 
+    if ordering is not None:
+        moves = ordering.order(moves)
+
     best_score = -math.inf
     best_move = moves[0]
     counter = {"nodes": 0}
     alpha, beta = -math.inf, math.inf
 
     for move in moves:
-        temp_board = deepcopy(board)
-        temp_board.make_move(move[0], move[1])
+        prev_state = (board.turn, board.winner, board.game_over, board.win_info)
+        board.make_move(move[0], move[1])
 
-        score = minimax_alpha_beta(temp_board, 0, alpha, beta, False, counter, ai_player_id)
+        score = minimax_alpha_beta(board, 0, alpha, beta, False, counter, ai_player_id, tt, ordering)
+
+        board.undo_move(move[0], move[1], *prev_state)
 
         if score > best_score:
             best_score = score
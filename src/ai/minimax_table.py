@@ -1,7 +1,9 @@
 import math
 import pickle
 
+from src.ai.lookup_table import convert_pickle
 from src.game_logic.board import Board
+from src.game_logic.state_index import NUM_CODES, code_of_flat
 
 
 def get_board_hash(board_matrix):
@@ -9,6 +11,19 @@ def get_board_hash(board_matrix):
     return tuple(item for row in board_matrix for item in row)
 
 
+def index_lookup_table(lookup_table):
+    """
+    Reindexa la tabla {tupla_plana: {"move", "score"}} por código base 3.
+    Retorna una lista de NUM_CODES jugadas (None donde no hay entrada) para consultarla con board.code.
+    """
+    moves_by_code = [None] * NUM_CODES
+    if not lookup_table:
+        return moves_by_code
+    for state_hash, move_data in lookup_table.items():
+        moves_by_code[code_of_flat(state_hash)] = move_data["move"] if isinstance(move_data, dict) else move_data
+    return moves_by_code
+
+
 def precompute_all_states():
     lookup_table = {}
 
@@ -54,6 +69,9 @@ def precompute_all_states():
     with open("tictactoe_lookup.pkl", "wb") as f:
         pickle.dump(lookup_table, f)
 
+    # Versión binaria mapeable en memoria (la que cargan el gimnasio, los evaluadores y la GUI)
+    convert_pickle("tictactoe_lookup.pkl", "tictactoe_lookup.bin")
+
     print(f"Hecho. Estados guardados: {len(lookup_table)}")
 
 
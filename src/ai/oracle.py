@@ -0,0 +1,86 @@
+import os
+import pickle
+
+from src.ai.lookup_table import LookupTable
+from src.ai.minimax_table import index_lookup_table
+from src.config import BOARD_COLS, BOARD_ROWS, WIN_LENGTH
+from src.game_logic.state_index import NUM_CELLS
+
+DEFAULT_LOOKUP_PATH = "tictactoe_lookup.bin"
+# Hasta este tamaño la tabla binaria se copia a una lista de jugadas (consulta más rápida desde Python);
+# las tablas mayores (p. ej. 4x4 del resolvedor retrógrado) se consultan directamente sobre el memmap
+MOVES_LIST_MAX_RECORDS = 3**12
+
+
+def resolve_lookup_path(path):
+    """Prefiere la tabla binaria (.bin); recurre al .pkl con el mismo nombre si es lo único disponible."""
+    root, ext = os.path.splitext(path)
+    if ext not in (".pkl", ".bin"):
+        return path
+    for candidate in (root + ".bin", root + ".pkl"):
+        if os.path.exists(candidate):
+            return candidate
+    return path
+
+
+class OpponentOracle:
+    """
+    Oponente perfecto respaldado por la tabla precalculada de minimax (binaria mapeada en memoria o .pkl).
+    La tabla se carga una sola vez por proceso (ver shared) y se recarga solo si cambia el mtime del archivo.
+    Si la tabla no existe o es de otra geometría (filas, columnas, k en raya) el oráculo queda no disponible.
+    """
+
+    _instances = {}
+
+    def __init__(self, path=DEFAULT_LOOKUP_PATH):
+        self.path = path
+        self.moves_by_code = None
+        self.scores_by_code = None  # Solo con tabla binaria: el .pkl guarda jugadas, no puntajes
+        self.table = None  # LookupTable cuando el origen es binario
+        self.available = False
+        self._source = None
+
+    @classmethod
+    def shared(cls, path=DEFAULT_LOOKUP_PATH):
+        """Instancia única por ruta dentro del proceso."""
+        key = os.path.abspath(resolve_lookup_path(path))
+        if key not in cls._instances:
+            cls._instances[key] = cls(path)
+        return cls._instances[key].refresh()
+
+    def refresh(self):
+        """Recarga la tabla si el archivo cambió (o desapareció) desde la última carga."""
+        path = resolve_lookup_path(self.path)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+
+        if self._source is None or (path, mtime) != self._source:
+            self.table = None
+            self.moves_by_code = None
+            self.scores_by_code = None
+            if mtime is not None and path.endswith(".bin"):
+                table = LookupTable(path)
+                if (table.rows, table.cols, table.win_length) == (BOARD_ROWS, BOARD_COLS, WIN_LENGTH):
+                    self.table = table
+                    if len(table.records) <= MOVES_LIST_MAX_RECORDS:
+                        self.moves_by_code = table.moves_by_code()
+                        self.scores_by_code = table.scores_by_code()
+            elif mtime is not None:
+                with open(path, "rb") as f:
+                    lookup_table = pickle.load(f)
+                # El .pkl clásico no guarda la geometría: solo se acepta si las claves tienen una casilla por celda
+                if lookup_table and len(next(iter(lookup_table))) == NUM_CELLS:
+                    self.moves_by_code = index_lookup_table(lookup_table)
+            self.available = self.moves_by_code is not None or self.table is not None
+            self._source = (path, mtime)
+        return self
+
+    def get_move(self, board):
+        """Jugada óptima para el jugador en turno, o None si la posición no está en la tabla."""
+        if self.moves_by_code is not None:
+            return self.moves_by_code[board.code]
+        if self.table is not None:
+            return self.table.best_move(board.code)
+        return None
@@ -0,0 +1,261 @@
+from typing import Callable, Dict, List, Tuple
+
+from src.ai.minimax import find_best_move_alpha_beta
+from src.ai.oracle import OpponentOracle
+from src.ai.search import search
+from src.config import AI_MOVE_DEADLINE_MS
+from src.game_logic.engine import create_simulation_board
+
+# Resultado exacto desde la perspectiva del agente: (p_victoria, p_derrota, p_empate),
+# en el mismo orden que los conteos de evaluate_vs_minimax
+Outcome = Tuple[float, float, float]
+WIN, LOSS, DRAW = (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0)
+
+# Una política es una función tablero -> [(jugada, probabilidad)]
+Policy = Callable[[object], List[Tuple[Tuple[int, int], float]]]
+
+
+def minimax_opponent(oracle: OpponentOracle = None, move_deadline_ms=AI_MOVE_DEADLINE_MS) -> Policy:
+    """Oponente perfecto determinista: la jugada de la tabla (o de la búsqueda si la posición no está en ella)."""
+    oracle = oracle or OpponentOracle.shared()
+
+    def policy(board):
+        move = oracle.get_move(board)
+        if move is None and move_deadline_ms is not None:
+            move, _ = search(board, deadline_ms=move_deadline_ms)
+        elif move is None:
+            move, _ = find_best_move_alpha_beta(board)
+        return [(move, 1.0)]
+
+    return policy
+
+
+def random_opponent(board):
+    """Oponente uniformemente aleatorio sobre las casillas libres."""
+    moves = board.get_available_moves()
+    probability = 1.0 / len(moves)
+    return [(move, probability) for move in moves]
+
+
+def greedy_policy(agent) -> Policy:
+    """Política greedy del agente (epsilon = 0) con el desempate uniforme de choose_action."""
+
+    def policy(board):
+        moves = agent.greedy_moves(board)
+        probability = 1.0 / len(moves)
+        return [(move, probability) for move in moves]
+
+    return policy
+
+
+def evaluate_seat(agent_policy: Policy, opponent_policy: Policy, agent_seat: int, memo=None, parents=None) -> Outcome:
+    """
+    Recorre una sola vez el árbol de partidas con el agente en el asiento dado, ponderando cada rama por
+    su probabilidad. memo (código -> resultado) evita repetir las posiciones a las que se llega por
+    varios caminos; si se pasa parents (código -> códigos padre) se anota el grafo recorrido.
+    """
+    memo = {} if memo is None else memo
+    board = create_simulation_board()
+
+    def visit():
+        cached = memo.get(board.code)
+        if cached is not None:
+            return cached
+
+        if board.game_over:
+            if not board.winner:
+                outcome = DRAW
+            else:
+                outcome = WIN if board.winner == agent_seat else LOSS
+        else:
+            policy = agent_policy if board.turn == agent_seat else opponent_policy
+            win = loss = draw = 0.0
+            for move, probability in policy(board):
+                prev_state = (board.turn, board.winner, board.game_over, board.win_info)
+                parent_code = board.code
+                board.make_move(move[0], move[1])
+                if parents is not None:
+                    parents.setdefault(board.code, set()).add(parent_code)
+                child_win, child_loss, child_draw = visit()
+                board.undo_move(move[0], move[1], *prev_state)
+                win += probability * child_win
+                loss += probability * child_loss
+                draw += probability * child_draw
+            outcome = (win, loss, draw)
+
+        memo[board.code] = outcome
+        return outcome
+
+    return visit()
+
+
+def resolve_opponent(opponent="minimax", oracle: OpponentOracle = None) -> Policy:
+    """ "minimax", "random" o directamente una política."""
+    if callable(opponent):
+        return opponent
+    if opponent == "minimax":
+        return minimax_opponent(oracle)
+    if opponent == "random":
+        return random_opponent
+    raise ValueError(f"Oponente desconocido: {opponent!r}. Opciones: 'minimax', 'random' o una política")
+
+
+def evaluate_policy(agent, opponent="minimax", oracle: OpponentOracle = None, seats=(1, 2)) -> Outcome:
+    """
+    Evaluación exacta de la política greedy del agente: probabilidades de victoria, derrota y empate
+    promediadas sobre los asientos (evaluate_vs_minimax alterna: la mitad de las partidas como jugador 1).
+    No juega partidas ni modifica el epsilon del agente.
+    """
+    opponent_policy = resolve_opponent(opponent, oracle)
+    agent_policy = greedy_policy(agent)
+    results = [evaluate_seat(agent_policy, opponent_policy, seat) for seat in seats]
+    return tuple(sum(result[i] for result in results) / len(results) for i in range(3))
+
+
+class PolicyEvaluator:
+    """
+    evaluate_policy con caché entre llamadas para un mismo agente (p. ej. los checkpoints de entrenamiento).
+    Si la huella de la política greedy (agent.policy_changes) no cambió se reutiliza el último resultado;
+    si cambiaron algunos estados solo se borran del memo esas posiciones y sus ancestros en el grafo
+    recorrido, y el nuevo recorrido reutiliza el resto. El resultado es idéntico al de evaluate_policy.
+    """
+
+    def __init__(self, agent, opponent="minimax", oracle: OpponentOracle = None, seats=(1, 2)):
+        self.agent = agent
+        self.seats = seats
+        self.opponent_policy = resolve_opponent(opponent, oracle)
+        self.agent_policy = greedy_policy(agent)
+        self.memos = {seat: {} for seat in seats}
+        self.parents = {seat: {} for seat in seats}
+        self.fingerprint = None
+        self.result = None
+        self.stats = {"cached": 0, "partial": 0, "full": 0}
+
+    def _invalidate(self, changed_codes):
+        for seat in self.seats:
+            memo, parents = self.memos[seat], self.parents[seat]
+            stack = [code for code in changed_codes if code in memo]
+            while stack:
+                code = stack.pop()
+                if memo.pop(code, None) is not None:
+                    stack.extend(parents.get(code, ()))
+
+    def evaluate(self) -> Outcome:
+        self.fingerprint, changed_codes = self.agent.policy_changes(self.fingerprint)
+        if self.result is not None and changed_codes is not None and not changed_codes:
+            self.stats["cached"] += 1
+            return self.result
+
+        if self.result is None or changed_codes is None:
+            self.stats["full"] += 1
+            self.memos = {seat: {} for seat in self.seats}
+            self.parents = {seat: {} for seat in self.seats}
+        else:
+            self.stats["partial"] += 1
+            self._invalidate(changed_codes)
+
+        results = [
+            evaluate_seat(self.agent_policy, self.opponent_policy, seat, self.memos[seat], self.parents[seat])
+            for seat in self.seats
+        ]
+        self.result = tuple(sum(result[i] for result in results) / len(results) for i in range(3))
+        return self.result
+
+
+def _game_score(board, oracle: OpponentOracle, solved: Dict[int, int]) -> int:
+    """Puntaje minimax exacto (+1 gana el jugador 1): de la tabla si está cargada; si no, resuelto y memorizado."""
+    if board.game_over:
+        return {1: 1, 2: -1}.get(board.winner, 0)
+    if oracle is not None and oracle.scores_by_code is not None:
+        return oracle.scores_by_code[board.code]
+    if oracle is not None and oracle.table is not None:
+        return oracle.table.score(board.code)
+
+    cached = solved.get(board.code)
+    if cached is not None:
+        return cached
+    scores = []
+    for move in board.get_available_moves():
+        prev_state = (board.turn, board.winner, board.game_over, board.win_info)
+        board.make_move(move[0], move[1])
+        scores.append(_game_score(board, None, solved))
+        board.undo_move(move[0], move[1], *prev_state)
+    score = max(scores) if board.turn == 1 else min(scores)
+    solved[board.code] = score
+    return score
+
+
+def best_response_seat(agent_policy: Policy, agent_seat: int, oracle: OpponentOracle = None, solved=None):
+    """
+    Valor (+1 victoria, -1 derrota, 0 empate, desde el agente) del mejor oponente posible contra la política:
+    el rival elige en cada posición la jugada que minimiza el valor; el agente promedia sus empates.
+    En la misma pasada memorizada anota las posiciones explotables: aquellas, alcanzables contra algún
+    rival, donde alguna jugada greedy del agente empeora el valor minimax de la posición.
+    Retorna: (valor, valor minimax desde la raíz, códigos explotables).
+    """
+    solved = {} if solved is None else solved
+    sign = 1 if agent_seat == 1 else -1
+    # memo: código -> (valor contra el mejor rival, valor minimax), ambos desde el agente
+    memo, exploitable = {}, set()
+    board = create_simulation_board()
+    cell_codes = board.geometry.cell_codes
+
+    def child(move):
+        # El código del hijo se calcula sin mover: solo se juega la jugada si la posición es nueva
+        cached = memo.get(board.code + board.turn * cell_codes[move[0]][move[1]])
+        if cached is not None:
+            return cached
+        prev_state = (board.turn, board.winner, board.game_over, board.win_info)
+        board.make_move(move[0], move[1])
+        result = visit()
+        board.undo_move(move[0], move[1], *prev_state)
+        return result
+
+    def visit():
+        if board.game_over:
+            value = 0 if not board.winner else (1 if board.winner == agent_seat else -1)
+            memo[board.code] = (value, value)
+            return value, value
+
+        position_score = sign * _game_score(board, oracle, solved)
+        if board.turn == agent_seat:
+            value, mistake = 0.0, False
+            for move, probability in agent_policy(board):
+                child_value, child_score = child(move)
+                value += probability * child_value
+                mistake = mistake or child_score < position_score
+            if mistake:
+                exploitable.add(board.code)
+        else:
+            value = min(child(move)[0] for move in board.get_available_moves())
+
+        memo[board.code] = (value, position_score)
+        return value, position_score
+
+    value, game_value = visit()
+    return value, game_value, sorted(exploitable)
+
+
+def best_response(agent, oracle: OpponentOracle = None, seats=(1, 2)) -> Dict:
+    """
+    Análisis de explotabilidad de la política greedy del agente sobre todo el árbol, sin jugar partidas.
+    Retorna un dict con value (valor medio contra el mejor rival, por asiento en by_seat), exploitability
+    (valor minimax menos value: 0 si ningún rival puede sacar ventaja) y exploitable_states (códigos de las
+    posiciones donde la política se equivoca).
+    """
+    oracle = oracle or OpponentOracle.shared()
+    agent_policy = greedy_policy(agent)
+    solved, by_seat, game_values, exploitable = {}, {}, [], set()
+    for seat in seats:
+        value, game_value, states = best_response_seat(agent_policy, seat, oracle, solved)
+        by_seat[seat] = value
+        game_values.append(game_value)
+        exploitable.update(states)
+
+    value = sum(by_seat.values()) / len(seats)
+    return {
+        "value": value,
+        "by_seat": by_seat,
+        "exploitability": sum(game_values) / len(seats) - value,
+        "exploitable_states": sorted(exploitable),
+    }
@@ -0,0 +1,146 @@
+import random
+from functools import lru_cache
+
+import numpy as np
+
+from src.config import BOARD_COLS, BOARD_ROWS
+from src.game_logic.state_index import NUM_CELLS, code_of, decode, get_state_index
+
+# Acción (fila, col) <-> índice de columna en la tabla
+ACTIONS = [(row, col) for row in range(BOARD_ROWS) for col in range(BOARD_COLS)]
+
+
+def action_index(action) -> int:
+    return action[0] * BOARD_COLS + action[1]
+
+
+@lru_cache(maxsize=None)
+def get_legal_actions(index=None):
+    """Para cada id de estado del índice, arreglo con los índices de las casillas vacías (compartido por proceso)."""
+    index = index or get_state_index()
+    legal = []
+    for code in index.codes:
+        cells = [value for row in decode(code) for value in row]
+        legal.append(np.flatnonzero(np.array(cells) == 0))
+    return legal
+
+
+@lru_cache(maxsize=None)
+def get_legal_mask(index=None):
+    """Matriz booleana [estados, casillas] con las acciones legales (compartida por proceso)."""
+    legal = get_legal_actions(index)
+    mask = np.zeros((len(legal), NUM_CELLS), dtype=bool)
+    for state_id, actions in enumerate(legal):
+        mask[state_id, actions] = True
+    return mask
+
+
+class ArrayQTable:
+    """
+    Q-table densa float32 de forma [num_estados, casillas] indexada por el id denso de StateIndex
+    (o de otro índice, p. ej. el de estados canónicos de SymmetryTable).
+    Acepta además claves (estado_tupla, (fila, col)) para ser compatible con el formato dict.
+    visited marca las entradas actualizadas alguna vez: son las que existirían como claves en el dict
+    (pertenencia, len y to_dict). Para valores sin esa marca (ndarray de un worker) se toman las no nulas.
+    """
+
+    def __init__(self, values=None, index=None, visited=None):
+        self.index = index or get_state_index()
+        self.legal_actions = get_legal_actions(index)
+        self.legal_mask = get_legal_mask(index)
+        if values is None:
+            values = np.zeros((self.index.num_states, NUM_CELLS), dtype=np.float32)
+        self.values = values
+        self.visited = values != 0 if visited is None else visited
+
+    @classmethod
+    def from_dict(cls, q_dict, index=None):
+        """Convierte una tabla {(estado_tupla, (fila, col)): q} (modelos .pkl existentes)."""
+        table = cls(index=index)
+        for (state, action), q_value in q_dict.items():
+            state_id = table.index.id_of(state)
+            if state_id >= 0:
+                table.values[state_id, action_index(action)] = q_value
+                table.visited[state_id, action_index(action)] = True
+        return table
+
+    def to_dict(self):
+        """Exporta las entradas visitadas al formato dict clásico."""
+        q_dict = {}
+        for state_id, action_idx in zip(*np.nonzero(self.visited)):
+            state = tuple(tuple(row) for row in decode(self.index.codes[state_id]))
+            q_dict[(state, ACTIONS[action_idx])] = float(self.values[state_id, action_idx])
+        return q_dict
+
+    def _resolve(self, key):
+        state, action = key
+        state_id = state if isinstance(state, (int, np.integer)) else self.index.dense_ids[code_of(state)]
+        return state_id, action_index(action)
+
+    def __contains__(self, key):
+        state_id, action_idx = self._resolve(key)
+        return state_id >= 0 and bool(self.visited[state_id, action_idx])
+
+    def __getitem__(self, key):
+        state_id, action_idx = self._resolve(key)
+        return float(self.values[state_id, action_idx])
+
+    def __setitem__(self, key, q_value):
+        state_id, action_idx = self._resolve(key)
+        self.values[state_id, action_idx] = q_value
+        self.visited[state_id, action_idx] = True
+
+    def get(self, key, default=0.0):
+        return self[key] if key in self else default
+
+    def __len__(self):
+        return int(np.count_nonzero(self.visited))
+
+    def best_actions(self, state_id):
+        """Índices de las acciones legales con el valor Q máximo (argmax enmascarado)."""
+        legal = self.legal_actions[state_id]
+        q_values = self.values[state_id, legal]
+        return legal[q_values == q_values.max()]
+
+    def choose_greedy(self, state_id):
+        """Argmax enmascarado con desempate aleatorio; retorna (fila, col)."""
+        best = self.best_actions(state_id)
+        return ACTIONS[best[0] if len(best) == 1 else random.choice(best)]
+
+    def greedy_mask(self):
+        """Matriz booleana [estados, casillas] con las acciones de best_actions en cada estado (vectorizada)."""
+        masked = np.where(self.legal_mask, self.values, -np.inf)
+        return self.legal_mask & (masked == masked.max(axis=1, keepdims=True))
+
+    def max_q(self, state_id) -> float:
+        legal = self.legal_actions[state_id]
+        return float(self.values[state_id, legal].max()) if len(legal) else 0.0
+
+    def update(self, state_id, action, reward, next_state_id, done, alpha, gamma):
+        """Actualización de Bellman en el lugar."""
+        action_idx = action_index(action)
+        target = reward if done else reward + gamma * self.max_q(next_state_id)
+        old_q = self.values[state_id, action_idx]
+        self.values[state_id, action_idx] = old_q + alpha * (target - old_q)
+        self.visited[state_id, action_idx] = True
+
+    def update_batch(self, state_ids, actions, rewards, next_state_ids, done, alpha, gamma, weights=None):
+        """
+        Bellman por lotes con acciones como índices de casilla; retorna el error TD de cada muestra.
+        Las muestras de una misma entrada la mueven una sola vez hacia la media de sus objetivos (ponderada
+        por weights si se indica, con paso alpha * peso medio), como VectorEnv con partidas repetidas.
+        """
+        next_max = np.where(self.legal_mask[next_state_ids], self.values[next_state_ids], -np.inf).max(axis=1)
+        targets = rewards + gamma * np.where(done, 0.0, next_max)
+        td_errors = targets - self.values[state_ids, actions]
+        weights = np.ones(len(targets)) if weights is None else weights
+
+        _, first, inverse = np.unique(state_ids * NUM_CELLS + actions, return_index=True, return_inverse=True)
+        total = np.bincount(inverse, weights=weights)
+        targets = np.bincount(inverse, weights=weights * targets) / total
+        step = alpha * total / np.bincount(inverse)
+        state_ids, actions = state_ids[first], actions[first]
+        old_q = self.values[state_ids, actions]
+        self.values[state_ids, actions] = old_q + step * (targets - old_q)
+        self.visited[state_ids, actions] = True
+        return td_errors
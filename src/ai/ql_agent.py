@@ -1,39 +1,119 @@
 import pickle
 import random
-from typing import List, Tuple
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.ai.q_table import ACTIONS, ArrayQTable
+from src.config import Q_CANONICAL_STATES, Q_TABLE_BACKEND
+from src.game_logic.state_index import DENSE_INDEX_AVAILABLE, code_of, get_state_index
+from src.game_logic.symmetry import get_symmetry_table
+
+# Entradas del registro de cambios de la política greedy antes de descartar las más viejas
+POLICY_LOG_MAX = 50_000
 
 
 class QLearningAgent:
-    def __init__(self, alpha=0.5, gamma=0.9, epsilon=0.1):
-        self.q_table = {}  # (estado, accion) -> valor_q
+    def __init__(self, alpha=0.5, gamma=0.9, epsilon=0.1, backend=None, canonical=None):
+        # "dict": (estado_tupla, accion) -> valor_q | "array": ArrayQTable [estados, casillas]
+        # En tableros sin índice denso (más de 12 casillas) el backend por defecto es "dict"
+        self.backend = backend or (Q_TABLE_BACKEND if DENSE_INDEX_AVAILABLE else "dict")
+        # Modo canónico: rotaciones y reflejos de una posición comparten entradas de la tabla
+        canonical = Q_CANONICAL_STATES if canonical is None else canonical
+        self.symmetry = get_symmetry_table() if canonical else None
+        self.q_index = self.symmetry.index if canonical else None
+        self.q_table = ArrayQTable(index=self.q_index) if self.backend == "array" else {}
         self.alpha = alpha  # Tasa de aprendizaje
         self.gamma = gamma  # Factor de descuento (importancia de recompensas futuras)
         self.epsilon = epsilon  # Tasa de exploración
+        self.training_state = None  # Episodio y epsilon al terminar train_with_decay (para reanudarlo)
+        # Registro de cambios de la política greedy del backend dict (el backend array compara matrices de
+        # argmax en policy_changes): la entrada i corresponde a la versión _policy_log_start + i + 1
+        self.policy_version = 0
+        self._policy_log = []
+        self._policy_log_start = 0
+        self._best_q = {}  # Máximo Q por estado del backend dict (se recalcula solo si baja el máximo)
 
-    def get_state_key(self, board_list: List[List[int]]) -> tuple:
-        """Convierte el tablero (lista de listas) en una tupla inmutable."""
+    def get_state_key(self, board_list: List[List[int]]):
+        """Convierte el tablero (lista de listas) en una clave: tupla inmutable o id denso (backend array)."""
+        if self.backend == "array":
+            return get_state_index().id_of(board_list)
         return tuple(tuple(row) for row in board_list)
 
+    def get_board_state_key(self, board):
+        """Igual que get_state_key pero usando el código incremental del tablero (sin copiar la matriz)."""
+        if self.backend == "array":
+            return board.state_id
+        return tuple(tuple(row) for row in board.board)
+
+    def _canonical(self, state):
+        """(clave canónica, transformación) para una clave real (id denso o tupla)."""
+        state_id = state if isinstance(state, (int, np.integer)) else get_state_index().id_of(state)
+        canonical_id = self.symmetry.canonical_ids[state_id]
+        key = canonical_id if self.backend == "array" else self.symmetry.canonical_keys[canonical_id]
+        return key, self.symmetry.transform_of[state_id]
+
     def get_q_value(self, state, action) -> float:
         """Obtiene el valor Q de la tabla, retorna 0 si no existe."""
         return self.q_table.get((state, action), 0.0)
 
+    def get_q_values(self, board) -> Dict[Tuple[int, int], float]:
+        """Valores Q conocidos para las jugadas disponibles del tablero (para la interfaz)."""
+        state = self.get_board_state_key(board)
+        moves = board.get_available_moves()
+        if self.symmetry is not None:
+            state, transform = self._canonical(state)
+            keys = [self.symmetry.action_to_canonical[transform][move] for move in moves]
+        else:
+            keys = moves
+        return {move: self.q_table[(state, key)] for move, key in zip(moves, keys) if (state, key) in self.q_table}
+
     def choose_action(self, board) -> Tuple[int, int]:
         """Elige una acción usando la política epsilon-greedy."""
         available_moves = board.get_available_moves()
-        state = self.get_state_key(board.board)
 
         if random.random() < self.epsilon:
             return random.choice(available_moves)
 
-        q_values = [self.get_q_value(state, move) for move in available_moves]
-        max_q = max(q_values)
+        if self.backend == "array" and self.symmetry is None:
+            return self.q_table.choose_greedy(board.state_id)
+        return random.choice(self.greedy_moves(board))
+
+    def greedy_moves(self, board) -> List[Tuple[int, int]]:
+        """Todas las jugadas con el valor Q máximo (la política greedy elige una al azar entre ellas)."""
+        if self.backend == "array":
+            if self.symmetry is None:
+                return [ACTIONS[action] for action in self.q_table.best_actions(board.state_id)]
+            state, transform = self._canonical(board.state_id)
+            from_canonical = self.symmetry.action_from_canonical[transform]
+            return [from_canonical[ACTIONS[action]] for action in self.q_table.best_actions(state)]
 
-        best_moves = [move for move, q in zip(available_moves, q_values) if q == max_q]
-        return random.choice(best_moves)
+        available_moves = board.get_available_moves()
+        state = self.get_state_key(board.board)
+        keys = available_moves
+        if self.symmetry is not None:
+            state, transform = self._canonical(state)
+            keys = [self.symmetry.action_to_canonical[transform][move] for move in available_moves]
+
+        q_values = [self.get_q_value(state, key) for key in keys]
+        max_q = max(q_values)
+        return [move for move, q in zip(available_moves, q_values) if q == max_q]
 
     def learn(self, state, action, reward, next_state, next_available_moves, done):
         """Actualiza la tabla Q usando la fórmula de Bellman."""
+        if self.symmetry is not None:
+            # Estado, acción y jugadas siguientes se llevan al espacio canónico antes de actualizar
+            state, transform = self._canonical(state)
+            action = self.symmetry.action_to_canonical[transform][action]
+            if not done:
+                next_state, next_transform = self._canonical(next_state)
+                to_canonical = self.symmetry.action_to_canonical[next_transform]
+                next_available_moves = [to_canonical[move] for move in next_available_moves]
+
+        if self.backend == "array":
+            self.q_table.update(state, action, reward, next_state, done, self.alpha, self.gamma)
+            return
+
         old_q = self.get_q_value(state, action)
 
         if done:
@@ -46,7 +126,64 @@ class QLearningAgent:
             target = reward + self.gamma * next_max_q
 
         # Fórmula de actualización: Q(s,a) = Q(s,a) + alpha * (recompensa + gamma * maxQ(s',a') - Q(s,a))
-        self.q_table[(state, action)] = old_q + self.alpha * (target - old_q)
+        new_q = old_q + self.alpha * (target - old_q)
+        self.q_table[(state, action)] = new_q
+        # El argmax no cambia si el valor viejo y el nuevo quedan ambos por debajo del máximo guardado
+        best_before = self._best_q.get(state)
+        if best_before is None:
+            best_before = self._state_max_q(state, old_q, action)
+        if new_q >= best_before:
+            self._best_q[state] = new_q
+        elif old_q >= best_before:
+            self._best_q[state] = self._state_max_q(state)  # Bajó el máximo: único caso que recorre las jugadas
+        else:
+            self._best_q[state] = best_before
+            return
+        if new_q != old_q:
+            self._mark_policy_change(state)
+
+    def _state_max_q(self, state, old_q=None, action=None):
+        """Máximo Q de las casillas vacías de un estado dict (con old_q en lugar del valor actual de action)."""
+        moves = [(row, col) for row, values in enumerate(state) for col, value in enumerate(values) if value == 0]
+        return max(old_q if move == action else self.get_q_value(state, move) for move in moves)
+
+    def _mark_policy_change(self, state):
+        self.policy_version += 1
+        self._policy_log.append(state)
+        if len(self._policy_log) > POLICY_LOG_MAX:
+            # Se descarta la mitad más vieja: quien pida cambios anteriores recibe None (evaluación completa)
+            drop = len(self._policy_log) // 2
+            del self._policy_log[:drop]
+            self._policy_log_start += drop
+
+    def policy_changes(self, previous=None):
+        """
+        Huella de la política greedy y códigos de tablero (ver Board.code) cuya jugada greedy cambió desde
+        la huella `previous`: (huella, códigos), con códigos = None si no se puede saber (todos cambiaron).
+        Backend array: la huella es la matriz de argmax (exacta, sin costo en learn). Backend dict: la versión
+        del registro que learn mantiene (incluye cambios posibles, nunca omite uno real).
+        """
+        if self.backend == "array":
+            fingerprint = self.q_table.greedy_mask()
+            if previous is None or previous.shape != fingerprint.shape:
+                return fingerprint, None
+            states = np.flatnonzero((fingerprint != previous).any(axis=1)).tolist()
+        else:
+            fingerprint = self.policy_version
+            if previous is None or previous < self._policy_log_start:
+                return fingerprint, None
+            states = set(self._policy_log[previous - self._policy_log_start :])
+
+        codes = set()
+        for state in states:
+            if self.symmetry is not None:
+                canonical_id = state if self.backend == "array" else self.symmetry.index.id_of(state)
+                codes.update(self.symmetry.member_codes[canonical_id])
+            elif self.backend == "array":
+                codes.add(get_state_index().codes[state])
+            else:
+                codes.add(code_of(state))
+        return fingerprint, codes
 
     def save_model(self, filename="src/models/q_table.pkl"):
         import os
@@ -55,12 +192,40 @@ class QLearningAgent:
         if directory and not os.path.exists(directory):
             os.makedirs(directory)
 
+        # En disco siempre el formato dict clásico: los modelos se leen igual con cualquier backend o versión
+        q_dict = self.q_table.to_dict() if self.backend == "array" else self.q_table
         with open(filename, "wb") as f:
-            pickle.dump(self.q_table, f)
+            pickle.dump(q_dict, f)
+
+    def table_payload(self):
+        """
+        Forma serializable de la tabla para pasarla entre procesos: el ndarray de valores (backend array) o el
+        dict tal cual. Los modelos en disco usan siempre el dict (save_model).
+        """
+        return self.q_table.values if self.backend == "array" else self.q_table
 
     def load_model(self, filename="q_table.pkl"):
+        """
+        Carga tanto modelos dict (.pkl clásicos) como ndarray, convirtiendo al backend del agente.
+        En modo canónico el modelo debe haberse guardado también en modo canónico.
+        """
         with open(filename, "rb") as f:
-            self.q_table = pickle.load(f)
+            self.load_payload(pickle.load(f))
+
+    def load_payload(self, payload):
+        """Reemplaza la tabla a partir de un ndarray de valores o de un dict (ver table_payload)."""
+        self.policy_version += 1
+        self._policy_log = []
+        self._policy_log_start = self.policy_version
+        self._best_q = {}
+        index = self.q_index
+        if self.backend == "array":
+            if isinstance(payload, np.ndarray):
+                self.q_table = ArrayQTable(payload, index)
+            else:
+                self.q_table = ArrayQTable.from_dict(payload, index)
+        else:
+            self.q_table = ArrayQTable(payload, index).to_dict() if isinstance(payload, np.ndarray) else payload
 
 
 class GeneticQLAgent:
@@ -69,6 +234,8 @@ class GeneticQLAgent:
         self.agent = None  # Instancia de QLearningAgent
         self.fitness = 0.0
         self.reward_draw = 0.5
+        self.episodes_to_optimal = None
+        self.table_path = None  # Tabla entrenada guardada por el worker (solo si se pidió)
 
         # El Cromosoma (α, γ, epsilon_final, N_episodes)
         if gen is None:
@@ -80,3 +247,26 @@ class GeneticQLAgent:
 
     def instantiate_agent(self):
         self.agent = QLearningAgent(alpha=self.alpha, gamma=self.gamma, epsilon=1.0)
+
+    def result_record(self, keep_table=False, table_path=None):
+        """
+        Resultado compacto de una evaluación para devolver al proceso principal (en lugar del individuo con
+        su tabla). Con keep_table incluye la tabla serializada (table_payload); con table_path el worker la
+        guarda en ese archivo y solo se devuelve la ruta.
+        """
+        record = {"id": self.id, "fitness": self.fitness, "episodes_to_optimal": self.episodes_to_optimal}
+        if table_path is not None:
+            self.agent.save_model(table_path)
+            record["table_path"] = table_path
+        if keep_table:
+            record["q_table"] = self.agent.table_payload()
+        return record
+
+    def apply_result(self, record):
+        """Copia en el individuo del proceso principal lo que calculó el worker (ver result_record)."""
+        self.fitness = record["fitness"]
+        self.episodes_to_optimal = record["episodes_to_optimal"]
+        self.table_path = record.get("table_path", self.table_path)
+        if "q_table" in record:
+            self.instantiate_agent()
+            self.agent.load_payload(record["q_table"])
@@ -0,0 +1,271 @@
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.ai.lookup_table import HEADER_SIZE, RECORD_DTYPE, empty_records, write_header
+from src.config import BOARD_COLS, BOARD_ROWS, WIN_LENGTH
+from src.game_logic.lines import get_line_table
+
+MAX_WORKERS = os.cpu_count() or 1
+# Posiciones por tarea: acota la memoria de cada worker (matriz de casillas y de hijos por bloque)
+CHUNK_SIZE = 200_000
+# La tabla guarda un registro por código (3^casillas) y la máscara de jugadas óptimas tiene 16 bits
+MAX_CELLS = 16
+# Bloques con los que se inicializa la tabla en disco (evita tener 3^casillas registros en RAM)
+INIT_BLOCK = 1 << 20
+
+
+def _level_path(work_dir, level):
+    return os.path.join(work_dir, f"level_{level:02d}.npy")
+
+
+def _values_path(work_dir, level):
+    return os.path.join(work_dir, f"values_{level:02d}.npy")
+
+
+def _save_atomic(path, array):
+    """Escribe el .npy completo antes de hacerlo visible (un corte a mitad no deja niveles corruptos)."""
+    tmp_path = path + ".tmp.npy"
+    np.save(tmp_path, array)
+    os.replace(tmp_path, path)
+
+
+def _decode_cells(codes, num_cells):
+    """Matriz [posiciones, casillas] con el valor de cada casilla (0, 1, 2) a partir del código base 3."""
+    cells = np.empty((len(codes), num_cells), dtype=np.int8)
+    remaining = codes.copy()
+    for cell in range(num_cells):
+        remaining, cells[:, cell] = np.divmod(remaining, 3)
+    return cells
+
+
+def _has_line(cells, player, line_masks):
+    """Para cada posición, si el jugador tiene alguna línea completa."""
+    weights = np.left_shift(np.int64(1), np.arange(cells.shape[1], dtype=np.int64))
+    bits = (cells == player).astype(np.int64) @ weights
+    won = np.zeros(len(cells), dtype=bool)
+    for mask in line_masks:
+        won |= (bits & mask) == mask
+    return won
+
+
+def _terminal_info(cells, level, line_masks):
+    """(ganó el último en mover, tablero lleno) para posiciones con `level` fichas."""
+    num_cells = cells.shape[1]
+    if level == 0:
+        won = np.zeros(len(cells), dtype=bool)
+    else:
+        last_mover = 1 if level % 2 == 1 else 2
+        won = _has_line(cells, last_mover, line_masks)
+    return won, np.full(len(cells), level == num_cells)
+
+
+def _expand_chunk(task):
+    """Worker del barrido hacia adelante: hijos (únicos) de las posiciones no terminales de un bloque."""
+    work_dir, level, start, stop, geometry = task
+    table = get_line_table(*geometry)
+    line_masks = [mask for mask, _, _ in table.lines]
+    codes = np.load(_level_path(work_dir, level), mmap_mode="r")[start:stop].astype(np.int64)
+
+    cells = _decode_cells(codes, table.num_cells)
+    won, full = _terminal_info(cells, level, line_masks)
+    open_rows = ~(won | full)
+    turn = 1 if level % 2 == 0 else 2
+
+    children = []
+    for cell in range(table.num_cells):
+        empty = open_rows & (cells[:, cell] == 0)
+        children.append(codes[empty] + turn * 3**cell)
+    return np.unique(np.concatenate(children)) if children else np.empty(0, dtype=np.int64)
+
+
+def _solve_chunk(task):
+    """
+    Worker del barrido hacia atrás: puntúa un bloque del nivel a partir de los valores del nivel siguiente
+    y escribe los registros directamente en la tabla mapeada en memoria (posiciones disjuntas por código).
+    """
+    work_dir, level, start, stop, geometry, table_path = task
+    table = get_line_table(*geometry)
+    line_masks = [mask for mask, _, _ in table.lines]
+    num_cells = table.num_cells
+    codes = np.load(_level_path(work_dir, level), mmap_mode="r")[start:stop].astype(np.int64)
+
+    cells = _decode_cells(codes, num_cells)
+    won, full = _terminal_info(cells, level, line_masks)
+    open_rows = ~(won | full)
+    turn = 1 if level % 2 == 0 else 2
+
+    # Puntaje desde la perspectiva del jugador 1: +1 gana, -1 pierde, 0 empate
+    scores = np.zeros(len(codes), dtype=np.int8)
+    scores[won] = 1 if turn == 2 else -1
+    moves = np.full(len(codes), -1, dtype=np.int8)
+    masks = np.zeros(len(codes), dtype=np.uint16)
+
+    open_idx = np.flatnonzero(open_rows)
+    if len(open_idx):
+        next_codes = np.load(_level_path(work_dir, level + 1), mmap_mode="r")
+        next_values = np.load(_values_path(work_dir, level + 1), mmap_mode="r")
+        open_codes, open_cells = codes[open_idx], cells[open_idx]
+
+        # Casillas ocupadas con un valor que nunca gana la comparación (-2 para max, +2 para min)
+        worst = -2 if turn == 1 else 2
+        child_scores = np.full((len(open_idx), num_cells), worst, dtype=np.int8)
+        for cell in range(num_cells):
+            empty = open_cells[:, cell] == 0
+            child_codes = open_codes[empty] + turn * 3**cell
+            child_scores[empty, cell] = next_values[np.searchsorted(next_codes, child_codes)]
+
+        # Primera jugada óptima en orden fila-columna, igual que precompute_all_states
+        best_cells = child_scores.argmax(axis=1) if turn == 1 else child_scores.argmin(axis=1)
+        best = child_scores[np.arange(len(open_idx)), best_cells]
+        optimal = child_scores == best[:, None]
+        weights = np.left_shift(np.uint16(1), np.arange(num_cells, dtype=np.uint16))
+        scores[open_idx] = best
+        moves[open_idx] = best_cells
+        masks[open_idx] = (optimal * weights).sum(axis=1, dtype=np.uint16)
+
+    records = np.memmap(table_path, dtype=RECORD_DTYPE, mode="r+", offset=HEADER_SIZE)
+    order = np.argsort(codes)  # Escritura en orden de código: accesos secuenciales al archivo
+    records["move"][codes[order]] = moves[order]
+    records["score"][codes[order]] = scores[order]
+    records["optimal_mask"][codes[order]] = masks[order]
+    records.flush()
+    return scores
+
+
+class RetrogradeSolver:
+    """
+    Resolvedor retrógrado por niveles (número de fichas) para tableros m x n con k en raya.
+    1) Hacia adelante: enumera las posiciones alcanzables de cada nivel a partir del anterior.
+    2) Hacia atrás: desde el tablero lleno hasta el vacío, puntúa cada nivel con los valores del siguiente.
+    Cada nivel se reparte en bloques entre procesos; niveles y valores quedan en disco (work_dir) y el
+    progreso en progress.json, así que una ejecución interrumpida continúa donde quedó.
+    El resultado usa el formato de lookup_table (LookupTable / OpponentOracle lo cargan tal cual).
+    """
+
+    def __init__(
+        self,
+        output_path,
+        rows=BOARD_ROWS,
+        cols=BOARD_COLS,
+        win_length=WIN_LENGTH,
+        work_dir=None,
+        max_workers=MAX_WORKERS,
+        chunk_size=CHUNK_SIZE,
+        log=print,
+    ):
+        if rows * cols > MAX_CELLS:
+            raise ValueError(f"Tablero {rows}x{cols} demasiado grande: la tabla tendría 3^{rows * cols} registros")
+        self.output_path = output_path
+        self.geometry = (rows, cols, win_length)
+        self.num_cells = rows * cols
+        self.work_dir = work_dir or output_path + ".work"
+        self.partial_path = output_path + ".partial"
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.log = log or (lambda *args: None)
+        self.progress_path = os.path.join(self.work_dir, "progress.json")
+
+    def _load_progress(self):
+        if os.path.exists(self.progress_path):
+            with open(self.progress_path) as f:
+                progress = json.load(f)
+            if tuple(progress["geometry"]) != self.geometry:
+                raise ValueError(f"{self.work_dir}: progreso de otra geometría {progress['geometry']}")
+            return progress
+        return {"geometry": list(self.geometry), "forward": -1, "backward": self.num_cells + 1}
+
+    def _save_progress(self, progress):
+        tmp_path = self.progress_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(progress, f)
+        os.replace(tmp_path, self.progress_path)
+
+    def _chunks(self, level):
+        size = len(np.load(_level_path(self.work_dir, level), mmap_mode="r"))
+        return [(start, min(start + self.chunk_size, size)) for start in range(0, size, self.chunk_size)]
+
+    def _init_table(self):
+        """Tabla parcial con todos los registros vacíos (move = -1), escrita por bloques para no ocupar RAM."""
+        num_records = 3**self.num_cells
+        tmp_path = self.partial_path + ".init"
+        with open(tmp_path, "wb") as f:
+            write_header(f, num_records, *self.geometry)
+            for start in range(0, num_records, INIT_BLOCK):
+                f.write(empty_records(min(INIT_BLOCK, num_records - start)).tobytes())
+        os.replace(tmp_path, self.partial_path)
+
+    def _remove_work_files(self):
+        """Borra niveles, valores y progreso de work_dir (y la carpeta si queda vacía) una vez escrita la tabla."""
+        for level in range(self.num_cells + 1):
+            for path in (_level_path(self.work_dir, level), _values_path(self.work_dir, level)):
+                if os.path.exists(path):
+                    os.remove(path)
+        os.remove(self.progress_path)
+        if not os.listdir(self.work_dir):
+            os.rmdir(self.work_dir)
+
+    def _report(self, phase, level, positions, elapsed):
+        rate = positions / elapsed if elapsed > 0 else float("inf")
+        self.log(f"{phase} nivel {level:>2}: {positions:>10} posiciones en {elapsed:7.2f}s ({rate:,.0f} pos/s)")
+
+    def solve(self):
+        os.makedirs(self.work_dir, exist_ok=True)
+        progress = self._load_progress()
+        total_start = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            # 1. Barrido hacia adelante: nivel L+1 = hijos de las posiciones no terminales del nivel L
+            if progress["forward"] < 0:
+                _save_atomic(_level_path(self.work_dir, 0), np.zeros(1, dtype=np.int64))
+                progress["forward"] = 0
+                self._save_progress(progress)
+
+            for level in range(progress["forward"], self.num_cells):
+                start = time.perf_counter()
+                chunks = self._chunks(level)
+                tasks = [(self.work_dir, level, lo, hi, self.geometry) for lo, hi in chunks]
+                parts = list(executor.map(_expand_chunk, tasks))
+                children = np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+                _save_atomic(_level_path(self.work_dir, level + 1), children)
+                progress["forward"] = level + 1
+                self._save_progress(progress)
+                self._report("adelante", level, chunks[-1][1] if chunks else 0, time.perf_counter() - start)
+
+            # 2. Barrido hacia atrás, escribiendo en la tabla parcial mapeada en memoria
+            if not os.path.exists(self.partial_path):
+                self._init_table()
+                progress["backward"] = self.num_cells + 1
+                self._save_progress(progress)
+
+            for level in range(min(progress["backward"], self.num_cells + 1) - 1, -1, -1):
+                start = time.perf_counter()
+                tasks = [
+                    (self.work_dir, level, lo, hi, self.geometry, self.partial_path) for lo, hi in self._chunks(level)
+                ]
+                values = list(executor.map(_solve_chunk, tasks))
+                level_values = np.concatenate(values) if values else np.empty(0, dtype=np.int8)
+                _save_atomic(_values_path(self.work_dir, level), level_values)
+                progress["backward"] = level
+                self._save_progress(progress)
+                self._report("atrás", level, len(level_values), time.perf_counter() - start)
+
+        total = sum(
+            len(np.load(_level_path(self.work_dir, level), mmap_mode="r")) for level in range(self.num_cells + 1)
+        )
+        os.replace(self.partial_path, self.output_path)
+        self._remove_work_files()
+        elapsed = time.perf_counter() - total_start
+        self.log(f"Hecho. {total} posiciones en {elapsed:.1f}s ({total / elapsed:,.0f} pos/s) -> {self.output_path}")
+        return total
+
+
+if __name__ == "__main__":
+    # python -m src.ai.retrograde [salida.bin] [filas columnas k]
+    target = sys.argv[1] if len(sys.argv) > 1 else "tictactoe_lookup.bin"
+    dims = [int(arg) for arg in sys.argv[2:5]] if len(sys.argv) > 4 else [BOARD_ROWS, BOARD_COLS, WIN_LENGTH]
+    RetrogradeSolver(target, *dims).solve()
@@ -0,0 +1,232 @@
+import math
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.game_logic.board import Board
+
+# Cada cuántos nodos se consulta el reloj (acota el exceso sobre el plazo a unas decenas de microsegundos)
+CLOCK_CHECK_INTERVAL = 32
+
+
+class SearchTimeout(Exception):
+    """Se agotó el presupuesto (tiempo o nodos) en medio de una iteración."""
+
+
+def open_lines_heuristic(board: Board, player_id: int) -> float:
+    """
+    Evaluación en el corte de profundidad: líneas aún ganables por el jugador menos las del rival,
+    ponderadas por cuántas fichas tienen. Siempre en (-0.5, 0.5) para no competir con una victoria real.
+    """
+    matrix = board.board
+    lines = board.geometry.lines
+    opponent_id = 2 if player_id == 1 else 1
+    total = 0.0
+    for _, cells, _ in lines:
+        values = [matrix[row][col] for row, col in cells]
+        if opponent_id not in values:
+            total += values.count(player_id)
+        if player_id not in values:
+            total -= values.count(opponent_id)
+    return 0.5 * total / (len(lines) * board.geometry.win_length + 1)
+
+
+class _Budget:
+    def __init__(self, deadline_ms, max_nodes):
+        self.deadline = None if deadline_ms is None else time.perf_counter() + deadline_ms / 1000.0
+        self.max_nodes = max_nodes
+        self.nodes = 0
+
+    def tick(self):
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise SearchTimeout()
+        if (
+            self.deadline is not None
+            and self.nodes % CLOCK_CHECK_INTERVAL == 0
+            and time.perf_counter() >= self.deadline
+        ):
+            raise SearchTimeout()
+
+
+def _ordered_moves(board: Board, hash_moves: Dict[int, Tuple[int, int]]):
+    """Primero la mejor jugada de la iteración anterior (variante principal), luego el orden estático del tablero."""
+    moves = sorted(board.get_available_moves(), key=board.geometry.static_rank.get)
+    hash_move = hash_moves.get(board.code)
+    if hash_move is not None and hash_move in moves:
+        moves.remove(hash_move)
+        moves.insert(0, hash_move)
+    return moves
+
+
+def _alpha_beta(board, depth, alpha, beta, player_id, heuristic, budget, hash_moves, stats):
+    budget.tick()
+
+    if board.winner is not None and board.winner != 0:
+        return 1 if board.winner == player_id else -1
+    if board.is_full():
+        return 0
+    if depth == 0:
+        stats["cutoff"] = True  # El resultado de esta iteración depende de la heurística
+        return heuristic(board, player_id)
+
+    is_maximizing = board.turn == player_id
+    best_score = -math.inf if is_maximizing else math.inf
+    best_move = None
+
+    for move in _ordered_moves(board, hash_moves):
+        prev_state = (board.turn, board.winner, board.game_over, board.win_info)
+        board.make_move(move[0], move[1])
+        try:
+            score = _alpha_beta(board, depth - 1, alpha, beta, player_id, heuristic, budget, hash_moves, stats)
+        finally:
+            board.undo_move(move[0], move[1], *prev_state)
+
+        if is_maximizing:
+            if score > best_score:
+                best_score, best_move = score, move
+            alpha = max(alpha, best_score)
+        else:
+            if score < best_score:
+                best_score, best_move = score, move
+            beta = min(beta, best_score)
+        if beta <= alpha:
+            break
+
+    hash_moves[board.code] = best_move
+    return best_score
+
+
+def _principal_variation(board: Board, hash_moves) -> List[Tuple[int, int]]:
+    """Recorre las mejores jugadas guardadas desde la raíz (y deja el tablero como estaba)."""
+    pv, undo_stack = [], []
+    while not board.game_over:
+        move = hash_moves.get(board.code)
+        if move is None or not board.is_valid_move(move[0], move[1]):
+            break
+        undo_stack.append((move, (board.turn, board.winner, board.game_over, board.win_info)))
+        board.make_move(move[0], move[1])
+        pv.append(move)
+    for move, prev_state in reversed(undo_stack):
+        board.undo_move(move[0], move[1], *prev_state)
+    return pv
+
+
+def search(
+    board: Board,
+    deadline_ms: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+    heuristic: Optional[Callable[[Board, int], float]] = None,
+    max_depth: Optional[int] = None,
+):
+    """
+    Búsqueda anytime con profundización iterativa y poda alfa-beta.
+    Cada iteración completa actualiza la mejor jugada; si se agota el plazo (deadline_ms) o el número
+    de nodos (max_nodes) se retorna la de la última iteración completa. Más allá de la profundidad
+    de la iteración se evalúa con `heuristic(board, jugador)` (por defecto open_lines_heuristic).
+    Retorna: (best_move, info) con score, depth, nodes, completed (resuelto hasta el final), pv, root_scores.
+    En root_scores solo el puntaje de la mejor jugada es exacto; el de las demás es una cota superior (la
+    búsqueda las descarta en cuanto no pueden superarla).
+    """
+    start = time.perf_counter()
+    heuristic = heuristic or open_lines_heuristic
+    budget = _Budget(deadline_ms, max_nodes)
+    player_id = board.turn
+    hash_moves: Dict[int, Tuple[int, int]] = {}
+
+    moves = _ordered_moves(board, hash_moves)
+    info = {"score": 0, "depth": 0, "nodes": 0, "completed": False, "pv": [], "root_scores": {}}
+    if not moves or board.game_over:
+        return (0, 0), info
+
+    best_move = moves[0]  # Respuesta garantizada aunque no termine ninguna iteración
+    depth_limit = len(moves) if max_depth is None else min(max_depth, len(moves))
+
+    for depth in range(1, depth_limit + 1):
+        stats = {"cutoff": False}
+        root_scores = {}
+        alpha, beta = -math.inf, math.inf
+        iteration_best, iteration_score = None, -math.inf
+        try:
+            for move in _ordered_moves(board, hash_moves):
+                prev_state = (board.turn, board.winner, board.game_over, board.win_info)
+                board.make_move(move[0], move[1])
+                try:
+                    # Ventana estrechada por la mejor jugada hasta ahora: las peores fallan bajo alpha y se podan
+                    score = _alpha_beta(board, depth - 1, alpha, beta, player_id, heuristic, budget, hash_moves, stats)
+                finally:
+                    board.undo_move(move[0], move[1], *prev_state)
+                root_scores[move] = score
+                if score > iteration_score:
+                    iteration_best, iteration_score = move, score
+                alpha = max(alpha, score)
+        except SearchTimeout:
+            break
+
+        hash_moves[board.code] = iteration_best
+        best_move = iteration_best
+        info.update(score=iteration_score, depth=depth, root_scores=root_scores)
+        if not stats["cutoff"]:
+            # Ningún nodo llegó al corte: el valor es exacto y más profundidad no cambia nada
+            info["completed"] = True
+            break
+
+    info["nodes"] = budget.nodes
+    info["pv"] = _principal_variation(board, hash_moves)
+    info["elapsed_ms"] = (time.perf_counter() - start) * 1000.0
+    return best_move, info
+
+
+def build_search_tree(board: Board, best_move, info):
+    """
+    Árbol para GraphComponent a partir de una búsqueda con presupuesto: todas las jugadas de la raíz
+    con su puntaje de la última iteración completa (cota superior salvo en la elegida) y, bajo la elegida,
+    la variante principal.
+    """
+
+    def snapshot():
+        return [row[:] for row in board.board]
+
+    root = {
+        "score": round(info["score"], 2),
+        "board_matrix": snapshot(),
+        "children": [],
+        "best_move_coordinate": best_move,
+    }
+    if not info["root_scores"]:
+        return root
+
+    for move, score in info["root_scores"].items():
+        prev_state = (board.turn, board.winner, board.game_over, board.win_info)
+        board.make_move(move[0], move[1])
+        child = {
+            "score": round(score, 2),
+            "board_matrix": snapshot(),
+            "children": [],
+            "is_chosen": move == best_move,
+            "move": move,
+        }
+
+        if move == best_move:
+            # Cadena con la continuación prevista (un único hijo elegido por nivel)
+            parent, undo_stack = child, []
+            for pv_move in info["pv"][1:]:
+                if board.game_over or not board.is_valid_move(pv_move[0], pv_move[1]):
+                    break
+                undo_stack.append((pv_move, (board.turn, board.winner, board.game_over, board.win_info)))
+                board.make_move(pv_move[0], pv_move[1])
+                pv_node = {
+                    "score": child["score"],
+                    "board_matrix": snapshot(),
+                    "children": [],
+                    "is_chosen": True,
+                    "move": pv_move,
+                }
+                parent["children"].append(pv_node)
+                parent = pv_node
+            for pv_move, pv_state in reversed(undo_stack):
+                board.undo_move(pv_move[0], pv_move[1], *pv_state)
+
+        board.undo_move(move[0], move[1], *prev_state)
+        root["children"].append(child)
+
+    return root
@@ -0,0 +1,66 @@
+from src.game_logic.lines import get_line_table
+
+# Tipos de entrada en la tabla de transposición
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class TranspositionTable:
+    """
+    Memoria de posiciones ya resueltas, indexada por (código base 3 del tablero, jugador maximizador).
+    Guarda el puntaje junto con el tipo de cota (exacta, inferior o superior) que produjo la poda alfa-beta.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.hits = 0
+
+    def probe(self, key, alpha, beta):
+        """Retorna (puntaje o None, alpha, beta) con la ventana ajustada por la entrada guardada."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None, alpha, beta
+
+        score, flag = entry
+        if flag == EXACT:
+            self.hits += 1
+            return score, alpha, beta
+        if flag == LOWER:
+            alpha = max(alpha, score)
+        else:
+            beta = min(beta, score)
+
+        if alpha >= beta:
+            self.hits += 1
+            return score, alpha, beta
+        return None, alpha, beta
+
+    def store(self, key, score, alpha_orig, beta_orig):
+        if score <= alpha_orig:
+            flag = UPPER
+        elif score >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.entries[key] = (score, flag)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# Centro > esquinas > bordes en 3x3 (ver LineTable.static_rank)
+STATIC_RANK = get_line_table().static_rank
+
+
+class MoveOrdering:
+    """Ordenamiento de jugadas: heurística de historia (cortes previos) y, a igualdad, centro > esquinas > bordes."""
+
+    def __init__(self):
+        self.history = {}
+
+    def order(self, moves):
+        history = self.history
+        return sorted(moves, key=lambda move: (-history.get(move, 0), STATIC_RANK[move]))
+
+    def record_cutoff(self, move, remaining_moves):
+        """Premia la jugada que produjo un corte; más peso cuanto más arriba en el árbol."""
+        self.history[move] = self.history.get(move, 0) + remaining_moves * remaining_moves
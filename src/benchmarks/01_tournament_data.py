@@ -3,16 +3,16 @@ import csv
 import os
 import random
 import time
-from concurrent.futures import ProcessPoolExecutor, as_completed
 
 from src.ai.ql_agent import GeneticQLAgent
 from src.benchmarks.utils import evaluate_vs_minimax
 from src.training.gym import train_with_decay
+from src.training.worker_pool import WorkerPool
 
 POPULATION_SIZE = 50
 GENERATIONS = 30
 TOUR_SIZE = 5
-MAX_WORKERS = 6
+MAX_WORKERS = None  # None: según CPUs y memoria disponibles (worker_pool.default_workers)
 NUM_GAMES = 50
 NUM_EPISODES = 5000
 
@@ -78,10 +78,10 @@ def evaluate_individual_task(individual_data, generation_num, total_generations,
         f"[CONV: {episodes_to_optimal}/{episodes}]"
     )
 
-    return individual, log_line
+    return individual.result_record(), log_line
 
 
-def evaluate_population(population, generation_num, total_generations):
+def evaluate_population(population, generation_num, total_generations, pool):
     total_individuals = len(population)
 
     tasks = []
@@ -93,15 +93,10 @@ def evaluate_population(population, generation_num, total_generations):
         }
         tasks.append((task_data, generation_num, total_generations, i, total_individuals))
 
-    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        future_to_agent = {executor.submit(evaluate_individual_task, *task): i for i, task in enumerate(tasks)}
+    for original_index, (record, log_line) in pool.imap_unordered(evaluate_individual_task, tasks):
+        population[original_index].apply_result(record)
 
-        for future in as_completed(future_to_agent):
-            updated_individual, log_line = future.result()
-            original_index = future_to_agent[future]
-            population[original_index] = updated_individual
-
-            # print(log_line)
+        # print(log_line)
 
 
 def selection(population):
@@ -140,59 +135,61 @@ def run_genetic_algorithm():
     if os.path.exists(CSV_FILE_GENERATION_DATA):
         os.remove(CSV_FILE_GENERATION_DATA)
 
-    for generation in range(GENERATIONS):
-        evaluate_population(population, generation + 1, GENERATIONS)
+    # Un solo pool para todas las generaciones: los workers cargan el oráculo una vez
+    with WorkerPool(MAX_WORKERS) as pool:
+        for generation in range(GENERATIONS):
+            evaluate_population(population, generation + 1, GENERATIONS, pool)
 
-        population.sort(key=lambda x: x.fitness, reverse=True)
+            population.sort(key=lambda x: x.fitness, reverse=True)
 
-        current_best = population[0]
+            current_best = population[0]
 
-        # 1. CÁLCULO DE MÉTRICAS DE LA GENERACIÓN
-        current_generation_fitnesses = [p.fitness for p in population]
-        avg_fitness = sum(current_generation_fitnesses) / POPULATION_SIZE
-        max_fitness = current_best.fitness
+            # 1. CÁLCULO DE MÉTRICAS DE LA GENERACIÓN
+            current_generation_fitnesses = [p.fitness for p in population]
+            avg_fitness = sum(current_generation_fitnesses) / POPULATION_SIZE
+            max_fitness = current_best.fitness
 
-        # 2. GUARDAR DATOS DE LA GENERACIÓN
-        generation_data = {
-            "Generation": generation + 1,
-            "Max_Fitness": max_fitness,
-            "Avg_Fitness": avg_fitness,
-            "Optimal_HPs": f"α={current_best.alpha}, γ={current_best.gamma}, R_draw={current_best.reward_draw}",
-        }
-        append_generation_data(generation_data)
-
-        # 3. ACTUALIZAR EL MEJOR GLOBAL (Guardando los HPs y la Eficiencia)
-        # Acceder a 'fitness' con corchetes
-        if best_overall is None or current_best.fitness > best_overall["fitness"]:
-            best_overall = {
-                "fitness": current_best.fitness,
-                "alpha": current_best.alpha,
-                "gamma": current_best.gamma,
-                "epsilon_decay_rate": current_best.epsilon_decay_rate,
-                "reward_draw": current_best.reward_draw,
-                # ESTO ES CRUCIAL: GUARDAR EL VALOR ENCONTRADO EN LA EVALUACIÓN
-                "episodes_to_optimal": getattr(current_best, "episodes_to_optimal", NUM_EPISODES),
+            # 2. GUARDAR DATOS DE LA GENERACIÓN
+            generation_data = {
+                "Generation": generation + 1,
+                "Max_Fitness": max_fitness,
+                "Avg_Fitness": avg_fitness,
+                "Optimal_HPs": f"α={current_best.alpha}, γ={current_best.gamma}, R_draw={current_best.reward_draw}",
             }
-
-        new_population = []
-
-        NUM_ELITES = 3
-        new_population.extend(population[:NUM_ELITES])
-
-        current_mutation_rate = max(
-            MUTATION_END_RATE,
-            MUTATION_START_RATE - (MUTATION_START_RATE - MUTATION_END_RATE) * (generation / GENERATIONS),
-        )
-
-        while len(new_population) < POPULATION_SIZE:
-            parent1 = selection(population)
-            parent2 = selection(population)
-            child = crossover(parent1, parent2, current_mutation_rate)
-            new_population.append(child)
-
-        population = new_population
-        for i, agent in enumerate(population):
-            agent.id = i
+            append_generation_data(generation_data)
+
+            # 3. ACTUALIZAR EL MEJOR GLOBAL (Guardando los HPs y la Eficiencia)
+            # Acceder a 'fitness' con corchetes
+            if best_overall is None or current_best.fitness > best_overall["fitness"]:
+                best_overall = {
+                    "fitness": current_best.fitness,
+                    "alpha": current_best.alpha,
+                    "gamma": current_best.gamma,
+                    "epsilon_decay_rate": current_best.epsilon_decay_rate,
+                    "reward_draw": current_best.reward_draw,
+                    # ESTO ES CRUCIAL: GUARDAR EL VALOR ENCONTRADO EN LA EVALUACIÓN
+                    "episodes_to_optimal": getattr(current_best, "episodes_to_optimal", NUM_EPISODES),
+                }
+
+            new_population = []
+
+            NUM_ELITES = 3
+            new_population.extend(population[:NUM_ELITES])
+
+            current_mutation_rate = max(
+                MUTATION_END_RATE,
+                MUTATION_START_RATE - (MUTATION_START_RATE - MUTATION_END_RATE) * (generation / GENERATIONS),
+            )
+
+            while len(new_population) < POPULATION_SIZE:
+                parent1 = selection(population)
+                parent2 = selection(population)
+                child = crossover(parent1, parent2, current_mutation_rate)
+                new_population.append(child)
+
+            population = new_population
+            for i, agent in enumerate(population):
+                agent.id = i
 
     episodes_to_optimal = best_overall.get("episodes_to_optimal", NUM_EPISODES)
 
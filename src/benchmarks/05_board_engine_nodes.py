@@ -0,0 +1,52 @@
+import time
+
+from src.ai.minimax import minimax_alpha_beta, minimax_bruteforce
+from src.game_logic.engine import BOARD_ENGINES, create_board
+
+# Posiciones de prueba: (nombre, secuencia de jugadas desde el tablero vacío)
+POSITIONS = [
+    ("vacío", []),
+    ("centro", [(1, 1)]),
+    ("esquina+centro", [(0, 0), (1, 1)]),
+]
+
+
+def run_search(engine, moves, use_alpha_beta):
+    board = create_board(engine)
+    for row, col in moves:
+        board.make_move(row, col)
+
+    counter = {"nodes": 0}
+    ai_player_id = board.turn
+
+    start = time.perf_counter()
+    if use_alpha_beta:
+        minimax_alpha_beta(board, 0, float("-inf"), float("inf"), True, counter, ai_player_id)
+    else:
+        minimax_bruteforce(board, 0, True, counter, ai_player_id)
+    elapsed = time.perf_counter() - start
+
+    return counter["nodes"], elapsed
+
+
+def run_benchmark():
+    print(f"{'POSICIÓN':<16} | {'ALGORITMO':<11} | {'MOTOR':<9} | {'NODOS':>8} | {'NODOS/S':>10} | {'SPEEDUP':>7}")
+    print("-" * 78)
+
+    for name, moves in POSITIONS:
+        for use_alpha_beta in (False, True):
+            algorithm = "alfa-beta" if use_alpha_beta else "fuerza br."
+            baseline_rate = None
+
+            for engine in BOARD_ENGINES:
+                nodes, elapsed = run_search(engine, moves, use_alpha_beta)
+                rate = nodes / elapsed if elapsed > 0 else float("inf")
+                if baseline_rate is None:
+                    baseline_rate = rate
+                speedup = rate / baseline_rate
+
+                print(f"{name:<16} | {algorithm:<11} | {engine:<9} | {nodes:>8} | {rate:>10.0f} | {speedup:>6.2f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark()
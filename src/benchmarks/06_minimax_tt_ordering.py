@@ -0,0 +1,68 @@
+import time
+
+from src.ai.minimax import get_simulation_move_alpha_beta, get_simulation_move_bruteforce
+from src.ai.transposition import MoveOrdering, TranspositionTable
+from src.game_logic.engine import create_board
+
+POSITIONS = [
+    ("vacío", []),
+    ("esquina", [(0, 0)]),
+    ("borde", [(0, 1)]),
+    ("esquina+centro", [(0, 0), (1, 1)]),
+    ("medio juego", [(0, 0), (1, 1), (2, 2), (0, 2)]),
+]
+
+# (nombre, función, usa TT, usa ordenamiento)
+CONFIGS = [
+    ("fuerza bruta", get_simulation_move_bruteforce, False, False),
+    ("fuerza bruta+TT", get_simulation_move_bruteforce, True, False),
+    ("alfa-beta", get_simulation_move_alpha_beta, False, False),
+    ("alfa-beta+orden", get_simulation_move_alpha_beta, False, True),
+    ("alfa-beta+TT", get_simulation_move_alpha_beta, True, False),
+    ("alfa-beta+TT+orden", get_simulation_move_alpha_beta, True, True),
+]
+
+
+def run_config(moves, finder, use_tt, use_ordering):
+    board = create_board()
+    for row, col in moves:
+        board.make_move(row, col)
+
+    kwargs = {}
+    if use_tt:
+        kwargs["tt"] = TranspositionTable()
+    if use_ordering:
+        kwargs["ordering"] = MoveOrdering()
+
+    start = time.perf_counter()
+    best_move, nodes = finder(board, **kwargs)
+    return best_move, nodes, time.perf_counter() - start
+
+
+def run_benchmark():
+    for name, moves in POSITIONS:
+        print(f"\n--- Posición: {name} {moves} ---")
+        print(
+            f"{'CONFIGURACIÓN':<20} | {'JUGADA':<7} | {'NODOS':>8} | {'REDUCCIÓN':>9} | "
+            f"{'TIEMPO (ms)':>11} | {'SPEEDUP':>7}"
+        )
+        print("-" * 80)
+
+        baseline = {}
+        for config_name, finder, use_tt, use_ordering in CONFIGS:
+            best_move, nodes, elapsed = run_config(moves, finder, use_tt, use_ordering)
+
+            # Cada familia (fuerza bruta / alfa-beta) se compara contra su versión sin tablas
+            family = finder.__name__
+            base_nodes, base_time = baseline.setdefault(family, (nodes, elapsed))
+            reduction = 1 - nodes / base_nodes
+            speedup = base_time / elapsed if elapsed > 0 else float("inf")
+
+            print(
+                f"{config_name:<20} | {str(best_move):<7} | {nodes:>8} | {reduction:>8.1%} | "
+                f"{elapsed * 1000:>11.2f} | {speedup:>6.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    run_benchmark()
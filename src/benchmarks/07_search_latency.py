@@ -0,0 +1,58 @@
+import random
+import time
+
+from src.ai.lookup_table import LookupTable
+from src.ai.search import search
+from src.game_logic.engine import create_board
+
+DEADLINES_MS = [None, 50, 10, 2, 0.5]
+NUM_POSITIONS = 200
+SEED = 42
+LOOKUP_PATH = "tictactoe_lookup.bin"
+
+
+def sample_positions(num_positions, seed=SEED):
+    """Posiciones no terminales alcanzables (0 a 6 jugadas aleatorias)."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < num_positions:
+        board = create_board()
+        for _ in range(rng.randint(0, 6)):
+            if board.game_over:
+                break
+            board.make_move(*rng.choice(list(board.get_available_moves())))
+        if not board.game_over:
+            positions.append(board)
+    return positions
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_benchmark():
+    positions = sample_positions(NUM_POSITIONS)
+    table = LookupTable(LOOKUP_PATH)
+    optimal = [table.optimal_moves(board.code) for board in positions]
+
+    header = f"{'PLAZO (ms)':>10} | {'p50 (ms)':>9} | {'p99 (ms)':>9} | {'MÁX (ms)':>9} | {'PROF. MEDIA':>11}"
+    print(f"{header} | {'ÓPTIMA':>7}")
+    print("-" * 72)
+    for deadline in DEADLINES_MS:
+        latencies, depths, agree = [], [], 0
+        for board, best in zip(positions, optimal):
+            start = time.perf_counter()
+            move, info = search(board, deadline_ms=deadline)
+            latencies.append((time.perf_counter() - start) * 1000.0)
+            depths.append(info["depth"])
+            agree += move in best
+        label = "sin límite" if deadline is None else f"{deadline:g}"
+        print(
+            f"{label:>10} | {percentile(latencies, 0.5):>9.2f} | {percentile(latencies, 0.99):>9.2f} | "
+            f"{max(latencies):>9.2f} | {sum(depths) / len(depths):>11.2f} | {agree / len(positions):>7.1%}"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,46 @@
+import random
+import time
+
+import numpy as np
+
+from src.ai.ql_agent import QLearningAgent
+from src.training.gym import train_with_decay
+
+SEEDS = range(8)
+MAX_EPISODES = 20000
+ALPHA, GAMMA = 0.5, 0.9
+
+
+def table_footprint(agent):
+    """(entradas Q no nulas, bytes reservados por la tabla)."""
+    if agent.backend == "array":
+        return int(np.count_nonzero(agent.q_table.values)), agent.q_table.values.nbytes
+    return len(agent.q_table), None
+
+
+def run_benchmark():
+    header = f"{'MODO':<10} | {'EPISODIOS A ÓPTIMO (media)':>26} | {'SIN CONVERGER':>13} | {'ENTRADAS Q':>10}"
+    print(f"{header} | {'BYTES':>8} | {'TIEMPO (s)':>10}")
+    print("-" * 94)
+    for canonical in (False, True):
+        episodes, failures, entries, start = [], 0, [], time.perf_counter()
+        for seed in SEEDS:
+            random.seed(seed)
+            agent = QLearningAgent(alpha=ALPHA, gamma=GAMMA, epsilon=1.0, canonical=canonical)
+            agent, episodes_to_optimal = train_with_decay(agent, episodes=MAX_EPISODES)
+            # train_with_decay devuelve el total de episodios si nunca llegó a 0 derrotas
+            failures += episodes_to_optimal == MAX_EPISODES
+            episodes.append(episodes_to_optimal)
+            entries.append(table_footprint(agent))
+
+        label = "canónico" if canonical else "completo"
+        mean_entries = sum(count for count, _ in entries) / len(entries)
+        nbytes = entries[0][1] if entries[0][1] is not None else "-"
+        print(
+            f"{label:<10} | {sum(episodes) / len(episodes):>26.0f} | {failures:>13} | {mean_entries:>10.0f} | "
+            f"{nbytes:>8} | {time.perf_counter() - start:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,59 @@
+import random
+import time
+
+import numpy as np
+
+from src.ai.policy_evaluation import evaluate_policy
+from src.ai.ql_agent import QLearningAgent
+from src.training.gym import train_with_decay
+from src.training.vector_env import MIN_EPSILON, VectorEnv
+
+BATCH_SIZES = [1, 64, 1024]
+EPISODES = 8192
+ALPHA, GAMMA, REWARD_DRAW = 0.5, 0.9, 0.5
+SEED = 0
+
+
+def run_vector_env(batch_size, episodes=EPISODES):
+    """Entrena un agente con VectorEnv (sin checkpoints). Retorna (agente, segundos)."""
+    agent = QLearningAgent(alpha=ALPHA, gamma=GAMMA, backend="array", canonical=False)
+    env = VectorEnv(
+        agent.q_table.values[None],
+        np.array([ALPHA], dtype=np.float32),
+        np.array([GAMMA], dtype=np.float32),
+        np.array([REWARD_DRAW], dtype=np.float32),
+        rng=np.random.default_rng(SEED),
+    )
+    start = time.perf_counter()
+    for first in range(0, episodes, batch_size):
+        batch = np.arange(first, min(first + batch_size, episodes))
+        epsilon = np.maximum(MIN_EPSILON, 1.0 - (batch + 1) / episodes)
+        env.play(np.zeros(len(batch), dtype=np.int64), epsilon)
+    return agent, time.perf_counter() - start
+
+
+def run_benchmark():
+    print(
+        f"{'ENTORNO':<18} | {'EPISODIOS':>9} | {'TIEMPO (s)':>10} | {'EPISODIOS/s':>11} | {'DERROTAS vs MINIMAX':>19}"
+    )
+    print("-" * 80)
+
+    # Referencia: un episodio a la vez con Board y agent.learn (incluye sus checkpoints desde el episodio 1000)
+    random.seed(SEED)
+    agent = QLearningAgent(alpha=ALPHA, gamma=GAMMA, epsilon=1.0, backend="array", canonical=False)
+    start = time.perf_counter()
+    agent, episodes_to_optimal = train_with_decay(agent, episodes=EPISODES, reward_draw_gen=REWARD_DRAW)
+    elapsed = time.perf_counter() - start
+    played = min(EPISODES, episodes_to_optimal + 1)
+    losses = evaluate_policy(agent)[1]
+    print(f"{'train_with_decay':<18} | {played:>9} | {elapsed:>10.2f} | {played / elapsed:>11,.0f} | {losses:>19.2%}")
+
+    for batch_size in BATCH_SIZES:
+        agent, elapsed = run_vector_env(batch_size)
+        losses = evaluate_policy(agent)[1]
+        label = f"VectorEnv B={batch_size}"
+        print(f"{label:<18} | {EPISODES:>9} | {elapsed:>10.2f} | {EPISODES / elapsed:>11,.0f} | {losses:>19.2%}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,50 @@
+import random
+import statistics
+import time
+
+import numpy as np
+
+from src.ai.ql_agent import QLearningAgent
+from src.training.gym import train_with_decay
+from src.training.replay_buffer import REPLAY_BATCH_SIZE, ReplayBuffer
+
+SEEDS = range(12)
+EPISODES = 20000
+ALPHA, GAMMA, EPSILON_DECAY = 0.5, 0.9, 0.0005
+# (etiqueta, muestreo priorizado, pasos de replay por episodio); None = sin replay
+CONFIGS = [("sin replay", None, 0), ("uniforme", False, 1), ("priorizado", True, 1), ("uniforme x4", False, 4)]
+
+
+def episodes_to_zero_losses(prioritized, replay_steps, seed):
+    """Episodios de train_with_decay hasta no perder contra minimax (checkpoints cada 200). Retorna (episodios, s)."""
+    random.seed(seed)
+    agent = QLearningAgent(alpha=ALPHA, gamma=GAMMA, epsilon=1.0, backend="array", canonical=False)
+    replay = None if prioritized is None else ReplayBuffer(prioritized=prioritized, rng=np.random.default_rng(seed))
+    start = time.perf_counter()
+    _, episodes_to_optimal = train_with_decay(
+        agent,
+        episodes=EPISODES,
+        epsilon_decay_gen=EPSILON_DECAY,
+        replay=replay,
+        replay_steps=replay_steps,
+        replay_batch_size=REPLAY_BATCH_SIZE,
+        stop_criterion="exact",
+    )
+    return episodes_to_optimal, time.perf_counter() - start
+
+
+def run_benchmark():
+    print(f"{'REPLAY':<12} | {'MEDIANA EPISODIOS':>17} | {'MEDIA EPISODIOS':>15} | {'TIEMPO TOTAL (s)':>16}")
+    print("-" * 70)
+    for label, prioritized, replay_steps in CONFIGS:
+        results = [episodes_to_zero_losses(prioritized, replay_steps, seed) for seed in SEEDS]
+        episodes = [result[0] for result in results]
+        elapsed = sum(result[1] for result in results)
+        print(
+            f"{label:<12} | {statistics.median(episodes):>17,.0f} | {statistics.mean(episodes):>15,.0f} | "
+            f"{elapsed:>16.2f}"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,55 @@
+import random
+import statistics
+import time
+
+from src.ai.policy_evaluation import evaluate_policy
+from src.ai.ql_agent import QLearningAgent
+from src.training.gym import train_with_decay
+from src.training.planning import PrioritizedSweeping
+
+SEEDS = range(12)
+EPISODES = 20000
+# Episodios entre evaluaciones (más fino que los checkpoints de train_with_decay, que empiezan en 1200)
+EVALUATION_INTERVAL = 25
+ALPHA, GAMMA, EPSILON_DECAY = 0.5, 0.9, 0.0005
+# Backups simulados por actualización real; 0 = sin planificación
+PLANNING_BUDGETS = [0, 1, 5, 20, 100]
+
+
+def episodes_to_zero_losses(planning_steps, seed):
+    """Entrena por tramos (resume) hasta que la política no pierde contra minimax. Retorna (episodios, s)."""
+    random.seed(seed)
+    agent = QLearningAgent(alpha=ALPHA, gamma=GAMMA, epsilon=1.0, backend="array", canonical=False)
+    planner = PrioritizedSweeping(agent, planning_steps=planning_steps) if planning_steps else None
+    start = time.perf_counter()
+    episodes = 0
+    while episodes < EPISODES:
+        episodes += EVALUATION_INTERVAL
+        train_with_decay(
+            agent,
+            episodes=episodes,
+            epsilon_decay_gen=EPSILON_DECAY,
+            planner=planner,
+            stop_criterion="exact",
+            resume=True,
+        )
+        if evaluate_policy(agent)[1] == 0:
+            break
+    return episodes, time.perf_counter() - start
+
+
+def run_benchmark():
+    print(f"{'BACKUPS/PASO':<12} | {'MEDIANA EPISODIOS':>17} | {'MEDIA EPISODIOS':>15} | {'TIEMPO TOTAL (s)':>16}")
+    print("-" * 70)
+    for planning_steps in PLANNING_BUDGETS:
+        results = [episodes_to_zero_losses(planning_steps, seed) for seed in SEEDS]
+        episodes = [result[0] for result in results]
+        elapsed = sum(result[1] for result in results)
+        print(
+            f"{planning_steps:<12} | {statistics.median(episodes):>17,.0f} | {statistics.mean(episodes):>15,.0f} | "
+            f"{elapsed:>16.2f}"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
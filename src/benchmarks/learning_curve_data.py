@@ -1,9 +1,8 @@
-import os
-import pickle
 import random
 
+from src.ai.oracle import OpponentOracle
 from src.benchmarks.utils import evaluate_vs_minimax
-from src.game_logic.board import Board
+from src.game_logic.engine import create_board
 
 # Definimos el intervalo de evaluación aquí, si es necesario, o lo pasamos como parámetro
 EVAL_INTERVAL = 200
@@ -20,14 +19,12 @@ def train_with_decay(
     progress_callback=None,
     # --- NUEVO PARÁMETRO ---
     record_curve=False,
+    oracle=None,
 ):
-    if not os.path.exists(pickle_path):
-        lookup_table = None
-    else:
-        with open(pickle_path, "rb") as f:
-            lookup_table = pickle.load(f)
+    if oracle is None:
+        oracle = OpponentOracle.shared(pickle_path)
 
-    board = Board()
+    board = create_board()
     agent.epsilon = start_epsilon
     episodes_to_optimal = episodes
 
@@ -58,15 +55,13 @@ def train_with_decay(
 
         while not board.game_over:
             current_player = board.turn
-            state_key = agent.get_state_key(board.board)
+            state_key = agent.get_board_state_key(board)
 
             # DETERMINAR QUIÉN MUEVE
             is_master_turn = (current_player == 2 and mode == 1) or (current_player == 1 and mode == 2)
 
             if is_master_turn:
-                state_hash = tuple(item for row in board.board for item in row)
-                move_data = lookup_table.get(state_hash) if lookup_table else None
-                action = move_data["move"] if isinstance(move_data, dict) else move_data
+                action = oracle.get_move(board)
                 if action is None:
                     action = random.choice(board.get_available_moves())
             else:
@@ -81,7 +76,7 @@ def train_with_decay(
             if history[other_player]:
                 prev_state, prev_action = history[other_player]
                 if not board.game_over:
-                    current_board_state = agent.get_state_key(board.board)
+                    current_board_state = agent.get_board_state_key(board)
                     agent.learn(prev_state, prev_action, 0, current_board_state, board.get_available_moves(), False)
                 else:
                     if board.winner == other_player:
@@ -110,7 +105,7 @@ def train_with_decay(
         # Si se solicita la curva O si es un punto de chequeo
         if record_curve and (episode > 0 and episode % EVAL_INTERVAL == 0):
             # Usar un número menor de juegos para la curva para ser más rápido
-            wins_c, losses_c, draws_c = evaluate_vs_minimax(agent, num_games=20)
+            wins_c, losses_c, draws_c = evaluate_vs_minimax(agent, num_games=20, oracle=oracle)
             success_rate = (wins_c + draws_c) / 20.0
 
             learning_curve_data.append({"episode": episode, "success_rate": success_rate})
@@ -118,7 +113,7 @@ def train_with_decay(
         # Condición de break (sigue siendo cada 200)
         if episode % 200 == 0 and episode > 1000:
             n_test = 100
-            wins, losses, draws = evaluate_vs_minimax(agent, num_games=n_test)
+            wins, losses, draws = evaluate_vs_minimax(agent, num_games=n_test, oracle=oracle)
 
             if losses == 0:
                 episodes_to_optimal = episode
@@ -126,7 +121,7 @@ def train_with_decay(
 
     # Asegurar que se registra el punto final si el entrenamiento no fue roto por el break
     if record_curve and episodes_to_optimal == episodes and episodes % EVAL_INTERVAL != 0:
-        wins_c, losses_c, draws_c = evaluate_vs_minimax(agent, num_games=20)
+        wins_c, losses_c, draws_c = evaluate_vs_minimax(agent, num_games=20, oracle=oracle)
         success_rate = (wins_c + draws_c) / 20.0
         learning_curve_data.append({"episode": episodes, "success_rate": success_rate})
 
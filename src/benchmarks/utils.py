@@ -1,26 +1,31 @@
-import os
-import pickle
-
 from src.ai.minimax import find_best_move_alpha_beta
+from src.ai.oracle import OpponentOracle
 from src.ai.ql_agent import QLearningAgent
-from src.game_logic.board import Board
-
-
-def evaluate_vs_minimax(ql_agent: QLearningAgent, num_games=20, pickle_path="tictactoe_lookup.pkl") -> tuple:
+from src.ai.search import search
+from src.config import AI_MOVE_DEADLINE_MS
+from src.game_logic.engine import create_simulation_board
+
+
+def evaluate_vs_minimax(
+    ql_agent: QLearningAgent,
+    num_games=20,
+    pickle_path="tictactoe_lookup.pkl",
+    oracle: OpponentOracle = None,
+    move_deadline_ms=AI_MOVE_DEADLINE_MS,
+) -> tuple:
     """
     Evalúa el rendimiento de un agente Q-Learning contra un agente Minimax perfecto.
-    Usa la tabla precomputada para mayor velocidad y recurre al minimax real si es necesario.
+    Usa la tabla precomputada (oracle compartido por proceso) y recurre al minimax real si es necesario;
+    con move_deadline_ms ese respaldo es la búsqueda anytime con plazo por jugada.
     """
-    lookup_table = None
-    if os.path.exists(pickle_path):
-        with open(pickle_path, "rb") as f:
-            lookup_table = pickle.load(f)
+    if oracle is None:
+        oracle = OpponentOracle.shared(pickle_path)
 
     ql_agent.epsilon = 0
     wins, losses, draws = 0, 0, 0
 
     for i in range(num_games):
-        board = Board()
+        board = create_simulation_board()
         ql_is_p1 = i % 2 == 0
 
         while not board.game_over:
@@ -30,12 +35,10 @@ def evaluate_vs_minimax(ql_agent: QLearningAgent, num_games=20, pickle_path="tic
             if is_ql_turn:
                 move = ql_agent.choose_action(board)
             else:
-                state_hash = tuple(item for row in board.board for item in row)
-                move_data = lookup_table.get(state_hash) if lookup_table else None
-
-                if move_data is not None:
-                    move = move_data["move"] if isinstance(move_data, dict) else move_data
-                else:
+                move = oracle.get_move(board)
+                if move is None and move_deadline_ms is not None:
+                    move, _ = search(board, deadline_ms=move_deadline_ms)
+                elif move is None:
                     move, _ = find_best_move_alpha_beta(board)
 
             if move:
@@ -23,6 +23,20 @@ BOARD_WIDTH = 600
 BOARD_OFFSET_Y = 100  # Margen superior
 BOARD_OFFSET_X = 50  # Margen izquierdo
 BOARD_ROWS, BOARD_COLS = 3, 3
+# Fichas en línea necesarias para ganar (p. ej. 4x4 con 4 en raya, 5x5 con 4 en raya)
+WIN_LENGTH = 3
+# Motor de tablero usado por el juego, el gimnasio y los evaluadores: "matrix" (Board) o "bitboard" (BitBoard)
+BOARD_ENGINE = "bitboard"
+# Motor para simular partidas en el gimnasio y los evaluadores: "table" avanza por consultas a TransitionTable
+# (generada una vez y guardada junto a la tabla de juego perfecto); sin índice denso se usa BOARD_ENGINE
+SIMULATION_ENGINE = "table"
+# Almacenamiento de la Q-table: "dict" ((estado, accion) -> q) o "array" (ndarray float32 [estados, casillas])
+Q_TABLE_BACKEND = "array"
+# Q-learning sobre representantes canónicos: las 8 rotaciones/reflejos de una posición comparten valores Q
+Q_CANONICAL_STATES = False
+# Plazo (ms) por jugada de la IA minimax (GUI y evaluadores); None = búsqueda completa sin límite de tiempo.
+# Más allá de 3x3 la búsqueda completa no es viable y se usa la búsqueda anytime con plazo
+AI_MOVE_DEADLINE_MS = None if BOARD_ROWS * BOARD_COLS <= 9 else 1000
 SQUARE_SIZE = BOARD_WIDTH // BOARD_COLS
 LINE_WIDTH = 15
 
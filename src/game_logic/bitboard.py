@@ -0,0 +1,119 @@
+from typing import Tuple
+
+from src.config import BOARD_COLS, BOARD_ROWS, WIN_LENGTH
+from src.game_logic.lines import get_line_table
+from src.game_logic.state_index import get_state_index
+
+
+class BitBoard:
+    """
+    Motor de tablero alternativo: un entero con un bit por casilla para cada jugador.
+    Mantiene el mismo contrato que Board (make_move/undo_move/win_info) para poder
+    intercambiarse por configuración.
+    """
+
+    def __init__(self, rows=BOARD_ROWS, cols=BOARD_COLS, win_length=WIN_LENGTH):
+        self.geometry = get_line_table(rows, cols, win_length)
+        self.rows, self.cols = rows, cols
+        self._cell_bits = self.geometry.cell_bits
+        self._cell_codes = self.geometry.cell_codes
+        self._lines_through = self.geometry.lines_through
+        self._full_mask = self.geometry.full_mask
+        self._moves_by_occupancy = self.geometry.moves_by_occupancy
+        # bits[1] -> jugador 1, bits[2] -> jugador 2 (bits[0] no se usa)
+        self.bits = [0, 0, 0]
+        self.occupied = 0
+        self.reset()
+
+    def reset(self):
+        """Reinicia el tablero a su estado inicial."""
+        self.bits[1] = 0
+        self.bits[2] = 0
+        self.occupied = 0
+        self.code = 0  # Código base 3 del tablero, actualizado incrementalmente
+        self.winner = 0
+        self.turn = 1
+        self.game_over = False
+        self.win_info = None
+
+    @property
+    def board(self):
+        """Copia en lista de listas para el renderer y los agentes (escribir en ella no cambia el tablero)."""
+        p1, p2 = self.bits[1], self.bits[2]
+        return [[1 if p1 & bit else 2 if p2 & bit else 0 for bit in row_bits] for row_bits in self._cell_bits]
+
+    def is_valid_move(self, row, col):
+        """Verifica si una casilla está vacía."""
+        return not self.occupied & self._cell_bits[row][col]
+
+    def make_move(self, row, col):
+        """Realiza un movimiento y actualiza el estado del juego."""
+        bit = self._cell_bits[row][col]
+        if self.occupied & bit or self.game_over:
+            return False
+
+        player_bits = self.bits[self.turn] | bit
+        self.bits[self.turn] = player_bits
+        self.occupied |= bit
+        self.code += self.turn * self._cell_codes[row][col]
+
+        # Solo las líneas que pasan por la casilla jugada pueden haberse completado
+        for mask, win_info in self._lines_through[row][col]:
+            if player_bits & mask == mask:
+                self.win_info = win_info
+                self.winner = self.turn
+                self.game_over = True
+                return True
+
+        if self.occupied == self._full_mask:
+            self.game_over = True  # Es un empate
+        else:
+            self.turn = 2 if self.turn == 1 else 1
+        return True
+
+    def undo_move(self, row, col, prev_turn, prev_winner, prev_game_over, prev_win_info):
+        """Revierte el tablero a un estado anterior exacto."""
+        bit = self._cell_bits[row][col]
+        if self.occupied & bit:
+            self.code -= (1 if self.bits[1] & bit else 2) * self._cell_codes[row][col]
+        clear = ~bit
+        self.bits[1] &= clear
+        self.bits[2] &= clear
+        self.occupied &= clear
+        self.turn = prev_turn
+        self.winner = prev_winner
+        self.game_over = prev_game_over
+        self.win_info = prev_win_info
+
+    @property
+    def state_id(self) -> int:
+        """Id denso de la posición actual (ver StateIndex; solo para la geometría de config)."""
+        return get_state_index().dense_ids[self.code]
+
+    def switch_turn(self):
+        """Cambia el turno del jugador."""
+        self.turn = 2 if self.turn == 1 else 1
+
+    def is_full(self):
+        """Verifica si el tablero está lleno."""
+        return self.occupied == self._full_mask
+
+    def check_win(self):
+        """Recorre las máscaras de todas las líneas para el jugador en turno (win_type, index)."""
+        win_info = self.geometry.winning_line(self.bits[self.turn])
+        if win_info is None:
+            return False
+        self.win_info = win_info
+        return True
+
+    def get_available_moves(self) -> Tuple[Tuple[int, int], ...]:
+        """Retorna las casillas vacías como tupla (precalculada y compartida en tableros pequeños; ver engine.py)."""
+        if self._moves_by_occupancy is not None:
+            return self._moves_by_occupancy[self.occupied]
+        occupied = self.occupied
+        return tuple(
+            (row, col)
+            for row in range(self.rows)
+            for col in range(self.cols)
+            if not occupied & self._cell_bits[row][col]
+        )
@@ -1,19 +1,24 @@
 from typing import List, Tuple
 
-from src.config import BOARD_COLS, BOARD_ROWS
+from src.config import BOARD_COLS, BOARD_ROWS, WIN_LENGTH
+from src.game_logic.lines import get_line_table
+from src.game_logic.state_index import get_state_index
 
 
 class Board:
-    def __init__(self):
+    def __init__(self, rows=BOARD_ROWS, cols=BOARD_COLS, win_length=WIN_LENGTH):
+        self.geometry = get_line_table(rows, cols, win_length)
+        self.rows, self.cols = rows, cols
         # Inicializamos con listas de listas
-        self.board = [[0 for _ in range(BOARD_COLS)] for _ in range(BOARD_ROWS)]
+        self.board = [[0 for _ in range(cols)] for _ in range(rows)]
         self.reset()
 
     def reset(self):
         """Reinicia el tablero a su estado inicial."""
-        for row in range(BOARD_ROWS):
-            for col in range(BOARD_COLS):
+        for row in range(self.rows):
+            for col in range(self.cols):
                 self.board[row][col] = 0
+        self.code = 0  # Código base 3 del tablero, actualizado incrementalmente
         self.winner = 0
         self.turn = 1
         self.game_over = False
@@ -27,7 +32,8 @@ class Board:
         """Realiza un movimiento y actualiza el estado del juego."""
         if self.is_valid_move(row, col) and not self.game_over:
             self.board[row][col] = self.turn
-            if self.check_win():
+            self.code += self.turn * self.geometry.cell_codes[row][col]
+            if self.check_win(row, col):
                 self.winner = self.turn
                 self.game_over = True
             elif self.is_full():
@@ -39,12 +45,18 @@ class Board:
 
     def undo_move(self, row, col, prev_turn, prev_winner, prev_game_over, prev_win_info):
         """Revierte el tablero a un estado anterior exacto."""
+        self.code -= self.board[row][col] * self.geometry.cell_codes[row][col]
         self.board[row][col] = 0
         self.turn = prev_turn
         self.winner = prev_winner
         self.game_over = prev_game_over
         self.win_info = prev_win_info
 
+    @property
+    def state_id(self) -> int:
+        """Id denso de la posición actual (ver StateIndex; solo para la geometría de config)."""
+        return get_state_index().dense_ids[self.code]
+
     def switch_turn(self):
         """Cambia el turno del jugador."""
         self.turn = 2 if self.turn == 1 else 1
@@ -57,40 +69,47 @@ class Board:
                 return False
         return True
 
-    def check_win(self):
-        """Versión compatible con el Renderer (win_type, index)."""
+    def check_win(self, row=None, col=None):
+        """
+        Versión compatible con el Renderer (win_type, index) para el jugador en turno.
+        Con la última jugada (row, col) solo recorre las k-1 casillas a cada lado en las 4 direcciones.
+        """
         b = self.board
         p = self.turn
-
-        # Filas
-        for r in range(3):
-            if b[r][0] == b[r][1] == b[r][2] == p:
-                self.win_info = ("row", r)
-                return True
-
-        # Columnas
-        for c in range(3):
-            if b[0][c] == b[1][c] == b[2][c] == p:
-                self.win_info = ("col", c)
+        geometry = self.geometry
+
+        if row is None:
+            for _, cells, win_info in geometry.lines:
+                if all(b[r][c] == p for r, c in cells):
+                    self.win_info = win_info
+                    return True
+            return False
+
+        for direction, backward, forward in geometry.rays[row][col]:
+            run_back = 0
+            for r, c in backward:
+                if b[r][c] != p:
+                    break
+                run_back += 1
+            run_forward = 0
+            for r, c in forward:
+                if b[r][c] != p:
+                    break
+                run_forward += 1
+
+            if run_back + run_forward + 1 >= geometry.win_length:
+                # Se reporta la línea que empieza más atrás (la misma que elige BitBoard)
+                start = backward[run_back - 1] if run_back else (row, col)
+                self.win_info = geometry.line_at[(start[0], start[1], direction)]
                 return True
 
-        # Diagonal Principal
-        if b[0][0] == b[1][1] == b[2][2] == p:
-            self.win_info = ("diag", 1)
-            return True
-
-        # Diagonal Secundaria
-        if b[0][2] == b[1][1] == b[2][0] == p:
-            self.win_info = ("diag", 2)
-            return True
-
         return False
 
     def get_available_moves(self) -> List[Tuple[int, int]]:
         """Retorna una lista de tuplas (fila, col) para las casillas vacías."""
         moves: List[Tuple[int, int]] = []
-        for row in range(BOARD_ROWS):
-            for col in range(BOARD_COLS):
+        for row in range(self.rows):
+            for col in range(self.cols):
                 if self.board[row][col] == 0:
                     moves.append((row, col))
         return moves
@@ -0,0 +1,29 @@
+from src.config import BOARD_COLS, BOARD_ENGINE, BOARD_ROWS, SIMULATION_ENGINE, WIN_LENGTH
+from src.game_logic.bitboard import BitBoard
+from src.game_logic.board import Board
+from src.game_logic.state_index import DENSE_INDEX_AVAILABLE
+from src.game_logic.table_board import TableBoard
+
+# Contrato común de los motores: reset, make_move, undo_move, is_valid_move, switch_turn, is_full, check_win,
+# get_available_moves y los atributos code, state_id, turn, winner, game_over y win_info.
+# Solo Board expone estado mutable: en BitBoard y TableBoard `board` es una propiedad que construye una copia
+# en cada acceso (escribir en ella no cambia el tablero) y get_available_moves retorna una tupla compartida
+# (no se puede modificar). Quien necesite modificar la lista de jugadas debe copiarla: list(moves).
+BOARD_ENGINES = {
+    "matrix": Board,
+    "bitboard": BitBoard,
+    "table": TableBoard,
+}
+
+
+def create_board(engine=None, rows=BOARD_ROWS, cols=BOARD_COLS, win_length=WIN_LENGTH):
+    """Crea un tablero rows x cols (k en raya) con el motor indicado (o el definido en config.BOARD_ENGINE)."""
+    engine = engine or BOARD_ENGINE
+    if engine not in BOARD_ENGINES:
+        raise ValueError(f"Motor de tablero desconocido: {engine!r}. Opciones: {sorted(BOARD_ENGINES)}")
+    return BOARD_ENGINES[engine](rows, cols, win_length)
+
+
+def create_simulation_board():
+    """Tablero para simular partidas (gimnasio, evaluadores, análisis exacto): SIMULATION_ENGINE si hay índice denso."""
+    return create_board(SIMULATION_ENGINE if DENSE_INDEX_AVAILABLE else None)
@@ -0,0 +1,119 @@
+from functools import lru_cache
+
+from src.config import BOARD_COLS, BOARD_ROWS, WIN_LENGTH
+
+# Direcciones de las líneas, en el orden en que se reporta la victoria: filas, columnas, diagonal, antidiagonal
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+# Por encima de este número de casillas la tabla de jugadas por ocupación (2^casillas entradas) no compensa
+MOVE_TABLE_MAX_CELLS = 16
+
+
+class LineTable:
+    """
+    Geometría de un tablero rows x cols con victoria por k en raya (k = win_length).
+    Precalcula todas las líneas ganadoras y, por casilla, las que pasan por ella, para que
+    comprobar la victoria tras una jugada solo mire O(k) líneas en lugar de todo el tablero.
+    """
+
+    def __init__(self, rows=BOARD_ROWS, cols=BOARD_COLS, win_length=WIN_LENGTH):
+        if not 1 <= win_length <= max(rows, cols):
+            raise ValueError(f"k en raya inválido: {win_length} en un tablero {rows}x{cols}")
+
+        self.rows = rows
+        self.cols = cols
+        self.win_length = win_length
+        self.num_cells = rows * cols
+        self.full_mask = (1 << self.num_cells) - 1
+        # Cada casilla ocupa un bit (índice = fila * cols + col) y pesa 3^índice en el código base 3
+        self.cell_bits = [[1 << (row * cols + col) for col in range(cols)] for row in range(rows)]
+        self.cell_codes = [[3 ** (row * cols + col) for col in range(cols)] for row in range(rows)]
+
+        # lines: (máscara, casillas, win_info) | lines_through[fila][col]: (máscara, win_info) de las que la contienen
+        self.lines = []
+        self.lines_through = [[[] for _ in range(cols)] for _ in range(rows)]
+        # rays[fila][col]: por dirección, (casillas hacia atrás, casillas hacia adelante, k-1 como máximo cada una)
+        self.rays = [[[] for _ in range(cols)] for _ in range(rows)]
+        # win_info de la línea de k casillas que empieza en (fila, col) con la dirección dada
+        self.line_at = {}
+
+        for direction, (d_row, d_col) in enumerate(DIRECTIONS):
+            for row in range(rows):
+                for col in range(cols):
+                    cells = [(row + d_row * i, col + d_col * i) for i in range(win_length)]
+                    if not all(0 <= r < rows and 0 <= c < cols for r, c in cells):
+                        continue
+                    mask = 0
+                    for r, c in cells:
+                        mask |= self.cell_bits[r][c]
+                    win_info = self._win_info(direction, cells)
+                    self.lines.append((mask, tuple(cells), win_info))
+                    self.line_at[(row, col, direction)] = win_info
+                    for r, c in cells:
+                        self.lines_through[r][c].append((mask, win_info))
+
+        for row in range(rows):
+            for col in range(cols):
+                for direction, (d_row, d_col) in enumerate(DIRECTIONS):
+                    backward = self._ray(row, col, -d_row, -d_col)
+                    forward = self._ray(row, col, d_row, d_col)
+                    self.rays[row][col].append((direction, backward, forward))
+
+        self.static_rank = self._static_rank()
+        self._moves_by_occupancy = None
+
+    def _win_info(self, direction, cells):
+        """
+        Formato compatible con el renderer: ("row", r), ("col", c), ("diag", 1 | 2) cuando la línea cruza
+        el tablero completo; ("line", ((fila, col) inicial, (fila, col) final)) en cualquier otro caso.
+        """
+        (start_row, start_col), end = cells[0], cells[-1]
+        k = self.win_length
+        if direction == 0 and k == self.cols:
+            return ("row", start_row)
+        if direction == 1 and k == self.rows:
+            return ("col", start_col)
+        if direction >= 2 and k == self.rows == self.cols:
+            return ("diag", direction - 1)
+        return ("line", ((start_row, start_col), end))
+
+    def _ray(self, row, col, d_row, d_col):
+        cells = []
+        for step in range(1, self.win_length):
+            r, c = row + d_row * step, col + d_col * step
+            if not (0 <= r < self.rows and 0 <= c < self.cols):
+                break
+            cells.append((r, c))
+        return tuple(cells)
+
+    def _static_rank(self):
+        """
+        Orden estático de jugadas: más líneas ganadoras por la casilla, antes se explora.
+        En 3x3 equivale a centro > esquinas > bordes.
+        """
+        counts = {(row, col): len(self.lines_through[row][col]) for row in range(self.rows) for col in range(self.cols)}
+        distinct = sorted(set(counts.values()), reverse=True)
+        return {move: distinct.index(count) for move, count in counts.items()}
+
+    @property
+    def moves_by_occupancy(self):
+        """Para cada máscara de ocupación, la tupla de casillas libres (None si el tablero es demasiado grande)."""
+        if self._moves_by_occupancy is None and self.num_cells <= MOVE_TABLE_MAX_CELLS:
+            cells = [(row, col) for row in range(self.rows) for col in range(self.cols)]
+            self._moves_by_occupancy = [
+                tuple(move for index, move in enumerate(cells) if not occupied >> index & 1)
+                for occupied in range(self.full_mask + 1)
+            ]
+        return self._moves_by_occupancy
+
+    def winning_line(self, player_bits):
+        """win_info de la primera línea completa en las casillas dadas (o None)."""
+        for mask, _, win_info in self.lines:
+            if player_bits & mask == mask:
+                return win_info
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_line_table(rows=BOARD_ROWS, cols=BOARD_COLS, win_length=WIN_LENGTH) -> LineTable:
+    """Tabla compartida por geometría (se construye una sola vez por proceso)."""
+    return LineTable(rows, cols, win_length)
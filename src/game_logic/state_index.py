@@ -0,0 +1,102 @@
+from functools import lru_cache
+from typing import List, Sequence
+
+from src.config import BOARD_COLS, BOARD_ROWS
+
+NUM_CELLS = BOARD_ROWS * BOARD_COLS
+# Peso de cada casilla en el código base 3: código = sum(valor_casilla * 3^(fila * BOARD_COLS + col))
+CELL_CODES = [[3 ** (row * BOARD_COLS + col) for col in range(BOARD_COLS)] for row in range(BOARD_ROWS)]
+NUM_CODES = 3**NUM_CELLS
+# El índice denso guarda una entrada por código (3^casillas): solo es viable en tableros pequeños
+DENSE_INDEX_MAX_CELLS = 12
+DENSE_INDEX_AVAILABLE = NUM_CELLS <= DENSE_INDEX_MAX_CELLS
+
+
+def code_of(board_matrix) -> int:
+    """Código base 3 de un tablero en lista de listas."""
+    code = 0
+    for row, weights in zip(board_matrix, CELL_CODES):
+        for value, weight in zip(row, weights):
+            code += value * weight
+    return code
+
+
+def code_of_flat(cells: Sequence[int]) -> int:
+    """Código base 3 de un tablero aplanado (tupla de 9 valores, como en tictactoe_lookup.pkl)."""
+    code = 0
+    weight = 1
+    for value in cells:
+        code += value * weight
+        weight *= 3
+    return code
+
+
+def decode(code: int) -> List[List[int]]:
+    """Reconstruye el tablero en lista de listas a partir de su código base 3."""
+    matrix = [[0] * BOARD_COLS for _ in range(BOARD_ROWS)]
+    for row in range(BOARD_ROWS):
+        for col in range(BOARD_COLS):
+            code, matrix[row][col] = divmod(code, 3)
+    return matrix
+
+
+class StateIndex:
+    """
+    Índice denso de posiciones alcanzables.
+    code -> id denso en [0, num_states) y viceversa. Los ids se asignan en orden creciente de código,
+    así que son estables entre ejecuciones y procesos. Con `codes` indexa un subconjunto dado
+    (p. ej. los representantes canónicos por simetría).
+    """
+
+    def __init__(self, codes=None):
+        if not DENSE_INDEX_AVAILABLE:
+            raise ValueError(
+                f"Índice denso no disponible para {BOARD_ROWS}x{BOARD_COLS} ({NUM_CODES} códigos); "
+                "use Q_TABLE_BACKEND = 'dict'"
+            )
+        self.codes = sorted(codes) if codes is not None else self._enumerate_reachable_codes()
+        self.num_states = len(self.codes)
+
+        self.dense_ids = [-1] * NUM_CODES
+        for state_id, code in enumerate(self.codes):
+            self.dense_ids[code] = state_id
+
+    @staticmethod
+    def _enumerate_reachable_codes():
+        # Import local: los motores de tablero importan CELL_CODES desde este módulo
+        from src.game_logic.bitboard import BitBoard
+
+        seen = set()
+        board = BitBoard()
+
+        def visit():
+            if board.code in seen:
+                return
+            seen.add(board.code)
+            if board.game_over:
+                return
+            for move in board.get_available_moves():
+                prev_state = (board.turn, board.winner, board.game_over, board.win_info)
+                board.make_move(move[0], move[1])
+                visit()
+                board.undo_move(move[0], move[1], *prev_state)
+
+        visit()
+        return sorted(seen)
+
+    def id_of_code(self, code: int) -> int:
+        """Id denso del código (-1 si la posición no es alcanzable)."""
+        return self.dense_ids[code]
+
+    def id_of(self, board_matrix) -> int:
+        """Id denso de un tablero en lista de listas."""
+        return self.dense_ids[code_of(board_matrix)]
+
+    def code_of_id(self, state_id: int) -> int:
+        return self.codes[state_id]
+
+
+@lru_cache(maxsize=None)
+def get_state_index() -> StateIndex:
+    """Índice compartido por proceso (se construye una sola vez)."""
+    return StateIndex()
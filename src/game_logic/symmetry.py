@@ -0,0 +1,83 @@
+from functools import lru_cache
+from typing import List
+
+import numpy as np
+
+from src.config import BOARD_COLS, BOARD_ROWS
+from src.game_logic.state_index import NUM_CELLS, StateIndex, decode, get_state_index
+
+
+def build_transforms(rows=BOARD_ROWS, cols=BOARD_COLS) -> List[List[int]]:
+    """
+    Simetrías del tablero como permutaciones de casillas: transforms[t][casilla] = casilla imagen.
+    Identidad, reflejos horizontal y vertical y giro de 180°; en tableros cuadrados además los giros
+    de 90° y 270° y las dos trasposiciones (grupo diédrico de 8 elementos). La identidad va primero.
+    """
+    last_row, last_col = rows - 1, cols - 1
+    mappings = [
+        lambda r, c: (r, c),
+        lambda r, c: (r, last_col - c),
+        lambda r, c: (last_row - r, c),
+        lambda r, c: (last_row - r, last_col - c),
+    ]
+    if rows == cols:
+        mappings += [
+            lambda r, c: (c, r),
+            lambda r, c: (c, last_row - r),
+            lambda r, c: (last_col - c, r),
+            lambda r, c: (last_col - c, last_row - r),
+        ]
+
+    transforms = []
+    for mapping in mappings:
+        images = [mapping(row, col) for row in range(rows) for col in range(cols)]
+        transforms.append([row * cols + col for row, col in images])
+    return transforms
+
+
+class SymmetryTable:
+    """
+    Representante canónico de cada posición alcanzable bajo las simetrías del tablero.
+    Por id denso de StateIndex guarda el id canónico y la transformación que lleva la posición a él,
+    más las tablas para pasar jugadas (fila, col) al espacio canónico y de vuelta. En 3x3 las 5478
+    posiciones se reducen a 765.
+    """
+
+    def __init__(self, state_index=None):
+        state_index = state_index or get_state_index()
+        self.transforms = build_transforms()
+
+        codes = np.array(state_index.codes, dtype=np.int64)
+        cells = np.empty((len(codes), NUM_CELLS), dtype=np.int64)
+        remaining = codes.copy()
+        for cell in range(NUM_CELLS):
+            remaining, cells[:, cell] = np.divmod(remaining, 3)
+
+        # transformed[t, estado] = código de la posición tras aplicar la transformación t
+        transformed = np.stack([cells @ (3 ** np.array(transform, dtype=np.int64)) for transform in self.transforms])
+        best = transformed.argmin(axis=0)
+        canonical_codes = transformed[best, np.arange(len(codes))]
+
+        self.index = StateIndex(np.unique(canonical_codes).tolist())
+        self.num_states = self.index.num_states
+        self.canonical_ids = [self.index.dense_ids[code] for code in canonical_codes.tolist()]
+        self.transform_of = best.tolist()
+        self.canonical_keys = [tuple(tuple(row) for row in decode(code)) for code in self.index.codes]
+        # member_codes[id canónico]: códigos de todas las posiciones que comparten ese representante
+        self.member_codes = [[] for _ in range(self.num_states)]
+        for code, canonical_id in zip(state_index.codes, self.canonical_ids):
+            self.member_codes[canonical_id].append(code)
+
+        moves = [(row, col) for row in range(BOARD_ROWS) for col in range(BOARD_COLS)]
+        self.action_to_canonical = [
+            {move: moves[transform[cell]] for cell, move in enumerate(moves)} for transform in self.transforms
+        ]
+        self.action_from_canonical = [
+            {canonical: move for move, canonical in mapping.items()} for mapping in self.action_to_canonical
+        ]
+
+
+@lru_cache(maxsize=None)
+def get_symmetry_table() -> SymmetryTable:
+    """Tabla compartida por proceso (se construye una sola vez)."""
+    return SymmetryTable()
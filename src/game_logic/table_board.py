@@ -0,0 +1,127 @@
+from functools import lru_cache
+from typing import Tuple
+
+from src.config import BOARD_COLS, BOARD_ROWS, WIN_LENGTH
+from src.game_logic.lines import get_line_table
+from src.game_logic.state_index import DENSE_INDEX_AVAILABLE, NUM_CELLS, decode, get_state_index
+from src.game_logic.transitions import get_transition_table
+
+
+@lru_cache(maxsize=None)
+def _python_tables():
+    """TransitionTable en listas de Python (indexar listas es más rápido que indexar ndarrays de a un elemento)."""
+    transitions = get_transition_table()
+    codes = transitions.codes.tolist()
+    occupancy = [sum(1 << cell for cell in range(NUM_CELLS) if (code // 3**cell) % 3) for code in codes]
+    return (
+        transitions.next_state.tolist(),
+        codes,
+        transitions.winner.tolist(),
+        transitions.terminal.tolist(),
+        occupancy,
+    )
+
+
+class TableBoard:
+    """
+    Motor de tablero sin reglas en tiempo de ejecución: la posición es su id denso en TransitionTable y
+    cada jugada es una consulta a next_state (sin validar, comprobar líneas ni recorrer el tablero).
+    Mantiene el contrato de Board/BitBoard (make_move/undo_move/win_info); solo para la geometría de config.
+    """
+
+    def __init__(self, rows=BOARD_ROWS, cols=BOARD_COLS, win_length=WIN_LENGTH):
+        if not DENSE_INDEX_AVAILABLE or (rows, cols, win_length) != (BOARD_ROWS, BOARD_COLS, WIN_LENGTH):
+            raise ValueError(f"El motor 'table' solo admite la geometría de config con índice denso ({rows}x{cols})")
+        self.geometry = get_line_table(rows, cols, win_length)
+        self.rows, self.cols = rows, cols
+        self._next, self._codes, self._winners, self._terminal, self._occupancy = _python_tables()
+        self._dense_ids = get_state_index().dense_ids
+        self._cell_codes = [3**cell for cell in range(NUM_CELLS)]
+        self._moves_by_occupancy = self.geometry.moves_by_occupancy
+        self.reset()
+
+    def reset(self):
+        """Reinicia el tablero a su estado inicial."""
+        self.state_id = self._dense_ids[0]
+        self.code = 0
+        self.winner = 0
+        self.turn = 1
+        self.game_over = False
+        self.win_info = None
+
+    @property
+    def board(self):
+        """Copia en lista de listas para el renderer y los agentes (escribir en ella no cambia el tablero)."""
+        return decode(self.code)
+
+    @property
+    def occupied(self):
+        return self._occupancy[self.state_id]
+
+    def _player_bits(self, player):
+        code, bits = self.code, 0
+        for cell in range(NUM_CELLS):
+            code, value = divmod(code, 3)
+            if value == player:
+                bits |= 1 << cell
+        return bits
+
+    def is_valid_move(self, row, col):
+        """Verifica si una casilla está vacía."""
+        return not self.occupied >> (row * self.cols + col) & 1
+
+    def make_move(self, row, col):
+        """Realiza un movimiento y actualiza el estado del juego."""
+        if self.game_over:
+            return False
+        child = self._next[self.state_id][row * self.cols + col]
+        if child < 0:
+            return False
+
+        self.state_id = child
+        self.code = self._codes[child]
+        if self._terminal[child]:
+            self.game_over = True
+            self.winner = self._winners[child]
+            if self.winner:
+                # La misma línea que reporta BitBoard: la primera completa entre las que pasan por la casilla
+                player_bits = self._player_bits(self.winner)
+                for mask, win_info in self.geometry.lines_through[row][col]:
+                    if player_bits & mask == mask:
+                        self.win_info = win_info
+                        break
+        else:
+            self.turn = 2 if self.turn == 1 else 1
+        return True
+
+    def undo_move(self, row, col, prev_turn, prev_winner, prev_game_over, prev_win_info):
+        """Revierte el tablero a un estado anterior exacto."""
+        weight = self._cell_codes[row * self.cols + col]
+        value = self.code // weight % 3
+        if value:
+            self.code -= value * weight
+            self.state_id = self._dense_ids[self.code]
+        self.turn = prev_turn
+        self.winner = prev_winner
+        self.game_over = prev_game_over
+        self.win_info = prev_win_info
+
+    def switch_turn(self):
+        """Cambia el turno del jugador."""
+        self.turn = 2 if self.turn == 1 else 1
+
+    def is_full(self):
+        """Verifica si el tablero está lleno."""
+        return self.occupied == self.geometry.full_mask
+
+    def check_win(self):
+        """Recorre las máscaras de todas las líneas para el jugador en turno (win_type, index)."""
+        win_info = self.geometry.winning_line(self._player_bits(self.turn))
+        if win_info is None:
+            return False
+        self.win_info = win_info
+        return True
+
+    def get_available_moves(self) -> Tuple[Tuple[int, int], ...]:
+        """Retorna las casillas vacías como tupla precalculada y compartida (ver engine.py)."""
+        return self._moves_by_occupancy[self.occupied]
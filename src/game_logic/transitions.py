@@ -0,0 +1,100 @@
+import os
+import zipfile
+from functools import lru_cache
+
+import numpy as np
+
+from src.ai.oracle import DEFAULT_LOOKUP_PATH
+from src.config import BOARD_COLS, BOARD_ROWS, WIN_LENGTH
+from src.game_logic.lines import get_line_table
+from src.game_logic.state_index import NUM_CELLS, get_state_index
+
+# Caché en disco junto a la tabla de juego perfecto
+DEFAULT_TRANSITIONS_PATH = os.path.splitext(DEFAULT_LOOKUP_PATH)[0] + ".transitions.npz"
+ARRAYS = ("codes", "turn", "winner", "terminal", "legal_mask", "next_state")
+
+
+class TransitionTable:
+    """
+    Modelo del juego sobre el índice denso de posiciones alcanzables, para simular partidas con consultas
+    a arreglos en lugar de tableros: next_state[estado, casilla] (id del hijo, -1 si la jugada no es legal),
+    turn[estado], winner[estado] (0 sin ganador), terminal[estado] y legal_mask[estado, casilla].
+    """
+
+    def __init__(self, state_index=None):
+        state_index = state_index or get_state_index()
+        self.geometry = (BOARD_ROWS, BOARD_COLS, WIN_LENGTH)
+        self.codes = codes = np.array(state_index.codes, dtype=np.int64)
+        cells = np.empty((len(codes), NUM_CELLS), dtype=np.int64)
+        remaining = codes.copy()
+        for cell in range(NUM_CELLS):
+            remaining, cells[:, cell] = np.divmod(remaining, 3)
+
+        self.num_states = len(codes)
+        self.turn = np.where(np.count_nonzero(cells, axis=1) % 2 == 0, 1, 2).astype(np.int8)
+        self.winner = np.zeros(self.num_states, dtype=np.int8)
+        weights = np.left_shift(np.int64(1), np.arange(NUM_CELLS, dtype=np.int64))
+        for player in (1, 2):
+            bits = (cells == player).astype(np.int64) @ weights
+            for mask, _, _ in get_line_table().lines:
+                self.winner[(bits & mask) == mask] = player
+        self.terminal = (self.winner != 0) | np.all(cells != 0, axis=1)
+        self.legal_mask = (cells == 0) & ~self.terminal[:, None]
+
+        dense_ids = np.array(state_index.dense_ids, dtype=np.int32)
+        child_codes = codes[:, None] + self.turn[:, None].astype(np.int64) * 3 ** np.arange(NUM_CELLS, dtype=np.int64)
+        self.next_state = np.where(self.legal_mask, dense_ids[np.where(self.legal_mask, child_codes, 0)], -1)
+        self.next_state = self.next_state.astype(np.int32)
+
+    def save(self, path):
+        """
+        Escribe las tablas en un .npz completo antes de hacerlo visible (igual que los niveles del retrógrado).
+        El temporal lleva el pid: varios workers pueden generar y guardar la tabla a la vez.
+        """
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        try:
+            np.savez(tmp_path, geometry=np.array(self.geometry), **{name: getattr(self, name) for name in ARRAYS})
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def load(cls, path, state_index=None):
+        """
+        Tablas guardadas con save, o None si no existen, son de otra geometría / otro índice de estados o el
+        archivo está incompleto o dañado (entonces se regeneran).
+        """
+        if not os.path.exists(path):
+            return None
+        state_index = state_index or get_state_index()
+        try:
+            with np.load(path) as data:
+                if tuple(data["geometry"].tolist()) != (BOARD_ROWS, BOARD_COLS, WIN_LENGTH):
+                    return None
+                if not np.array_equal(data["codes"], state_index.codes):
+                    return None
+                table = cls.__new__(cls)
+                table.geometry = (BOARD_ROWS, BOARD_COLS, WIN_LENGTH)
+                for name in ARRAYS:
+                    setattr(table, name, data[name])
+        except (OSError, ValueError, EOFError, KeyError, zipfile.BadZipFile):
+            return None
+        table.num_states = len(table.codes)
+        return table
+
+
+@lru_cache(maxsize=None)
+def get_transition_table(path=DEFAULT_TRANSITIONS_PATH) -> TransitionTable:
+    """
+    Tabla compartida por proceso. Se lee de `path` si existe y corresponde a la geometría de config; si no,
+    se genera una vez y se guarda ahí (si la carpeta no es escribible se usa solo en memoria).
+    """
+    table = TransitionTable.load(path)
+    if table is None:
+        table = TransitionTable()
+        try:
+            table.save(path)
+        except OSError:
+            pass
+    return table
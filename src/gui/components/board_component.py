@@ -1,14 +1,14 @@
 import pygame
 
-from src.config import CIRCLE_COLOR, CROSS_COLOR, LINE_COLOR, LINE_WIDTH
+from src.config import BOARD_COLS, BOARD_ROWS, CIRCLE_COLOR, CROSS_COLOR, LINE_COLOR, LINE_WIDTH
 from src.gui.shapes import ShapeDrawer
 
 
 class BoardComponent:
-    def __init__(self, rect: pygame.Rect):
+    def __init__(self, rect: pygame.Rect, rows=BOARD_ROWS, cols=BOARD_COLS):
         self.rect = rect
-        self.rows = 3
-        self.cols = 3
+        self.rows = rows
+        self.cols = cols
 
         self.cell_w = self.rect.width // self.cols
         self.cell_h = self.rect.height // self.rows
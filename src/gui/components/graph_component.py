@@ -44,13 +44,15 @@ class GraphComponent:
         rect = pygame.Rect(x, y, size, size)
         pygame.draw.rect(surface, (255, 255, 255), rect)
         pygame.draw.rect(surface, (0, 0, 0), rect, 1)
-        cell_size = size // 3
-        for i in range(1, 3):
+        rows, cols = len(board_state), len(board_state[0])
+        cell_size = size // max(rows, cols)
+        for i in range(1, rows):
             pygame.draw.line(surface, (200, 200, 200), (x, y + i * cell_size), (x + size, y + i * cell_size), 1)
+        for i in range(1, cols):
             pygame.draw.line(surface, (200, 200, 200), (x + i * cell_size, y), (x + i * cell_size, y + size), 1)
 
-        for r in range(3):
-            for c in range(3):
+        for r in range(rows):
+            for c in range(cols):
                 val = board_state[r][c]
                 if val == 0:
                     continue
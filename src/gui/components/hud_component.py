@@ -24,27 +24,21 @@ class HUDComponent:
         if not board_logic.win_info:
             return
 
-        win_type, index = board_logic.win_info
+        (start_row, start_col), (end_row, end_col) = self._win_line_cells(board_logic)
         b_rect = board_view.rect
-
-        # Puntos de inicio y fin (relativos al board_rect)
-        if win_type == "row":
-            y = b_rect.top + index * board_view.cell_h + board_view.cell_h // 2
-            start_pos = (b_rect.left + 20, y)
-            end_pos = (b_rect.right - 20, y)
-
-        elif win_type == "col":
-            x = b_rect.left + index * board_view.cell_w + board_view.cell_w // 2
-            start_pos = (x, b_rect.top + 20)
-            end_pos = (x, b_rect.bottom - 20)
-
-        elif win_type == "diag":
-            if index == 1:  # Descendente
-                start_pos = (b_rect.left + 20, b_rect.top + 20)
-                end_pos = (b_rect.right - 20, b_rect.bottom - 20)
-            else:  # Ascendente
-                start_pos = (b_rect.left + 20, b_rect.bottom - 20)
-                end_pos = (b_rect.right - 20, b_rect.top + 20)
+        cell_w, cell_h = board_view.cell_w, board_view.cell_h
+
+        # Centros de las casillas extremas, extendidos hasta 20 px del borde de la casilla
+        d_col = (end_col > start_col) - (end_col < start_col)
+        d_row = (end_row > start_row) - (end_row < start_row)
+        start_pos = (
+            b_rect.left + start_col * cell_w + cell_w // 2 - d_col * (cell_w // 2 - 20),
+            b_rect.top + start_row * cell_h + cell_h // 2 - d_row * (cell_h // 2 - 20),
+        )
+        end_pos = (
+            b_rect.left + end_col * cell_w + cell_w // 2 + d_col * (cell_w // 2 - 20),
+            b_rect.top + end_row * cell_h + cell_h // 2 + d_row * (cell_h // 2 - 20),
+        )
 
         glow_colors = [
             (*WIN_LINE_COLOR, 50),
@@ -59,6 +53,20 @@ class HUDComponent:
 
         surface.blit(glow_surf, (0, 0))
 
+    @staticmethod
+    def _win_line_cells(board_logic):
+        """Casillas inicial y final de la línea ganadora a partir de win_info."""
+        win_type, index = board_logic.win_info
+        last_row, last_col = board_logic.rows - 1, board_logic.cols - 1
+        if win_type == "row":
+            return (index, 0), (index, last_col)
+        if win_type == "col":
+            return (0, index), (last_row, index)
+        if win_type == "diag":
+            # 1: descendente, 2: ascendente
+            return ((0, 0), (last_row, last_col)) if index == 1 else ((last_row, 0), (0, last_col))
+        return index  # ("line", (inicio, fin)) en tableros con k menor que el lado
+
     def draw_game_over(self, surface, screen_rect, board):
         if not board.game_over:
             return
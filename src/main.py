@@ -9,11 +9,17 @@ from src.ai.minimax import (
 )
 from src.ai.ql_agent import QLearningAgent
 from src.config import *
-from src.game_logic.board import Board
+from src.game_logic.engine import create_board
 from src.gui.renderer import Renderer
 from src.training.gym import train_with_decay
 
 
+def pump_events(current, total):
+    """Callback de entrenamiento: procesa eventos cada 200 episodios para que la ventana no quede colgada."""
+    if current % 200 == 0:
+        pygame.event.pump()
+
+
 # --- Enums y Constantes ---
 class GameState(Enum):
     MENU = 0
@@ -30,7 +36,7 @@ class GameController:
         pygame.display.set_caption("Comparador de IA: Minimax vs Alfa-Beta")
         self.clock = pygame.time.Clock()
 
-        self.board = Board()
+        self.board = create_board()
         self.renderer = Renderer(self.screen)
 
         self.state = GameState.MENU
@@ -75,14 +81,17 @@ class GameController:
         agent = QLearningAgent(epsilon=0)
         model_path = get_writable_path("q_table.pkl")
 
-        lookup_path = get_resource_path("tictactoe_lookup.pkl")
+        lookup_path = get_resource_path("tictactoe_lookup.bin")
 
         if os.path.exists(model_path):
             print(f"Cargando modelo en: {model_path}")
             agent.load_model(model_path)
         else:
             print("Entrenando nuevo agente...")
-            agent, _ = train_with_decay(QLearningAgent(), episodes=50000, pickle_path=lookup_path)
+            # El entrenamiento no toca pygame: la ventana se mantiene viva desde el callback
+            agent, _ = train_with_decay(
+                QLearningAgent(), episodes=50000, pickle_path=lookup_path, progress_callback=pump_events
+            )
             agent.save_model(model_path)
         return agent
 
@@ -274,7 +283,9 @@ class GameController:
             self.last_graph_data = []
         else:
             use_alpha_beta = ai_type == PlayerType.AI_FAST
-            move, tree_data = find_best_move_and_viz(self.board, use_alpha_beta=use_alpha_beta)
+            move, tree_data = find_best_move_and_viz(
+                self.board, use_alpha_beta=use_alpha_beta, deadline_ms=AI_MOVE_DEADLINE_MS
+            )
             self.last_graph_data = tree_data
 
         if move:
@@ -317,18 +328,8 @@ class GameController:
         q_data = None
         # Si es turno de IA QL o Humano vs QL, mostrar "pensamientos" (valores Q)
         if PlayerType.AI_QL in self.player_types and not self.board.game_over:
-            # Obtener valores Q para el estado actual
-            # 1. Convertir tablero a tupla (como hace el ql_agent)
-            state_key = tuple(tuple(row) for row in self.board.board)
-
-            q_data = {}
-            # 2. Iterar por todas las celdas (acciones posibles)
-            for r in range(3):
-                for c in range(3):
-                    # La llave en q_table es (state_tuple, action_tuple)
-                    full_key = (state_key, (r, c))
-                    if full_key in self.q_agent.q_table:
-                        q_data[(r, c)] = self.q_agent.q_table[full_key]
+            # Obtener valores Q para el estado actual (el agente resuelve la clave según su backend)
+            q_data = self.q_agent.get_q_values(self.board)
 
         # Determinar texto del encabezado de turno
         current_player_idx = self.board.turn - 1
@@ -439,7 +440,7 @@ class GameController:
         self.reset_board()
 
     def reset_board(self):
-        self.board = Board()
+        self.board = create_board()
         self.last_graph_data = []
         self.waiting_for_step = False
         self.paused_for_analysis = False  # Reiniciar estado de pausa
@@ -0,0 +1,73 @@
+import csv
+import os
+from collections import defaultdict
+
+FIELDNAMES = ["alpha", "gamma", "decay", "reward_draw", "episodes", "fitness", "episodes_to_optimal", "context"]
+
+
+def genome_key(individual, episodes):
+    """Clave del genoma con el mismo redondeo que usan la inicialización y la mutación, más el presupuesto."""
+    return (
+        round(individual.alpha, 2),
+        round(individual.gamma, 2),
+        round(individual.epsilon_decay_rate, 4),
+        round(individual.reward_draw, 2),
+        episodes,
+    )
+
+
+class FitnessCache:
+    """
+    Evaluaciones por genoma (clave de genome_key), con varias réplicas por genoma porque el entrenamiento es
+    estocástico. Si se indica path, se cargan las evaluaciones de ejecuciones anteriores y cada nueva se
+    añade al CSV al momento (una ejecución interrumpida no pierde lo ya evaluado). `context` describe lo que
+    la clave no incluye pero cambia la fitness (tablero, criterio de parada, penalizaciones): cada fila lo
+    guarda y al cargar solo se reutilizan las filas con el mismo contexto.
+    """
+
+    def __init__(self, path=None, replicates=1, context=""):
+        self.path = path
+        self.replicates = replicates
+        self.context = context
+        self.results = defaultdict(list)  # clave -> [(fitness, episodes_to_optimal)]
+        if path and os.path.isfile(path):
+            with open(path, newline="") as f:
+                reader = csv.DictReader(f)
+                if reader.fieldnames != FIELDNAMES:
+                    raise ValueError(
+                        f"{path} no tiene el formato de la caché de fitness ({', '.join(FIELDNAMES)}); "
+                        "bórralo o usa otro archivo"
+                    )
+                for row in reader:
+                    if row["context"] != context:
+                        continue
+                    key = (
+                        float(row["alpha"]),
+                        float(row["gamma"]),
+                        float(row["decay"]),
+                        float(row["reward_draw"]),
+                        int(row["episodes"]),
+                    )
+                    self.results[key].append((float(row["fitness"]), int(row["episodes_to_optimal"])))
+
+    def missing(self, key) -> int:
+        """Réplicas que faltan para el genoma."""
+        return max(0, self.replicates - len(self.results.get(key, ())))
+
+    def add(self, key, record):
+        self.results[key].append((record["fitness"], record["episodes_to_optimal"]))
+        if self.path:
+            write_header = not os.path.isfile(self.path)
+            with open(self.path, "a", newline="") as f:
+                writer = csv.writer(f)
+                if write_header:
+                    writer.writerow(FIELDNAMES)
+                writer.writerow([*key, record["fitness"], record["episodes_to_optimal"], self.context])
+
+    def record(self, key):
+        """Registro con la media de las réplicas, en el formato de GeneticQLAgent.result_record."""
+        results = self.results[key]
+        return {
+            "fitness": sum(fitness for fitness, _ in results) / len(results),
+            "episodes_to_optimal": round(sum(episodes for _, episodes in results) / len(results)),
+        }
@@ -1,22 +1,66 @@
 import csv
+import math
 import os
 import random
+import statistics
+import tempfile
 import time
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, wait
 
+from src.ai.policy_evaluation import best_response, evaluate_policy
 from src.ai.ql_agent import GeneticQLAgent
-from src.benchmarks.utils import evaluate_vs_minimax
+from src.config import BOARD_COLS, BOARD_ROWS, WIN_LENGTH
+from src.training.fitness_cache import FitnessCache, genome_key
 from src.training.gym import train_with_decay
+from src.training.population_trainer import train_population
+from src.training.worker_pool import WorkerPool
 
 POPULATION_SIZE = 50
 GENERATIONS = 30
 TOUR_SIZE = 15
-MAX_WORKERS = 6
-NUM_GAMES = 50
+MAX_WORKERS = None  # None: según CPUs y memoria disponibles (worker_pool.default_workers)
 NUM_EPISODES = 6500
 NUM_ELITES = 5
 MUTATION_START_RATE = 0.10
 MUTATION_END_RATE = 0.01
+# Criterio de parada de los checkpoints del entrenamiento (ver gym.stop_check): "sampled" (partidas contra
+# minimax), "exact" o "exploitability" (más estrictos: más episodios por individuo y otro speed bonus)
+STOP_CRITERION = "sampled"
+# Penalización por explotabilidad (0..2): desempata agentes que no pierden contra minimax pero sí contra otros
+# rivales. Con 0 (por defecto) el fitness es el original y no se calcula best_response
+EXPLOITABILITY_WEIGHT = 0.0
+# Carpeta donde los workers guardan la tabla Q de las élites de cada generación (None: no se guardan)
+ELITE_TABLES_DIR = None
+# Evaluaciones por genoma (el entrenamiento es estocástico) y caché persistente entre ejecuciones
+FITNESS_REPLICATES = 1
+FITNESS_CACHE_FILE = "queries/fitness_cache.csv"
+# Modo de estado estacionario: sin barrera por generación (ver run_steady_state_algorithm)
+STEADY_STATE = False
+# Entrenamiento de la población: "scalar" (train_with_decay por individuo) o "population" (train_population:
+# todos los individuos de un worker en un solo arreglo [individuos, estados, 9], avanzando sus partidas a la vez)
+TRAINING_BACKEND = "scalar"
+# Multi-fidelidad (successive halving): todos entrenan un tramo corto y solo el mejor 1/HALVING_ETA de los que
+# no convergieron sigue al tramo siguiente; la regla de la mediana descarta además a los que quedan bajo la
+# mediana del mismo tramo (esta generación y las anteriores)
+MULTI_FIDELITY = False
+HALVING_ETA = 2
+HALVING_RUNGS = 3
+# El primer checkpoint de train_with_decay es el episodio 1200: un tramo más corto no podría converger
+MIN_RUNG_EPISODES = 1200
+
+
+def fitness_context():
+    """
+    Lo que define la fitness además del genoma y el presupuesto: tablero, criterio de parada, penalización,
+    backend de entrenamiento y calendario de tramos de la multi-fidelidad (o "off"). Las filas de otro contexto
+    no se reutilizan.
+    """
+    schedule = "/".join(str(budget) for budget in rung_budgets()) if MULTI_FIDELITY else "off"
+    return (
+        f"{BOARD_ROWS}x{BOARD_COLS}/{WIN_LENGTH};stop={STOP_CRITERION};exploitability={EXPLOITABILITY_WEIGHT};"
+        f"backend={TRAINING_BACKEND};rungs={schedule}"
+    )
 
 
 def initialize_population():
@@ -60,13 +104,45 @@ def save_results_to_csv(population, generation, filename="genetic_results.csv"):
             )
 
 
+def score_individual(
+    individual, episodes, episodes_to_optimal, generation_num, total_generations, individual_index, total_individuals
+):
+    """
+    Fitness del individuo a partir de su agente ya entrenado. Retorna (calidad contra minimax, línea de log).
+    """
+    # Probabilidades exactas contra minimax: el resultado es determinista, sin partidas de muestra
+    wins, losses, draws = evaluate_policy(individual.agent)
+    quality_fitness = wins + draws
+    exploitability = best_response(individual.agent)["exploitability"] if EXPLOITABILITY_WEIGHT else None
+
+    speed_bonus = (episodes - episodes_to_optimal) / episodes
+
+    individual.episodes_to_optimal = episodes_to_optimal
+
+    if quality_fitness < 1.0:
+        individual.fitness = quality_fitness
+    else:
+        speed_bonus = (NUM_EPISODES - episodes_to_optimal) / NUM_EPISODES
+        individual.fitness = 1.0 + max(0, speed_bonus)
+    if exploitability is not None:
+        individual.fitness -= EXPLOITABILITY_WEIGHT * exploitability
+
+    exploitability_note = "" if exploitability is None else f" E:{exploitability:.2f}"
+    log_line = (
+        f"  [G{generation_num}/{total_generations} - Agente {individual_index + 1:02d}/{total_individuals}] "
+        f"Evaluando α={individual.alpha:.2f}, γ={individual.gamma:.2f} "
+        f"-> FITNESS: {individual.fitness:.3f} (D:{draws:.0%} L:{losses:.0%}{exploitability_note}) "
+        f"[CONV: {episodes_to_optimal}/{episodes}]"
+    )
+    return quality_fitness, log_line
+
+
 def evaluate_individual_task(individual_data, generation_num, total_generations, individual_index, total_individuals):
     """
     Función que realiza el entrenamiento y la evaluación de un solo agente.
     """
     individual = individual_data["agent"]
     episodes = individual_data["episodes"]
-    num_games = individual_data["num_games"]
     reward_draw_gen = individual.reward_draw
     decay_rate_gen = individual.epsilon_decay_rate
     """
@@ -77,58 +153,197 @@ def evaluate_individual_task(individual_data, generation_num, total_generations,
     """
 
     individual.instantiate_agent()
+    # Multi-fidelidad: la tabla del tramo anterior queda en resume_path y el entrenamiento sigue desde ahí
+    resume_path = individual_data.get("resume_path")
+    training_state = individual_data.get("training_state")
+    if training_state is not None:
+        individual.agent.load_model(resume_path)
+        individual.agent.training_state = training_state
     individual.agent, episodes_to_optimal = train_with_decay(
-        individual.agent, episodes=episodes, epsilon_decay_gen=decay_rate_gen, reward_draw_gen=reward_draw_gen
+        individual.agent,
+        episodes=episodes,
+        epsilon_decay_gen=decay_rate_gen,
+        reward_draw_gen=reward_draw_gen,
+        stop_criterion=STOP_CRITERION,
+        resume=training_state is not None,
+    )
+    quality_fitness, log_line = score_individual(
+        individual,
+        episodes,
+        episodes_to_optimal,
+        generation_num,
+        total_generations,
+        individual_index,
+        total_individuals,
     )
-    wins, _, draws = evaluate_vs_minimax(individual.agent, num_games=num_games)
-    quality_fitness = (wins + draws) / num_games
 
-    speed_bonus = (episodes - episodes_to_optimal) / episodes
+    # Solo vuelve el registro compacto: la tabla entrenada viaja (o se guarda en disco) únicamente si se pidió
+    record = individual.result_record(individual_data.get("keep_table", False), individual_data.get("table_path"))
+    if resume_path is not None:
+        individual.agent.save_model(resume_path)
+        record["training_state"] = individual.agent.training_state
+        # Sin pérdidas al final del tramo cuenta como convergido en `episodes` aunque no lo viera un checkpoint
+        record["converged"] = quality_fitness >= 1.0
+    return record, log_line
 
-    individual.episodes_to_optimal = episodes_to_optimal
 
-    if quality_fitness < 1.0:
-        individual.fitness = quality_fitness
-    else:
-        speed_bonus = (NUM_EPISODES - episodes_to_optimal) / NUM_EPISODES
-        individual.fitness = 1.0 + max(0, speed_bonus)
+def evaluate_batch_task(tasks):
+    """
+    Backend "population": entrena las tareas del bloque (tuplas de argumentos de evaluate_individual_task)
+    a la vez con train_population y retorna [(registro, línea de log)] en el mismo orden.
+    """
+    individuals = [task_data["agent"] for task_data, *_ in tasks]
+    genomes = [(ind.alpha, ind.gamma, ind.epsilon_decay_rate, ind.reward_draw) for ind in individuals]
+    episodes = tasks[0][0]["episodes"]
+    agents, episodes_to_optimal = train_population(genomes, episodes=episodes, stop_criterion=STOP_CRITERION)
+
+    results = []
+    for (task_data, *task_args), individual, agent, converged_at in zip(
+        tasks, individuals, agents, episodes_to_optimal
+    ):
+        individual.agent = agent
+        _, log_line = score_individual(individual, episodes, converged_at, *task_args)
+        record = individual.result_record(task_data.get("keep_table", False), task_data.get("table_path"))
+        results.append((record, log_line))
+    return results
+
+
+def evaluate_population_batches(tasks, pool):
+    """Como pool.imap_unordered(evaluate_individual_task, tasks), con un train_population por worker."""
+    size = max(1, math.ceil(len(tasks) / pool.max_workers))
+    batches = [(tasks[start : start + size],) for start in range(0, len(tasks), size)]
+    for batch_index, results in pool.imap_unordered(evaluate_batch_task, batches, chunk_size=1):
+        for offset, result in enumerate(results):
+            yield batch_index * size + offset, result
+
+
+def evaluate_population(population, generation_num, total_generations, pool, num_elites=0, cache=None):
+    """
+    Evalúa la población en el pool. Solo se entrenan los genomas a los que les faltan réplicas en la caché
+    (cada genoma repetido en la generación, una vez); el resto toma la media ya conocida. Los primeros
+    num_elites individuos (élites heredadas) guardan su tabla entrenada en ELITE_TABLES_DIR si está definido.
+    """
+    cache = cache or FitnessCache()
+    total_individuals = len(population)
 
-    log_line = (
-        f"  [G{generation_num}/{total_generations} - Agente {individual_index + 1:02d}/{total_individuals}] "
-        f"Evaluando α={individual.alpha:.2f}, γ={individual.gamma:.2f} "
-        f"-> FITNESS: {individual.fitness:.3f} (D:{draws} L:{num_games - wins - draws}) "
-        f"[CONV: {episodes_to_optimal}/{episodes}]"
-    )
+    tasks, task_targets, scheduled = [], [], set()
+    for i, individual in enumerate(population):
+        key = genome_key(individual, NUM_EPISODES)
+        table_path = None
+        if ELITE_TABLES_DIR and i < num_elites and individual.table_path is None:
+            table_path = os.path.join(ELITE_TABLES_DIR, f"g{generation_num:03d}_elite{i:02d}.pkl")
+        # La élite sin tabla guardada se entrena una vez más (la réplica extra también entra en la caché)
+        replicates = cache.missing(key) if key not in scheduled else 0
+        if table_path is not None:
+            replicates = max(replicates, 1)
+        scheduled.add(key)
+
+        for replicate in range(replicates):
+            task_data = {"agent": individual, "episodes": NUM_EPISODES}
+            if replicate == 0 and table_path is not None:
+                task_data["table_path"] = table_path
+            tasks.append((task_data, generation_num, total_generations, i, total_individuals))
+            task_targets.append((key, i))
+
+    if TRAINING_BACKEND == "population":
+        results = evaluate_population_batches(tasks, pool)
+    else:
+        results = pool.imap_unordered(evaluate_individual_task, tasks)
+    for task_index, (record, log_line) in results:
+        key, individual_index = task_targets[task_index]
+        cache.add(key, record)
+        if "table_path" in record:
+            population[individual_index].table_path = record["table_path"]
 
-    return individual, log_line
+        print(log_line)
 
+    for individual in population:
+        individual.apply_result(cache.record(genome_key(individual, NUM_EPISODES)))
+    print(f"  {len(tasks)} entrenamientos para {len(scheduled)} genomas distintos ({total_individuals} individuos)")
 
-def evaluate_population(population, generation_num, total_generations):
-    total_individuals = len(population)
 
-    tasks = []
-    for i, individual in enumerate(population):
-        task_data = {
-            "agent": individual,
-            "episodes": NUM_EPISODES,
-            "num_games": NUM_GAMES,
-        }
-        tasks.append((task_data, generation_num, total_generations, i, total_individuals))
+def rung_budgets(max_episodes=None, eta=None, rungs=None):
+    """Episodios acumulados al final de cada tramo: max/eta^(rungs-1), ..., max/eta, max (múltiplos de 200)."""
+    max_episodes = max_episodes or NUM_EPISODES
+    eta = eta or HALVING_ETA
+    rungs = rungs or HALVING_RUNGS
+    budgets = [
+        max(MIN_RUNG_EPISODES, round(max_episodes / eta**power / 200) * 200) for power in range(rungs - 1, 0, -1)
+    ]
+    return sorted(set(budget for budget in budgets if budget < max_episodes)) + [max_episodes]
 
-    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        future_to_agent = {executor.submit(evaluate_individual_task, *task): i for i, task in enumerate(tasks)}
 
-        for future in as_completed(future_to_agent):
-            updated_individual, log_line = future.result()
-            original_index = future_to_agent[future]
-            population[original_index] = updated_individual
+def evaluate_population_multifidelity(population, generation_num, total_generations, pool, cache=None, history=None):
+    """
+    Variante de evaluate_population con successive halving. Cada tramo reanuda el entrenamiento del anterior
+    (la tabla queda en disco en el worker y solo viaja training_state). Tras cada tramo, quien convergió tiene
+    ya su fitness definitiva; del resto sigue el mejor 1/HALVING_ETA, y de esos solo los que no quedan bajo la
+    mediana del tramo: la de todos los evaluados en él en esta generación y en las anteriores (history, tramo ->
+    fitness, se completa aquí con los de esta generación). Los descartados
+    conservan la fitness de su último tramo. Solo los resultados de presupuesto completo entran en la caché.
+    Retorna los episodios entrenados en la generación.
+    """
+    cache = cache or FitnessCache()
+    history = history if history is not None else defaultdict(list)
+    budgets = rung_budgets()
+
+    # Un representante por genoma sin evaluar; los demás copian su resultado o el de la caché
+    keys = [genome_key(individual, NUM_EPISODES) for individual in population]
+    representatives = {}
+    for i, key in enumerate(keys):
+        if cache.missing(key) > 0 and key not in representatives:
+            representatives[key] = i
+
+    # Las tablas de los tramos viven en un directorio temporal que se borra aunque falle la evaluación
+    with tempfile.TemporaryDirectory(prefix="ga_rungs_") as work_dir:
+        alive = sorted(representatives.values())
+        records, states, episodes_trained = {}, {}, 0
+        for rung, budget in enumerate(budgets):
+            tasks = []
+            for i in alive:
+                task_data = {
+                    "agent": population[i],
+                    "episodes": budget,
+                    "resume_path": os.path.join(work_dir, f"agent_{i:03d}.pkl"),
+                    "training_state": states.get(i),
+                }
+                tasks.append((task_data, generation_num, total_generations, i, len(population)))
+
+            for task_index, (record, log_line) in pool.imap_unordered(evaluate_individual_task, tasks):
+                i = alive[task_index]
+                episodes_trained += record["training_state"]["episode"] - (states[i]["episode"] if i in states else 0)
+                records[i], states[i] = record, record["training_state"]
+                print(log_line)
+
+            converged = [i for i in alive if records[i]["converged"]]
+            running = [i for i in alive if i not in converged]
+            if rung == len(budgets) - 1:
+                break
+
+            # Mediana en el mismo tramo de toda la población evaluada en él: esta generación y las anteriores
+            history[rung].extend(records[i]["fitness"] for i in alive)
+            median = statistics.median(history[rung])
+            running.sort(key=lambda i: records[i]["fitness"], reverse=True)
+            promoted = running[: math.ceil(len(running) / HALVING_ETA)]
+            alive = [i for i in promoted if records[i]["fitness"] >= median]
+            print(f"  Tramo {budget} episodios: {len(converged)} convergieron, {len(alive)}/{len(running)} siguen")
+            if not alive:
+                break
+
+    # Presupuesto completo (último tramo o convergencia antes de agotarlo): resultado comparable, va a la caché
+    for key, i in representatives.items():
+        if records[i]["converged"] or states[i]["episode"] >= NUM_EPISODES:
+            cache.add(key, records[i])
+    for i, individual in enumerate(population):
+        key = keys[i]
+        individual.apply_result(cache.record(key) if cache.results.get(key) else records[representatives[key]])
 
-            print(log_line)
+    return episodes_trained
 
 
-def selection(population):
+def selection(population, tour_size=None):
     best = None
-    for _ in range(TOUR_SIZE):
+    for _ in range(tour_size or TOUR_SIZE):
         candidate = random.choice(population)
         if best is None or candidate.fitness > best.fitness:
             best = candidate
@@ -161,40 +376,145 @@ def run_genetic_algorithm():
 
     csv_filename = f"queries/genetic_experiment_{int(time.time())}.csv"
 
-    for generation in range(GENERATIONS):  # GENERATIONS es el total
-        print(f"\n--- GENERACIÓN {generation + 1}/{GENERATIONS} ---")
-
-        evaluate_population(population, generation + 1, GENERATIONS)
+    cache = FitnessCache(FITNESS_CACHE_FILE, FITNESS_REPLICATES, fitness_context())
+    rung_history = defaultdict(list)
+    # Un solo pool para todas las generaciones: los workers cargan el oráculo una vez
+    with WorkerPool(MAX_WORKERS) as pool:
+        for generation in range(GENERATIONS):  # GENERATIONS es el total
+            print(f"\n--- GENERACIÓN {generation + 1}/{GENERATIONS} ---")
 
-        save_results_to_csv(population, generation + 1, csv_filename)
+            if MULTI_FIDELITY:
+                evaluate_population_multifidelity(population, generation + 1, GENERATIONS, pool, cache, rung_history)
+            else:
+                evaluate_population(
+                    population, generation + 1, GENERATIONS, pool, NUM_ELITES if generation > 0 else 0, cache
+                )
 
-        population.sort(key=lambda x: x.fitness, reverse=True)
+            save_results_to_csv(population, generation + 1, csv_filename)
 
-        current_best = population[0]
-        if best_overall is None or current_best.fitness > best_overall.fitness:
-            best_overall = current_best
+            population.sort(key=lambda x: x.fitness, reverse=True)
 
-        new_population = []
+            current_best = population[0]
+            if best_overall is None or current_best.fitness > best_overall.fitness:
+                best_overall = current_best
 
-        new_population.extend(population[:NUM_ELITES])
+            new_population = []
 
-        current_mutation_rate = max(
-            MUTATION_END_RATE,
-            MUTATION_START_RATE - (MUTATION_START_RATE - MUTATION_END_RATE) * (generation / GENERATIONS),
-        )
+            new_population.extend(population[:NUM_ELITES])
 
-        while len(new_population) < POPULATION_SIZE:
-            parent1 = selection(
-                population,
+            current_mutation_rate = max(
+                MUTATION_END_RATE,
+                MUTATION_START_RATE - (MUTATION_START_RATE - MUTATION_END_RATE) * (generation / GENERATIONS),
             )
-            parent2 = selection(population)
-            child = crossover(parent1, parent2, current_mutation_rate)
-            new_population.append(child)
 
-        population = new_population
-        for i, agent in enumerate(population):
-            agent.id = i
+            while len(new_population) < POPULATION_SIZE:
+                parent1 = selection(
+                    population,
+                )
+                parent2 = selection(population)
+                child = crossover(parent1, parent2, current_mutation_rate)
+                new_population.append(child)
+
+            population = new_population
+            for i, agent in enumerate(population):
+                agent.id = i
+    print_best(best_overall)
 
+
+def run_steady_state_algorithm(total_evaluations=None, csv_filename=None):
+    """
+    GA de estado estacionario: sin barrera por generación. Cada evaluación que termina entra en la población
+    (reemplaza a la peor si no es peor que ella) y en su lugar se envía de inmediato un hijo criado por torneo,
+    así que ningún worker espera a la tarea más lenta de la generación. Cada POPULATION_SIZE evaluaciones se
+    escribe la población en el CSV como una generación equivalente. Por defecto total_evaluations equivale a
+    GENERATIONS generaciones.
+    """
+    total_evaluations = total_evaluations or GENERATIONS * POPULATION_SIZE
+    csv_filename = csv_filename or f"queries/genetic_experiment_{int(time.time())}.csv"
+    cache = FitnessCache(FITNESS_CACHE_FILE, FITNESS_REPLICATES, fitness_context())
+
+    pending = initialize_population()  # Población inicial aún sin enviar
+    population, best_overall = [], None
+    in_flight = {}  # future -> clave del genoma
+    waiting = defaultdict(list)  # clave -> individuos con ese genoma esperando su evaluación
+    remaining = {}  # clave -> réplicas en vuelo
+    counters = {"launched": 0, "evaluated": 0}
+
+    def breed():
+        if pending:
+            return pending.pop(0)
+        progress = counters["evaluated"] / total_evaluations
+        mutation_rate = max(
+            MUTATION_END_RATE, MUTATION_START_RATE - (MUTATION_START_RATE - MUTATION_END_RATE) * progress
+        )
+        return crossover(selection(population), selection(population), mutation_rate)
+
+    def finish(individual):
+        nonlocal best_overall
+        individual.id = counters["evaluated"]
+        counters["evaluated"] += 1
+        if len(population) < POPULATION_SIZE:
+            population.append(individual)
+        else:
+            worst = min(range(len(population)), key=lambda i: population[i].fitness)
+            if individual.fitness >= population[worst].fitness:
+                population[worst] = individual
+        if best_overall is None or individual.fitness > best_overall.fitness:
+            best_overall = individual
+
+        if counters["evaluated"] % POPULATION_SIZE == 0:
+            generation = counters["evaluated"] // POPULATION_SIZE
+            save_results_to_csv(population, generation, csv_filename)
+            print(f"\n--- GENERACIÓN EQUIVALENTE {generation} (mejor: {max(p.fitness for p in population):.3f}) ---")
+
+    # Si algo falla, el pool cancela las tareas encoladas al salir del bloque en lugar de abandonarlas
+    with WorkerPool(MAX_WORKERS) as pool:
+        # Tareas en vuelo: una de reserva por worker para que la cola nunca quede vacía
+        max_in_flight = 2 * pool.max_workers
+        while counters["evaluated"] < total_evaluations:
+            # Se cría solo si hay población evaluada (o individuos iniciales) de la que partir
+            while (
+                counters["launched"] < total_evaluations and len(in_flight) < max_in_flight and (pending or population)
+            ):
+                individual = breed()
+                counters["launched"] += 1
+                key = genome_key(individual, NUM_EPISODES)
+                if key in remaining:  # El mismo genoma ya se está entrenando
+                    waiting[key].append(individual)
+                    continue
+                if cache.missing(key) == 0:
+                    individual.apply_result(cache.record(key))
+                    finish(individual)
+                    continue
+
+                waiting[key].append(individual)
+                remaining[key] = cache.missing(key)
+                generation = counters["evaluated"] // POPULATION_SIZE + 1
+                for _ in range(remaining[key]):
+                    task_data = {"agent": individual, "episodes": NUM_EPISODES}
+                    args = (task_data, generation, total_evaluations // POPULATION_SIZE, individual.id, POPULATION_SIZE)
+                    in_flight[pool.submit(evaluate_individual_task, *args)] = key
+
+            if not in_flight:
+                continue
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = in_flight.pop(future)
+                record, log_line = future.result()
+                print(log_line)
+                cache.add(key, record)
+                remaining[key] -= 1
+                if remaining[key] == 0:
+                    del remaining[key]
+                    for individual in waiting.pop(key):
+                        individual.apply_result(cache.record(key))
+                        finish(individual)
+
+    print_best(best_overall)
+    return best_overall
+
+
+def print_best(best_overall):
     print("\n--- RESULTADO FINAL ---")
     print(f"Mejor Agente Global: Fitness={best_overall.fitness:.3f}")
 
@@ -208,7 +528,10 @@ def run_genetic_algorithm():
 
 if __name__ == "__main__":
     inicio = time.time()
-    run_genetic_algorithm()
+    if STEADY_STATE:
+        run_steady_state_algorithm()
+    else:
+        run_genetic_algorithm()
     fin = time.time()
     print(fin - inicio)
 
@@ -1,11 +1,50 @@
-import os
-import pickle
 import random
 
-import pygame
-
+from src.ai.oracle import OpponentOracle
+from src.ai.policy_evaluation import PolicyEvaluator, best_response
 from src.benchmarks.utils import evaluate_vs_minimax
-from src.game_logic.board import Board
+from src.game_logic.engine import create_simulation_board
+from src.training.replay_buffer import REPLAY_BATCH_SIZE
+
+# Margen de redondeo al promediar probabilidades en best_response
+EXPLOITABILITY_TOLERANCE = 1e-9
+# Criterios de parada de los checkpoints y partidas contra minimax del criterio por muestreo
+STOP_CRITERIA = ("sampled", "exact", "exploitability")
+STOP_GAMES = 100
+
+
+def stop_check(agent, stop_criterion="sampled", oracle=None):
+    """
+    Criterio de parada de los checkpoints como función sin argumentos (True = la política greedy es óptima).
+    "sampled": STOP_GAMES partidas contra minimax sin derrotas (el criterio original, también en que deja
+    epsilon en 0; puede no ver derrotas poco probables de los desempates). "exact": probabilidad exacta de
+    derrota 0 (PolicyEvaluator), más estricto: entrena más episodios antes de parar. "exploitability": además
+    ningún rival puede forzarle una derrota (best_response); si ningún argmax cambió desde el último
+    checkpoint no se vuelve a evaluar.
+    """
+    if stop_criterion not in STOP_CRITERIA:
+        raise ValueError(f"Criterio de parada desconocido: {stop_criterion!r}. Opciones: {list(STOP_CRITERIA)}")
+    oracle = oracle or OpponentOracle.shared()
+
+    if stop_criterion == "sampled":
+        # Como el criterio original, deja al agente con el epsilon 0 de evaluate_vs_minimax: desde el primer
+        # checkpoint train_with_decay sigue con el epsilon mínimo (los episodios hasta converger no cambian)
+        return lambda: evaluate_vs_minimax(agent, num_games=STOP_GAMES, oracle=oracle)[1] == 0
+
+    if stop_criterion == "exact":
+        evaluator = PolicyEvaluator(agent, oracle=oracle)
+        return lambda: evaluator.evaluate()[1] == 0
+
+    fingerprint = None
+
+    def check():
+        nonlocal fingerprint
+        fingerprint, changed = agent.policy_changes(fingerprint)
+        if changed is not None and not changed:
+            return False
+        return best_response(agent, oracle=oracle)["exploitability"] <= EXPLOITABILITY_TOLERANCE
+
+    return check
 
 
 def train_with_decay(
@@ -17,15 +56,54 @@ def train_with_decay(
     reward_draw_gen=0.5,
     start_epsilon=1.0,
     progress_callback=None,
+    oracle=None,
+    stop_criterion="sampled",
+    resume=False,
+    replay=None,
+    replay_steps=1,
+    replay_batch_size=REPLAY_BATCH_SIZE,
+    planner=None,
 ):
-    if not os.path.exists(pickle_path):
-        lookup_table = None
+    """
+    stop_criterion: cómo deciden los checkpoints que la política ya es óptima (ver stop_check): "sampled"
+    (partidas contra minimax, por defecto), "exact" o "exploitability".
+    resume: continúa desde agent.training_state (episodio y epsilon donde quedó el entrenamiento anterior)
+    hasta `episodes` en total, así un presupuesto se amplía por tramos. Con epsilon_decay_gen el resultado
+    equivale a entrenar de una vez; sin él la pendiente depende de `episodes`.
+    replay: ReplayBuffer donde se guarda cada transición aprendida; al final de cada episodio se hacen
+    replay_steps pasos de replay de replay_batch_size transiciones (agente array no canónico).
+    planner: PrioritizedSweeping del agente (con reward_draw = reward_draw_gen); tras cada actualización real
+    hace sus backups simulados.
+    """
+    if oracle is None:
+        oracle = OpponentOracle.shared(pickle_path)
+    is_optimal = stop_check(agent, stop_criterion, oracle)
+    if replay is not None and (agent.backend != "array" or agent.symmetry is not None):
+        raise ValueError("El replay necesita un agente con backend 'array' y sin estados canónicos")
+    if planner is not None and planner.agent is not agent:
+        raise ValueError("El planificador pertenece a otro agente")
+    if planner is not None and planner.reward_draw != reward_draw_gen:
+        raise ValueError(
+            f"El modelo del planificador usa reward_draw={planner.reward_draw} y el entrenamiento "
+            f"reward_draw_gen={reward_draw_gen}: deben coincidir"
+        )
+
+    def learn_and_observe(state, action, reward, next_state, next_available_moves, done):
+        agent.learn(state, action, reward, next_state, next_available_moves, done)
+        if replay is not None:
+            replay.push(state, action, reward, next_state, done)
+        if planner is not None:
+            planner.observe(state, action)
+
+    learn = agent.learn if replay is None and planner is None else learn_and_observe
+
+    board = create_simulation_board()
+    first_episode = 0
+    if resume and agent.training_state is not None:
+        first_episode = agent.training_state["episode"]
+        agent.epsilon = agent.training_state["epsilon"]
     else:
-        with open(pickle_path, "rb") as f:
-            lookup_table = pickle.load(f)
-
-    board = Board()
-    agent.epsilon = start_epsilon
+        agent.epsilon = start_epsilon
     episodes_to_optimal = episodes
 
     if epsilon_decay_gen is None:
@@ -33,7 +111,8 @@ def train_with_decay(
     else:
         decay_factor = epsilon_decay_gen
 
-    for episode in range(episodes):
+    next_episode = max(first_episode, episodes)
+    for episode in range(first_episode, episodes):
         if progress_callback:
             progress_callback(episode, episodes)
 
@@ -52,15 +131,13 @@ def train_with_decay(
 
         while not board.game_over:
             current_player = board.turn
-            state_key = agent.get_state_key(board.board)
+            state_key = agent.get_board_state_key(board)
 
             # DETERMINAR QUIÉN MUEVE
             is_master_turn = (current_player == 2 and mode == 1) or (current_player == 1 and mode == 2)
 
             if is_master_turn:
-                state_hash = tuple(item for row in board.board for item in row)
-                move_data = lookup_table.get(state_hash) if lookup_table else None
-                action = move_data["move"] if isinstance(move_data, dict) else move_data
+                action = oracle.get_move(board)
                 if action is None:
                     action = random.choice(board.get_available_moves())
             else:
@@ -81,8 +158,8 @@ def train_with_decay(
                 prev_state, prev_action = history[other_player]
                 if not board.game_over:
                     # El agente aprende del estado intermedio
-                    current_board_state = agent.get_state_key(board.board)
-                    agent.learn(prev_state, prev_action, 0, current_board_state, board.get_available_moves(), False)
+                    current_board_state = agent.get_board_state_key(board)
+                    learn(prev_state, prev_action, 0, current_board_state, board.get_available_moves(), False)
                 else:
                     # El juego terminó con el último movimiento
                     # Recompensas finales
@@ -93,7 +170,7 @@ def train_with_decay(
                     else:
                         reward = -1
 
-                    agent.learn(prev_state, prev_action, reward, None, [], True)
+                    learn(prev_state, prev_action, reward, None, [], True)
 
         if board.game_over:
             last_player = 1 if board.turn == 2 else 2  # El que acaba de mover
@@ -102,19 +179,20 @@ def train_with_decay(
             if not is_last_player_master and history[last_player]:
                 s, a = history[last_player]
                 if board.winner == last_player:
-                    agent.learn(s, a, 1, None, [], True)
+                    learn(s, a, 1, None, [], True)
                 elif board.winner == 0 or board.winner is None:
-                    agent.learn(s, a, reward_draw_gen, None, [], True)
+                    learn(s, a, reward_draw_gen, None, [], True)
                 else:
-                    agent.learn(s, a, -1, None, [], True)
+                    learn(s, a, -1, None, [], True)
 
-        if episode % 200 == 0 and episode > 1000:
-            pygame.event.pump()
-            n_test = 100
-            wins, losses, draws = evaluate_vs_minimax(agent, num_games=n_test)
+        if replay is not None:
+            for _ in range(replay_steps):
+                replay.replay(agent, replay_batch_size)
 
-            if losses == 0:
-                episodes_to_optimal = episode
-                break
+        if episode % 200 == 0 and episode > 1000 and is_optimal():
+            episodes_to_optimal = episode
+            next_episode = episode + 1
+            break
+    agent.training_state = {"episode": next_episode, "epsilon": agent.epsilon}
     agent.epsilon = 0.01
     return agent, episodes_to_optimal
@@ -0,0 +1,260 @@
+import csv
+import multiprocessing
+import os
+import queue
+import random
+import time
+import traceback
+
+from src.ai.oracle import DEFAULT_LOOKUP_PATH
+from src.ai.ql_agent import GeneticQLAgent
+from src.training.fitness_cache import FitnessCache, genome_key
+from src.training.genetic_trainer import (
+    MUTATION_END_RATE,
+    MUTATION_START_RATE,
+    NUM_EPISODES,
+    crossover,
+    evaluate_individual_task,
+    print_best,
+    selection,
+)
+from src.training.worker_pool import _init_worker, default_workers
+
+NUM_ISLANDS = None  # None: un proceso por CPU disponible (worker_pool.default_workers)
+ISLAND_SIZE = 10
+GENERATIONS = 30
+ISLAND_ELITES = 1
+ISLAND_TOUR_SIZE = 3  # Torneo más pequeño que en el GA central: con 10 individuos, 15 elegiría casi siempre al mejor
+# Cada MIGRATION_INTERVAL generaciones cada isla envía sus MIGRANTS mejores genomas a sus vecinas
+MIGRATION_INTERVAL = 5
+MIGRANTS = 2
+TOPOLOGY = "ring"  # "ring", "fully_connected" o "random"
+
+# Segundos entre comprobaciones de que las islas siguen vivas mientras se esperan sus resúmenes
+STATS_POLL_SECONDS = 5
+
+CSV_FILE_GENERATION_DATA = "generations_data.csv"
+CSV_FIELDNAMES = ["Generation", "Max_Fitness", "Avg_Fitness", "Optimal_HPs"]
+
+
+def migration_targets(island, num_islands, topology=TOPOLOGY):
+    """Islas que reciben los migrantes de `island` en una migración."""
+    if topology not in ("ring", "fully_connected", "random"):
+        raise ValueError(f"Topología desconocida: {topology!r}. Opciones: 'ring', 'fully_connected', 'random'")
+    others = [other for other in range(num_islands) if other != island]
+    if not others:
+        return []
+    if topology == "ring":
+        return [(island + 1) % num_islands]
+    if topology == "fully_connected":
+        return others
+    return [random.choice(others)]
+
+
+def evaluate_island(population, generation_num, total_generations, cache, episodes):
+    """Evalúa la subpoblación en el propio proceso de la isla (un entrenamiento por genoma que falte en la caché)."""
+    for i, individual in enumerate(population):
+        key = genome_key(individual, episodes)
+        for _ in range(cache.missing(key)):
+            task_data = {"agent": individual, "episodes": episodes}
+            record, _ = evaluate_individual_task(task_data, generation_num, total_generations, i, len(population))
+            cache.add(key, record)
+        individual.apply_result(cache.record(key))
+
+
+def run_island(island, num_islands, inboxes, stats, seed, config):
+    """
+    Proceso de una isla: evoluciona su subpoblación con selection/crossover del GA central y solo se comunica
+    por colas. Cada generación envía a `stats` el resumen que necesita generations_data.csv (o, si falla, la
+    traza de la excepción); cada
+    migration_interval generaciones manda sus mejores genomas (con sus evaluaciones, para que la vecina no
+    los reentrene) y, sin esperar a nadie, incorpora los que le hayan llegado en lugar de sus peores.
+    """
+    try:
+        _init_worker(config["lookup_path"])
+        random.seed(seed)
+        generations, episodes, island_size = config["generations"], config["episodes"], config["island_size"]
+        cache = FitnessCache()
+        population = [GeneticQLAgent(i) for i in range(island_size)]
+
+        for generation in range(generations):
+            evaluate_island(population, generation + 1, generations, cache, episodes)
+            population.sort(key=lambda x: x.fitness, reverse=True)
+            best = population[0]
+            stats.put(
+                (
+                    generation + 1,
+                    island,
+                    [individual.fitness for individual in population],
+                    (best.alpha, best.gamma, best.epsilon_decay_rate, best.reward_draw),
+                )
+            )
+            if generation == generations - 1:
+                break
+
+            if (generation + 1) % config["migration_interval"] == 0:
+                emigrants = []
+                for individual in population[: config["migrants"]]:
+                    key = genome_key(individual, episodes)
+                    emigrants.append(
+                        ((individual.alpha, individual.gamma, individual.epsilon_decay_rate), cache.results[key])
+                    )
+                for target in migration_targets(island, num_islands, config["topology"]):
+                    inboxes[target].put(emigrants)
+
+            immigrants = []
+            while True:
+                try:
+                    immigrants.extend(inboxes[island].get_nowait())
+                except queue.Empty:
+                    break
+            # Los inmigrantes reemplazan a los peores (nunca a las élites) y ya participan en esta selección
+            immigrants = immigrants[: island_size - ISLAND_ELITES]
+            for slot, (gen, results) in zip(range(island_size - len(immigrants), island_size), immigrants):
+                individual = GeneticQLAgent(slot, gen=gen)
+                key = genome_key(individual, episodes)
+                for fitness, episodes_to_optimal in results[: cache.missing(key)]:
+                    cache.add(key, {"fitness": fitness, "episodes_to_optimal": episodes_to_optimal})
+                individual.apply_result(cache.record(key))
+                population[slot] = individual
+            population.sort(key=lambda x: x.fitness, reverse=True)
+
+            mutation_rate = max(
+                MUTATION_END_RATE,
+                MUTATION_START_RATE - (MUTATION_START_RATE - MUTATION_END_RATE) * (generation / generations),
+            )
+            new_population = population[:ISLAND_ELITES]
+            while len(new_population) < island_size:
+                parent1 = selection(population, ISLAND_TOUR_SIZE)
+                parent2 = selection(population, ISLAND_TOUR_SIZE)
+                new_population.append(crossover(parent1, parent2, mutation_rate))
+            population = new_population
+            for i, agent in enumerate(population):
+                agent.id = i
+    except Exception:
+        # El proceso principal no puede ver la excepción: la recibe por `stats` y detiene el modelo
+        stats.put(("error", island, traceback.format_exc()))
+
+    # Los migrantes que nadie llegó a leer no deben bloquear la salida del proceso
+    for inbox in inboxes:
+        inbox.cancel_join_thread()
+
+
+def append_generation_data(data, filename=CSV_FILE_GENERATION_DATA, truncate=False):
+    """
+    Añade una fila al CSV de generaciones (mismo esquema que benchmarks/01_tournament_data.py). Con truncate
+    el archivo se reescribe desde cero con la fila.
+    """
+    file_exists = not truncate and os.path.isfile(filename)
+    with open(filename, mode="w" if truncate else "a", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=CSV_FIELDNAMES)
+        if not file_exists:
+            writer.writeheader()
+        writer.writerow(data)
+
+
+def next_report(islands, stats):
+    """Siguiente resumen de `stats`; lanza RuntimeError si una isla informó una excepción o murió sin informar."""
+    while True:
+        try:
+            report = stats.get(timeout=STATS_POLL_SECONDS)
+        except queue.Empty:
+            for island, process in enumerate(islands):
+                if not process.is_alive() and process.exitcode != 0:
+                    raise RuntimeError(f"La isla {island} terminó con código {process.exitcode}") from None
+            continue
+        if report[0] == "error":
+            _, island, trace = report
+            raise RuntimeError(f"La isla {island} falló:\n{trace}")
+        return report
+
+
+def collect_generations(islands, stats, generations, csv_filename):
+    """Escribe una fila agregada por generación a medida que todas las islas la completan. Retorna el mejor."""
+    num_islands = len(islands)
+    pending, best_overall = {}, None
+    for _ in range(generations * num_islands):
+        generation, island, fitnesses, hps = next_report(islands, stats)
+        pending.setdefault(generation, {})[island] = (fitnesses, hps)
+        # Las islas informan sus generaciones en orden, así que se completan en orden
+        if len(pending[generation]) < num_islands:
+            continue
+
+        reports = pending.pop(generation)
+        all_fitnesses = [fitness for fitnesses, _ in reports.values() for fitness in fitnesses]
+        max_fitness, (alpha, gamma, decay, reward_draw) = max((f[0], hps) for f, hps in reports.values())
+        append_generation_data(
+            {
+                "Generation": generation,
+                "Max_Fitness": max_fitness,
+                "Avg_Fitness": sum(all_fitnesses) / len(all_fitnesses),
+                "Optimal_HPs": f"α={alpha}, γ={gamma}, R_draw={reward_draw}",
+            },
+            csv_filename,
+            truncate=generation == 1,
+        )
+        print(f"--- GENERACIÓN {generation}/{generations}: máximo {max_fitness:.3f} en {num_islands} islas ---")
+
+        if best_overall is None or max_fitness > best_overall.fitness:
+            best_overall = GeneticQLAgent(0, gen=(alpha, gamma, decay))
+            best_overall.reward_draw = reward_draw
+            best_overall.fitness = max_fitness
+    return best_overall
+
+
+def run_island_model(
+    num_islands=NUM_ISLANDS,
+    generations=GENERATIONS,
+    island_size=ISLAND_SIZE,
+    episodes=NUM_EPISODES,
+    topology=TOPOLOGY,
+    migration_interval=MIGRATION_INTERVAL,
+    migrants=MIGRANTS,
+    csv_filename=CSV_FILE_GENERATION_DATA,
+    lookup_path=DEFAULT_LOOKUP_PATH,
+):
+    """
+    GA de islas: un proceso por isla, sin coordinador en el bucle evolutivo. El proceso principal solo recoge
+    los resúmenes por generación y, cuando todas las islas completaron una, escribe en csv_filename la fila
+    agregada (máximo y media sobre la población total, hiperparámetros del mejor). Un csv_filename existente
+    solo se reemplaza al escribir la primera fila. Si una isla falla o muere, se detienen todas y se lanza
+    RuntimeError.
+    """
+    num_islands = num_islands or default_workers()
+    migration_targets(0, num_islands, topology)  # Valida la topología antes de lanzar procesos
+    config = {
+        "generations": generations,
+        "island_size": island_size,
+        "episodes": episodes,
+        "topology": topology,
+        "migration_interval": migration_interval,
+        "migrants": migrants,
+        "lookup_path": lookup_path,
+    }
+
+    inboxes = [multiprocessing.Queue() for _ in range(num_islands)]
+    stats = multiprocessing.Queue()
+    islands = [
+        multiprocessing.Process(
+            target=run_island, args=(island, num_islands, inboxes, stats, random.randrange(2**32), config)
+        )
+        for island in range(num_islands)
+    ]
+    for process in islands:
+        process.start()
+
+    try:
+        best_overall = collect_generations(islands, stats, generations, csv_filename)
+    finally:
+        for process in islands:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+    print_best(best_overall)
+    return best_overall
+
+
+if __name__ == "__main__":
+    inicio = time.time()
+    run_island_model()
+    print(time.time() - inicio)
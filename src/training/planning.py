@@ -0,0 +1,120 @@
+import heapq
+
+import numpy as np
+
+from src.ai.oracle import OpponentOracle
+from src.ai.q_table import ACTIONS, action_index
+from src.game_logic.transitions import get_transition_table
+from src.training.vector_env import oracle_actions
+
+# Backups simulados por cada actualización real (presupuesto de planificación)
+PLANNING_STEPS = 5
+# Error TD mínimo para encolar un par (estado, acción)
+PRIORITY_THRESHOLD = 1e-4
+
+
+class PrioritizedSweeping:
+    """
+    Planificación con el modelo conocido del juego (prioritized sweeping). El modelo de (estado, acción) del
+    agente es la jugada en TransitionTable seguida de la respuesta del maestro (la tabla de juego perfecto,
+    el mismo rival del criterio de parada): recompensa 1 / reward_draw / -1 y estado siguiente del agente.
+    La cola empieza con los pares que terminan la partida y tras cada actualización real se encolan por
+    |error TD| el par actualizado y los pares que llevan a su estado. Cada backup es un QLearningAgent.learn
+    del par con mayor prioridad y reencola sus predecesores. Solo para agentes array sin estados canónicos;
+    train_with_decay exige que reward_draw sea su reward_draw_gen.
+    """
+
+    def __init__(
+        self, agent, reward_draw=0.5, planning_steps=PLANNING_STEPS, threshold=PRIORITY_THRESHOLD, oracle=None
+    ):
+        if agent.backend != "array" or agent.symmetry is not None:
+            raise ValueError("La planificación necesita un agente con backend 'array' y sin estados canónicos")
+        self.agent = agent
+        self.reward_draw = reward_draw
+        self.planning_steps = planning_steps
+        self.threshold = threshold
+        transitions = get_transition_table()
+        next_state, terminal, winner = transitions.next_state, transitions.terminal, transitions.winner
+        num_states, num_cells = next_state.shape
+
+        # Jugada del agente y, si la partida sigue, respuesta del maestro
+        after_move = np.where(transitions.legal_mask, next_state, 0)
+        replies = oracle_actions(oracle or OpponentOracle.shared())[after_move]
+        after_reply = np.where(replies >= 0, next_state[after_move, np.maximum(replies, 0)], -1)
+        mover = transitions.turn[:, None]
+        ends_on_move = terminal[after_move]
+        ends_on_reply = ~ends_on_move & (after_reply >= 0) & terminal[np.maximum(after_reply, 0)]
+        final = np.where(ends_on_move, winner[after_move], winner[np.maximum(after_reply, 0)])
+
+        self.valid = transitions.legal_mask & (ends_on_move | (after_reply >= 0))
+        self.done = self.valid & (ends_on_move | ends_on_reply)
+        self.reward = np.where(
+            self.done, np.where(final == mover, 1.0, np.where(final == 0, reward_draw, -1.0)), 0.0
+        ).astype(np.float32)
+        self.next_state = np.where(self.valid & ~self.done, after_reply, -1)
+
+        # Predecesores de cada estado: pares (estado * casillas + acción) cuyo modelo lleva a él, en formato CSR
+        pairs = np.flatnonzero(self.next_state.ravel() >= 0)
+        targets = self.next_state.ravel()[pairs]
+        order = np.argsort(targets, kind="stable")
+        self._predecessors = pairs[order]
+        self._offsets = np.searchsorted(targets[order], np.arange(num_states + 1))
+        self.num_cells = num_cells
+
+        self._queue = []  # (-prioridad, contador, estado, acción)
+        self._priority = {}  # Prioridad vigente de cada par encolado (las entradas viejas del heap se ignoran)
+        self._counter = 0
+        self.backups = 0
+        # Con el modelo completo no hace falta esperar a ver los finales: los pares terminales se encolan ya
+        states, actions = np.nonzero(self.done)
+        priorities = np.abs(self.reward[states, actions] - agent.q_table.values[states, actions])
+        for state_id, action, priority in zip(states.tolist(), actions.tolist(), priorities.tolist()):
+            self._push(state_id, action, priority)
+
+    def _push(self, state_id, action, priority):
+        if priority > self.threshold and priority > self._priority.get((state_id, action), 0.0):
+            self._priority[(state_id, action)] = priority
+            self._counter += 1
+            heapq.heappush(self._queue, (-priority, self._counter, state_id, action))
+
+    def _td_error(self, state_id, action):
+        q_table = self.agent.q_table
+        target = self.reward[state_id, action]
+        if not self.done[state_id, action]:
+            target += self.agent.gamma * q_table.max_q(self.next_state[state_id, action])
+        return abs(target - q_table.values[state_id, action])
+
+    def _push_predecessors(self, state_id):
+        """Encola los pares que llevan a state_id: todos comparten el max Q del estado, se calcula una vez."""
+        pairs = self._predecessors[self._offsets[state_id] : self._offsets[state_id + 1]]
+        if len(pairs) == 0:
+            return
+        states, actions = np.divmod(pairs, self.num_cells)
+        targets = self.reward[states, actions] + self.agent.gamma * self.agent.q_table.max_q(state_id)
+        priorities = np.abs(targets - self.agent.q_table.values[states, actions])
+        for i in np.flatnonzero(priorities > self.threshold):
+            self._push(int(states[i]), int(actions[i]), float(priorities[i]))
+
+    def observe(self, state_id, action):
+        """Tras la actualización real de (estado, (fila, col)): encola lo afectado y hace planning_steps backups."""
+        action = action_index(action)
+        if self.valid[state_id, action]:
+            self._push(state_id, action, self._td_error(state_id, action))
+        self._push_predecessors(state_id)
+        self.plan(self.planning_steps)
+
+    def plan(self, steps):
+        """Hasta `steps` backups con agent.learn sobre el modelo, en orden de prioridad."""
+        for _ in range(steps):
+            while self._queue:
+                priority, _, state_id, action = heapq.heappop(self._queue)
+                if self._priority.get((state_id, action)) == -priority:
+                    del self._priority[(state_id, action)]
+                    break
+            else:
+                return
+            done = bool(self.done[state_id, action])
+            next_state = None if done else int(self.next_state[state_id, action])
+            self.agent.learn(state_id, ACTIONS[action], float(self.reward[state_id, action]), next_state, (), done)
+            self.backups += 1
+            self._push_predecessors(state_id)
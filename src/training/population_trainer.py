@@ -0,0 +1,64 @@
+import numpy as np
+
+from src.ai.oracle import OpponentOracle
+from src.ai.q_table import ArrayQTable
+from src.ai.ql_agent import QLearningAgent
+from src.game_logic.transitions import get_transition_table
+from src.training.gym import stop_check
+from src.training.vector_env import CHECKPOINT_INTERVAL, FIRST_CHECKPOINT, MIN_EPSILON, VectorEnv
+
+
+def train_population(
+    genomes,
+    episodes=20000,
+    minimax_ratio=0.3,
+    start_epsilon=1.0,
+    oracle=None,
+    rng=None,
+    stop_criterion="sampled",
+):
+    """
+    Entrena una población de agentes a la vez: las tablas Q forman un solo arreglo [individuos, estados, 9]
+    y cada episodio es una partida por individuo en un VectorEnv (sin Board ni llamadas a learn).
+    genomes: lista de (alpha, gamma, epsilon_decay, reward_draw). Cada individuo reproduce train_with_decay
+    con sus parámetros (mezcla de modos con el maestro, recompensas, decaimiento de epsilon, checkpoints con
+    stop_criterion, ver gym.stop_check) y deja de entrenar cuando deja de perder.
+    Retorna: (agentes QLearningAgent con su tabla entrenada, episodes_to_optimal por individuo).
+    """
+    oracle = oracle or OpponentOracle.shared()
+    num_states, num_cells = get_transition_table().legal_mask.shape
+
+    population = len(genomes)
+    alpha, gamma, decay, reward_draw = (np.array(values, dtype=np.float32) for values in zip(*genomes))
+    q_values = np.zeros((population, num_states, num_cells), dtype=np.float32)
+    visited = np.zeros(q_values.shape, dtype=bool)
+    epsilon = np.full(population, start_epsilon, dtype=np.float64)
+    env = VectorEnv(q_values, alpha, gamma, reward_draw, minimax_ratio, oracle, rng, visited)
+
+    # Cada agente ve su fila del arreglo común (sin copia) para evaluar la política en los checkpoints
+    agents = []
+    for i, (a, g, _, _) in enumerate(genomes):
+        agent = QLearningAgent(alpha=a, gamma=g, epsilon=MIN_EPSILON, backend="array", canonical=False)
+        agent.q_table = ArrayQTable(q_values[i], visited=visited[i])
+        agents.append(agent)
+    stop_checks = [stop_check(agent, stop_criterion, oracle) for agent in agents]
+    episodes_to_optimal = np.full(population, episodes, dtype=np.int64)
+    training = np.ones(population, dtype=bool)
+
+    for episode in range(episodes):
+        players = np.flatnonzero(training)
+        if len(players) == 0:
+            break
+        epsilon[players] = np.maximum(MIN_EPSILON, epsilon[players] - decay[players])
+
+        env.play(players, epsilon[players])
+
+        if episode % CHECKPOINT_INTERVAL == 0 and episode > FIRST_CHECKPOINT:
+            for i in players:
+                if stop_checks[i]():
+                    episodes_to_optimal[i] = episode
+                    training[i] = False
+
+    for i, agent in enumerate(agents):
+        agent.training_state = {"episode": int(min(episodes, episodes_to_optimal[i] + 1)), "epsilon": float(epsilon[i])}
+    return agents, episodes_to_optimal.tolist()
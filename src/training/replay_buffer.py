@@ -0,0 +1,131 @@
+import numpy as np
+
+from src.ai.q_table import action_index
+from src.game_logic.state_index import get_state_index
+
+# Transiciones guardadas antes de sobrescribir las más viejas (unos 10 bytes cada una)
+REPLAY_CAPACITY = 100_000
+# Transiciones repasadas por cada paso de replay
+REPLAY_BATCH_SIZE = 32
+# Muestreo priorizado: P(i) ∝ (|error TD| + PRIORITY_EPSILON) ^ PRIORITY_EXPONENT, con pesos de importancia
+# (N * P(i)) ^ -IMPORTANCE_EXPONENT para corregir el sesgo hacia las transiciones raras
+PRIORITY_EXPONENT = 0.6
+IMPORTANCE_EXPONENT = 0.4
+PRIORITY_EPSILON = 1e-3
+
+
+class ReplayBuffer:
+    """
+    Memoria circular de transiciones (estado, acción, recompensa, estado siguiente, terminal) en arreglos
+    preasignados: ids densos en uint16 (uint32 si el índice no cabe), acción int8, recompensa float32 y
+    terminal bool. Con prioritized las muestras se eligen por prioridad con un árbol de sumas, si no al azar.
+    Solo para agentes con backend array y sin estados canónicos (los ids son los de StateIndex).
+    """
+
+    def __init__(self, capacity=REPLAY_CAPACITY, prioritized=False, rng=None, num_states=None):
+        num_states = num_states or get_state_index().num_states
+        id_dtype = np.uint16 if num_states <= np.iinfo(np.uint16).max else np.uint32
+        self.capacity = capacity
+        self.prioritized = prioritized
+        self.rng = rng or np.random.default_rng()
+        self.states = np.zeros(capacity, dtype=id_dtype)
+        self.actions = np.zeros(capacity, dtype=np.int8)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros(capacity, dtype=id_dtype)
+        self.done = np.zeros(capacity, dtype=bool)
+        self.size = 0
+        self._cursor = 0
+
+        if prioritized:
+            # Árbol de sumas en un arreglo: la raíz es tree[1] y las hojas tree[leaves:leaves + capacity]
+            self._depth = max(0, capacity - 1).bit_length()
+            self._leaves = 1 << self._depth
+            self.tree = np.zeros(2 * self._leaves)
+            self._max_priority = 1.0
+            self._pending = []  # Posiciones escritas por push aún sin prioridad en el árbol
+            self._updates = ([], [])  # (posiciones, prioridades) de update_priorities aún sin aplicar
+
+    def __len__(self):
+        return self.size
+
+    def push(self, state_id, action, reward, next_state_id, done):
+        """Guarda una transición de learn (acción como (fila, col); next_state_id se ignora si done)."""
+        i = self._cursor
+        self.states[i] = state_id
+        self.actions[i] = action_index(action)
+        self.rewards[i] = reward
+        self.next_states[i] = 0 if done else next_state_id
+        self.done[i] = done
+        if self.prioritized:
+            self._pending.append(i)
+        self._cursor = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def _set_priorities(self, indices, priorities):
+        # Índices repetidos recalculan el mismo nodo con el mismo valor: no hace falta deduplicarlos
+        nodes = indices + self._leaves
+        self.tree[nodes] = priorities
+        for _ in range(self._depth):
+            nodes //= 2
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def _flush(self):
+        """
+        Lleva al árbol, en un solo recorrido, las prioridades actualizadas desde el último muestreo y las de las
+        transiciones nuevas, que entran con la máxima vista (así se repasan al menos una vez).
+        """
+        indices, priorities = self._updates
+        if self._pending:
+            # Las nuevas van después: si una posición se sobrescribió tras muestrearse, gana la transición nueva
+            indices = indices + [np.array(self._pending, dtype=np.int64)]
+            priorities = priorities + [np.full(len(self._pending), self._max_priority)]
+        if indices:
+            self._set_priorities(np.concatenate(indices), np.concatenate(priorities))
+        self._pending = []
+        self._updates = ([], [])
+
+    def sample(self, batch_size=REPLAY_BATCH_SIZE):
+        """
+        Lote de transiciones: (posiciones, estados, acciones, recompensas, estados siguientes, terminales, pesos).
+        Los pesos son de importancia en el muestreo priorizado (máximo 1) y unos en el uniforme.
+        """
+        if self.prioritized:
+            self._flush()
+            # Descenso por el árbol: cada valor en [0, total) cae en la hoja que acumula ese tramo
+            values = self.rng.random(batch_size) * self.tree[1]
+            nodes = np.ones(batch_size, dtype=np.int64)
+            for _ in range(self._depth):
+                left = 2 * nodes
+                go_right = values >= self.tree[left]
+                values -= np.where(go_right, self.tree[left], 0.0)
+                nodes = left + go_right
+            indices = np.minimum(nodes - self._leaves, self.size - 1)
+            probabilities = self.tree[indices + self._leaves] / self.tree[1]
+            weights = (self.size * probabilities) ** -IMPORTANCE_EXPONENT
+            weights /= weights.max()
+        else:
+            indices = self.rng.integers(0, self.size, batch_size)
+            weights = None
+
+        states = self.states[indices].astype(np.int64)
+        actions = self.actions[indices].astype(np.int64)
+        next_states = self.next_states[indices].astype(np.int64)
+        return indices, states, actions, self.rewards[indices], next_states, self.done[indices], weights
+
+    def update_priorities(self, indices, td_errors):
+        priorities = (np.abs(td_errors) + PRIORITY_EPSILON) ** PRIORITY_EXPONENT
+        self._max_priority = max(self._max_priority, float(priorities.max()))
+        # Se aplican en el próximo muestreo, junto con las transiciones nuevas
+        self._updates[0].append(indices)
+        self._updates[1].append(priorities)
+
+    def replay(self, agent, batch_size=REPLAY_BATCH_SIZE):
+        """Un paso de replay: repasa un lote con la actualización por lotes de la tabla del agente."""
+        if self.size == 0:
+            return
+        indices, states, actions, rewards, next_states, done, weights = self.sample(batch_size)
+        td_errors = agent.q_table.update_batch(
+            states, actions, rewards, next_states, done, agent.alpha, agent.gamma, weights
+        )
+        if self.prioritized:
+            self.update_priorities(indices, td_errors)
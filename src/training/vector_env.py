@@ -0,0 +1,191 @@
+import numpy as np
+
+from src.ai.oracle import OpponentOracle
+from src.ai.q_table import action_index
+from src.game_logic.state_index import get_state_index
+from src.game_logic.transitions import get_transition_table
+from src.training.gym import stop_check
+
+# Mismo calendario de checkpoints y epsilon mínimo que train_with_decay
+CHECKPOINT_INTERVAL = 200
+FIRST_CHECKPOINT = 1000
+MIN_EPSILON = 0.01
+
+
+def oracle_actions(oracle: OpponentOracle, state_index=None):
+    """Jugada del oráculo por id de estado como índice de casilla (-1 si la posición no está en la tabla)."""
+    state_index = state_index or get_state_index()
+    actions = np.full(state_index.num_states, -1, dtype=np.int64)
+    for state_id, code in enumerate(state_index.codes):
+        if oracle.moves_by_code is not None:
+            move = oracle.moves_by_code[code]
+        else:
+            move = oracle.table.best_move(code) if oracle.table is not None else None
+        if move is not None:
+            actions[state_id] = action_index(move)
+    return actions
+
+
+def _random_choice(mask, rng):
+    """Por fila, una columna al azar entre las marcadas en mask (todas las filas con al menos una)."""
+    return (rng.random(mask.shape) * mask).argmax(axis=1)
+
+
+class VectorEnv:
+    """
+    Partidas simultáneas sobre ids de estado (TransitionTable) que aprenden con Q-learning tabular como
+    train_with_decay: modos 0/1/2 con el maestro según minimax_ratio, recompensas 1 / reward_draw / -1 y
+    actualización TD del jugador que no movió en cada jugada. q_values es [tablas, estados, 9] y cada partida
+    pertenece a una tabla (owners), con alpha, gamma y reward_draw por tabla.
+    Si varias partidas actualizan la misma (tabla, estado, acción) en un mismo paso, la entrada se mueve una
+    sola vez hacia la media de sus objetivos TD (independiente del orden de las partidas).
+    visited (opcional, misma forma que q_values) marca las entradas actualizadas, como ArrayQTable.visited.
+    """
+
+    def __init__(self, q_values, alpha, gamma, reward_draw, minimax_ratio=0.3, oracle=None, rng=None, visited=None):
+        oracle = oracle or OpponentOracle.shared()
+        self.rng = rng or np.random.default_rng()
+        self.q_values = q_values
+        self.visited = visited
+        self.alpha, self.gamma, self.reward_draw = alpha, gamma, reward_draw
+        self.minimax_ratio = minimax_ratio
+        self.master_actions = oracle_actions(oracle)
+        self.transitions = get_transition_table()
+        self._unique_owners = True
+
+    def _greedy(self, owners, states):
+        masked = np.where(self.transitions.legal_mask[states], self.q_values[owners, states], -np.inf)
+        return _random_choice(masked == masked.max(axis=1, keepdims=True), self.rng)
+
+    def _learn(self, owners, states, actions, rewards, next_states, done):
+        """Bellman por lotes (con media de objetivos si hay índices repetidos)."""
+        legal_mask = self.transitions.legal_mask
+        next_max = np.where(legal_mask[next_states], self.q_values[owners, next_states], -np.inf).max(axis=1)
+        targets = np.where(done, rewards, rewards + self.gamma[owners] * np.where(done, 0.0, next_max))
+        if not self._unique_owners:
+            flat = (owners * self.q_values.shape[1] + states) * self.q_values.shape[2] + actions
+            flat, first, inverse = np.unique(flat, return_index=True, return_inverse=True)
+            if len(flat) < len(targets):
+                targets = np.bincount(inverse, weights=targets) / np.bincount(inverse)
+                owners, states, actions = owners[first], states[first], actions[first]
+        old_q = self.q_values[owners, states, actions]
+        self.q_values[owners, states, actions] = old_q + self.alpha[owners] * (targets - old_q)
+        if self.visited is not None:
+            self.visited[owners, states, actions] = True
+
+    def _final_reward(self, owners, seats, winners):
+        return np.where(winners == seats, 1.0, np.where(winners == 0, self.reward_draw[owners], -1.0))
+
+    def play(self, owners, epsilon):
+        """Juega una partida completa por elemento de owners, con el epsilon de cada partida."""
+        next_state, legal_mask, terminal = (
+            self.transitions.next_state,
+            self.transitions.legal_mask,
+            self.transitions.terminal,
+        )
+        turn, winner = self.transitions.turn, self.transitions.winner
+        num_games = len(owners)
+        self._unique_owners = len(np.unique(owners)) == num_games
+
+        # Modo por partida: 1 el maestro juega como 2, 2 el maestro juega como 1, 0 el agente contra sí mismo
+        r = self.rng.random(num_games)
+        mode = np.where(r < self.minimax_ratio / 2, 1, np.where(r < self.minimax_ratio, 2, 0))
+        states = np.zeros(num_games, dtype=np.int64)
+        # Última (estado, acción) del agente por asiento; -1 = ese asiento aún no jugó como agente
+        history_state = np.full((num_games, 3), -1, dtype=np.int64)
+        history_action = np.full((num_games, 3), -1, dtype=np.int64)
+        rows = np.arange(num_games)
+
+        while len(rows):
+            p, s = owners[rows], states[rows]
+            current = turn[s].astype(np.int64)
+            is_master = ((current == 2) & (mode[rows] == 1)) | ((current == 1) & (mode[rows] == 2))
+
+            random_moves = _random_choice(legal_mask[s], self.rng)
+            explore = self.rng.random(len(rows)) < epsilon[rows]
+            actions = np.where(explore, random_moves, self._greedy(p, s))
+            master_moves = self.master_actions[s]
+            actions = np.where(is_master, np.where(master_moves >= 0, master_moves, random_moves), actions)
+
+            agent_rows = ~is_master
+            history_state[rows[agent_rows], current[agent_rows]] = s[agent_rows]
+            history_action[rows[agent_rows], current[agent_rows]] = actions[agent_rows]
+
+            s2 = next_state[s, actions]
+            done = terminal[s2]
+            other = 3 - current
+
+            # El jugador que no movió aprende de la nueva posición (o de la recompensa final)
+            prev_states = history_state[rows, other]
+            learners = prev_states >= 0
+            if learners.any():
+                rewards = np.where(done, self._final_reward(p, other, winner[s2]), 0.0)
+                update = (p[learners], prev_states[learners], history_action[rows, other][learners])
+                self._learn(*update, rewards[learners], s2[learners], done[learners])
+                # Igual que train_with_decay: al terminar la partida el tablero no cambia de turno, así que su
+                # bloque final vuelve a actualizar al jugador que no movió (y no al que hizo la última jugada)
+                repeat = done[learners]
+                if repeat.any():
+                    self._learn(
+                        *(values[repeat] for values in update),
+                        rewards[learners][repeat],
+                        s2[learners][repeat],
+                        repeat[repeat],
+                    )
+
+            states[rows] = s2
+            rows = rows[~done]
+
+
+def train_batched(
+    agent,
+    episodes=20000,
+    batch_size=64,
+    minimax_ratio=0.3,
+    epsilon_decay_gen=None,
+    reward_draw_gen=0.5,
+    start_epsilon=1.0,
+    oracle=None,
+    rng=None,
+    stop_criterion="sampled",
+):
+    """
+    train_with_decay con batch_size partidas a la vez sobre un VectorEnv (agente array no canónico).
+    Cada partida del lote es un episodio con su propio epsilon del calendario de decaimiento; los checkpoints
+    (stop_criterion, ver gym.stop_check) se evalúan al terminar el lote que contiene el episodio.
+    Con batch_size = 1 es train_with_decay.
+    Retorna: (agente, episodes_to_optimal).
+    """
+    if agent.backend != "array" or agent.symmetry is not None:
+        raise ValueError("train_batched necesita un agente con backend 'array' y sin estados canónicos")
+    if episodes <= 0:  # Nada que entrenar: training_state queda como estaba
+        return agent, episodes
+    oracle = oracle or OpponentOracle.shared()
+    decay_factor = start_epsilon / episodes if epsilon_decay_gen is None else epsilon_decay_gen
+    env = VectorEnv(
+        agent.q_table.values[None],
+        np.array([agent.alpha], dtype=np.float32),
+        np.array([agent.gamma], dtype=np.float32),
+        np.array([reward_draw_gen], dtype=np.float32),
+        minimax_ratio,
+        oracle,
+        rng,
+        agent.q_table.visited[None],
+    )
+    is_optimal = stop_check(agent, stop_criterion, oracle)
+    episodes_to_optimal = episodes
+
+    for start in range(0, episodes, batch_size):
+        batch = np.arange(start, min(start + batch_size, episodes))
+        epsilon = np.maximum(MIN_EPSILON, start_epsilon - decay_factor * (batch + 1))
+        env.play(np.zeros(len(batch), dtype=np.int64), epsilon)
+
+        checkpoints = batch[(batch % CHECKPOINT_INTERVAL == 0) & (batch > FIRST_CHECKPOINT)]
+        if len(checkpoints) and is_optimal():
+            episodes_to_optimal = int(checkpoints[-1])
+            break
+
+    # El lote se juega entero aunque el checkpoint caiga antes de su final: se reanuda tras su último episodio
+    agent.training_state = {"episode": int(batch[-1]) + 1, "epsilon": float(epsilon[-1])}
+    agent.epsilon = 0.01
+    return agent, episodes_to_optimal
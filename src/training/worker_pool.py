@@ -0,0 +1,106 @@
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.ai.oracle import DEFAULT_LOOKUP_PATH, OpponentOracle
+from src.ai.q_table import get_legal_actions, get_legal_mask
+from src.game_logic.lines import get_line_table
+from src.game_logic.state_index import DENSE_INDEX_AVAILABLE, get_state_index
+
+# Memoria estimada por worker (intérprete + numpy + tablas compartidas + un agente en entrenamiento)
+WORKER_MEMORY_BYTES = 256 * 1024**2
+# Bloques por worker al repartir tareas: más bloques equilibran mejor tareas de duración desigual
+CHUNKS_PER_WORKER = 4
+
+
+def available_cpus() -> int:
+    """CPUs que el proceso puede usar (respeta la afinidad / límites del contenedor cuando se conocen)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def available_memory():
+    """Bytes de memoria disponibles (MemAvailable en Linux), o None si no se puede saber."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def default_workers(memory_per_worker=WORKER_MEMORY_BYTES) -> int:
+    """Un worker por CPU disponible, sin pasar de lo que cabe en la memoria libre."""
+    workers = available_cpus()
+    memory = available_memory()
+    if memory is not None:
+        workers = min(workers, memory // memory_per_worker)
+    return max(1, workers)
+
+
+def _init_worker(lookup_path):
+    """
+    Se ejecuta una vez por worker: carga el oráculo y las tablas compartidas por proceso, de modo que
+    las tareas las encuentran ya construidas. Cada worker usa su propia semilla (con fork heredarían la misma).
+    """
+    random.seed()
+    OpponentOracle.shared(lookup_path)
+    get_line_table()
+    if DENSE_INDEX_AVAILABLE:
+        get_state_index()
+        get_legal_actions()
+        get_legal_mask()
+
+
+def _run_chunk(fn, chunk):
+    return [(index, fn(*args)) for index, args in chunk]
+
+
+class WorkerPool:
+    """
+    Pool de procesos de larga vida (toda la ejecución del GA en lugar de uno por generación).
+    Los workers se inicializan una sola vez (_init_worker) y las tareas se envían en bloques a una cola
+    común: cada worker toma el siguiente bloque libre al terminar el suyo, así que las tareas lentas no
+    dejan a los demás esperando.
+    """
+
+    def __init__(self, max_workers=None, lookup_path=DEFAULT_LOOKUP_PATH):
+        self.max_workers = max_workers or default_workers()
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_init_worker, initargs=(lookup_path,)
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Si el bloque falló, las tareas que aún esperan en la cola se cancelan en lugar de ejecutarse
+        self.shutdown(cancel_futures=exc_type is not None)
+
+    def shutdown(self, cancel_futures=False):
+        self.executor.shutdown(cancel_futures=cancel_futures)
+
+    def submit(self, fn, *args):
+        """Una tarea suelta (Future); para el GA de estado estacionario, que envía hijos según terminan."""
+        return self.executor.submit(fn, *args)
+
+    def imap_unordered(self, fn, tasks, chunk_size=None):
+        """
+        Ejecuta fn(*args) para cada tupla de tasks y produce (índice, resultado) según van terminando.
+        fn debe ser una función de módulo (se envía por pickle a los workers).
+        """
+        tasks = list(enumerate(tasks))
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(len(tasks) / (self.max_workers * CHUNKS_PER_WORKER)))
+        chunks = [tasks[start : start + chunk_size] for start in range(0, len(tasks), chunk_size)]
+
+        futures = [self.executor.submit(_run_chunk, fn, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from src.ai.search import search
+from src.game_logic.bitboard import BitBoard
+from src.game_logic.board import Board
+from src.game_logic.lines import get_line_table
+from src.game_logic.table_board import TableBoard
+
+
+@pytest.mark.parametrize("geometry", [(3, 3, 3), (4, 4, 4), (4, 4, 3), (5, 5, 4), (3, 5, 3)])
+def test_bitboard_matches_matrix_board(geometry):
+    """Ambos motores deben producir el mismo estado en partidas aleatorias, incluido undo_move."""
+    rng = random.Random(0)
+    for _ in range(300):
+        matrix, bits = Board(*geometry), BitBoard(*geometry)
+        while not matrix.game_over:
+            moves = matrix.get_available_moves()
+            assert list(bits.get_available_moves()) == moves
+
+            row, col = rng.choice(moves)
+            prev_state = (matrix.turn, matrix.winner, matrix.game_over, matrix.win_info)
+            assert matrix.make_move(row, col) and bits.make_move(row, col)
+
+            # Deshacer y rehacer debe dejar ambos tableros idénticos
+            matrix.undo_move(row, col, *prev_state)
+            bits.undo_move(row, col, *prev_state)
+            assert bits.board == matrix.board
+            matrix.make_move(row, col)
+            bits.make_move(row, col)
+
+            assert bits.board == matrix.board
+            assert (bits.turn, bits.winner, bits.game_over, bits.win_info) == (
+                matrix.turn,
+                matrix.winner,
+                matrix.game_over,
+                matrix.win_info,
+            )
+        assert not bits.make_move(0, 0)
+
+
+def test_win_info_for_lines_shorter_than_the_board():
+    board = Board(5, 5, 4)
+    for row, col in [(1, 1), (0, 4), (2, 2), (1, 4), (3, 3), (2, 4), (4, 4)]:
+        board.make_move(row, col)
+    assert board.winner == 1 and board.win_info == ("line", ((1, 1), (4, 4)))
+    # En 4x4 con 4 en raya las líneas cruzan el tablero y conservan el formato clásico
+    assert ("diag", 2) in [info for _, _, info in get_line_table(4, 4, 4).lines]
+
+
+def test_search_runs_on_larger_boards():
+    board = BitBoard(5, 5, 4)
+    for row, col in [(2, 2), (2, 0), (2, 3), (0, 0), (2, 1)]:
+        board.make_move(row, col)
+    # El jugador 2 debe cortar el cuatro en raya del jugador 1 dentro del plazo
+    move, info = search(board, deadline_ms=200)
+    assert move == (2, 4) and info["depth"] >= 2
+
+
+def test_table_board_matches_bitboard():
+    rng = random.Random(1)
+    for _ in range(300):
+        bits, table = BitBoard(), TableBoard()
+        while not bits.game_over:
+            moves = bits.get_available_moves()
+            assert table.get_available_moves() == moves
+            row, col = rng.choice(moves)
+            prev_state = (bits.turn, bits.winner, bits.game_over, bits.win_info)
+            assert bits.make_move(row, col) and table.make_move(row, col)
+            table.undo_move(row, col, *prev_state)
+            table.make_move(row, col)
+
+            assert (table.code, table.board, table.state_id) == (bits.code, bits.board, bits.state_id)
+            assert (table.turn, table.winner, table.game_over, table.win_info) == (
+                bits.turn,
+                bits.winner,
+                bits.game_over,
+                bits.win_info,
+            )
+        assert not table.make_move(0, 0)
@@ -0,0 +1,136 @@
+import csv
+import random
+import statistics
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from src.ai.ql_agent import GeneticQLAgent, QLearningAgent
+from src.training import genetic_trainer
+from src.training.fitness_cache import FitnessCache
+from src.training.gym import train_with_decay
+from src.training.worker_pool import WorkerPool
+
+
+def test_duplicate_genomes_train_once_and_cache_persists(tmp_path, monkeypatch):
+    monkeypatch.setattr(genetic_trainer, "NUM_EPISODES", 300)
+    cache_path = str(tmp_path / "fitness_cache.csv")
+    population = [GeneticQLAgent(i, gen=(0.5, 0.9, 0.001)) for i in range(3)]
+    population.append(GeneticQLAgent(3, gen=(0.3, 0.8, 0.002)))
+
+    with WorkerPool(max_workers=1) as pool:
+        genetic_trainer.evaluate_population(population, 1, 1, pool, cache=FitnessCache(cache_path))
+        assert len(FitnessCache(cache_path).results) == 2  # Un entrenamiento por genoma distinto
+        assert len({individual.fitness for individual in population[:3]}) == 1
+
+        # Otra ejecución con la caché en disco: nada que entrenar, mismos valores
+        again = [GeneticQLAgent(0, gen=(0.5, 0.9, 0.001))]
+        genetic_trainer.evaluate_population(again, 1, 1, pool, cache=FitnessCache(cache_path))
+    assert sum(len(results) for results in FitnessCache(cache_path).results.values()) == 2
+    assert again[0].fitness == population[0].fitness
+
+
+def test_fitness_cache_reuses_only_rows_of_the_same_context(tmp_path, monkeypatch):
+    cache_path = str(tmp_path / "fitness_cache.csv")
+    key = (0.5, 0.9, 0.001, 0.5, 300)
+    FitnessCache(cache_path, context=genetic_trainer.fitness_context()).add(
+        key, {"fitness": 1.2, "episodes_to_optimal": 1200}
+    )
+    assert FitnessCache(cache_path, context=genetic_trainer.fitness_context()).missing(key) == 0
+
+    # Cambiar la penalización, el backend o activar la multi-fidelidad cambia lo que significa la fitness
+    for name, value in (("EXPLOITABILITY_WEIGHT", 0.5), ("TRAINING_BACKEND", "population"), ("MULTI_FIDELITY", True)):
+        with monkeypatch.context() as patch:
+            patch.setattr(genetic_trainer, name, value)
+            assert FitnessCache(cache_path, context=genetic_trainer.fitness_context()).missing(key) == 1
+
+    # Una fila escrita con el backend por lotes tampoco se reutiliza con el escalar
+    monkeypatch.setattr(genetic_trainer, "TRAINING_BACKEND", "population")
+    FitnessCache(cache_path, context=genetic_trainer.fitness_context()).add(
+        (0.3, 0.8, 0.002, 0.5, 300), {"fitness": 0.9, "episodes_to_optimal": 300}
+    )
+    monkeypatch.setattr(genetic_trainer, "TRAINING_BACKEND", "scalar")
+    assert FitnessCache(cache_path, context=genetic_trainer.fitness_context()).missing((0.3, 0.8, 0.002, 0.5, 300)) == 1
+
+    legacy_path = tmp_path / "legacy.csv"
+    legacy_path.write_text("alpha,gamma,decay,reward_draw,episodes,fitness,episodes_to_optimal\n")
+    with pytest.raises(ValueError):
+        FitnessCache(str(legacy_path))
+
+
+def test_steady_state_reports_generation_equivalents(tmp_path, monkeypatch):
+    for name, value in (
+        ("NUM_EPISODES", 300),
+        ("POPULATION_SIZE", 4),
+        ("MAX_WORKERS", 1),
+        ("FITNESS_CACHE_FILE", None),
+    ):
+        monkeypatch.setattr(genetic_trainer, name, value)
+    csv_path = tmp_path / "steady.csv"
+
+    best = genetic_trainer.run_steady_state_algorithm(total_evaluations=8, csv_filename=str(csv_path))
+    with open(csv_path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["generation"] for row in rows] == ["1"] * 4 + ["2"] * 4
+    assert round(best.fitness, 4) == max(float(row["fitness"]) for row in rows)
+
+
+def test_resumed_training_matches_single_run():
+    random.seed(7)
+    whole, _ = train_with_decay(QLearningAgent(), episodes=400, epsilon_decay_gen=0.995)
+
+    random.seed(7)
+    agent, _ = train_with_decay(QLearningAgent(), episodes=200, epsilon_decay_gen=0.995)
+    assert agent.training_state["episode"] == 200
+    agent, _ = train_with_decay(agent, episodes=400, epsilon_decay_gen=0.995, resume=True)
+    assert np.array_equal(agent.q_table.values, whole.q_table.values)
+
+
+def test_multifidelity_caches_only_full_budget_results(monkeypatch):
+    monkeypatch.setattr(genetic_trainer, "NUM_EPISODES", 800)
+    monkeypatch.setattr(genetic_trainer, "MIN_RUNG_EPISODES", 200)
+    assert genetic_trainer.rung_budgets() == [200, 400, 800]
+    population = [GeneticQLAgent(i, gen=(0.1 + 0.2 * i, 0.9, 0.001)) for i in range(4)]
+    population.append(GeneticQLAgent(4, gen=(0.1, 0.9, 0.001)))
+
+    cache = FitnessCache()
+    with WorkerPool(max_workers=1) as pool:
+        trained = genetic_trainer.evaluate_population_multifidelity(population, 1, 1, pool, cache)
+    # 4 genomas x 200 + 2 x 200 + 1 x 400: sin convergencia (los checkpoints empiezan en el episodio 1200)
+    assert trained == 1600
+    assert [key[-1] for key in cache.results] == [800]
+    assert population[4].fitness == population[0].fitness
+    assert all(individual.fitness is not None for individual in population)
+
+
+def test_median_rule_prunes_within_a_single_generation(monkeypatch):
+    monkeypatch.setattr(genetic_trainer, "NUM_EPISODES", 400)
+    monkeypatch.setattr(genetic_trainer, "HALVING_ETA", 1)  # Sin halving: solo poda la regla de la mediana
+    monkeypatch.setattr(genetic_trainer, "rung_budgets", lambda: [200, 400])
+    population = [GeneticQLAgent(i, gen=(0.1 + 0.2 * i, 0.9, 0.001)) for i in range(4)]
+
+    history = defaultdict(list)
+    with WorkerPool(max_workers=1) as pool:
+        trained = genetic_trainer.evaluate_population_multifidelity(population, 1, 1, pool, history=history)
+    median = statistics.median(history[0])
+    survivors = sum(fitness >= median for fitness in history[0])
+    assert len(history[0]) == 4 and survivors < 4
+    assert trained == 4 * 200 + survivors * 200
+
+
+def test_exploitability_penalty_is_opt_in(monkeypatch):
+    individual = GeneticQLAgent(0, gen=(0.5, 0.9, 0.001))
+    individual.instantiate_agent()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("best_response no debe calcularse con EXPLOITABILITY_WEIGHT = 0")
+
+    monkeypatch.setattr(genetic_trainer, "best_response", fail)
+    quality, _ = genetic_trainer.score_individual(individual, 300, 300, 1, 1, 0, 1)
+    assert individual.fitness == quality
+
+    monkeypatch.undo()
+    monkeypatch.setattr(genetic_trainer, "EXPLOITABILITY_WEIGHT", 0.1)
+    genetic_trainer.score_individual(individual, 300, 300, 1, 1, 0, 1)
+    assert individual.fitness < quality  # Una tabla vacía es explotable
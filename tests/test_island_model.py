@@ -0,0 +1,42 @@
+import csv
+import os
+
+import pytest
+
+from src.training import island_model
+
+
+def test_migration_topologies():
+    assert island_model.migration_targets(3, 4, "ring") == [0]
+    assert island_model.migration_targets(1, 3, "fully_connected") == [0, 2]
+    assert island_model.migration_targets(0, 2, "random") == [1]
+    assert island_model.migration_targets(0, 1, "ring") == []
+
+
+def test_island_model_writes_generation_rows(tmp_path):
+    csv_path = tmp_path / "generations_data.csv"
+    best = island_model.run_island_model(
+        num_islands=2, generations=3, island_size=3, episodes=300, migration_interval=1, csv_filename=str(csv_path)
+    )
+    with open(csv_path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == island_model.CSV_FIELDNAMES
+    assert [row["Generation"] for row in rows] == ["1", "2", "3"]
+    assert best.fitness == max(float(row["Max_Fitness"]) for row in rows)
+
+
+@pytest.mark.parametrize("failure", ["exception", "exit"])
+def test_failed_island_stops_the_model_and_keeps_old_csv(tmp_path, monkeypatch, failure):
+    def fail(*args, **kwargs):
+        if failure == "exit":
+            os._exit(3)  # Muere sin poder informar: se detecta por el código de salida
+        raise ZeroDivisionError("isla rota")
+
+    monkeypatch.setattr(island_model, "evaluate_island", fail)
+    monkeypatch.setattr(island_model, "STATS_POLL_SECONDS", 0.1)
+    csv_path = tmp_path / "generations_data.csv"
+    csv_path.write_text("datos previos\n")
+
+    with pytest.raises(RuntimeError, match="ZeroDivisionError" if failure == "exception" else "código 3"):
+        island_model.run_island_model(num_islands=2, generations=2, island_size=2, csv_filename=str(csv_path))
+    assert csv_path.read_text() == "datos previos\n"
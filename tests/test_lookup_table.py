@@ -0,0 +1,34 @@
+import pickle
+
+import pytest
+
+from src.ai.lookup_table import LookupTable, convert_pickle
+from src.ai.oracle import OpponentOracle
+from src.game_logic.state_index import code_of_flat
+
+
+def test_binary_table_matches_pickle(tmp_path):
+    target = tmp_path / "lookup.bin"
+    convert_pickle("tictactoe_lookup.pkl", str(target))
+    table = LookupTable(str(target))
+
+    with open("tictactoe_lookup.pkl", "rb") as f:
+        lookup_table = pickle.load(f)
+
+    for state_hash, move_data in lookup_table.items():
+        code = code_of_flat(state_hash)
+        assert table.best_move(code) == move_data["move"]
+        assert table.score(code) == move_data["score"]
+        assert move_data["move"] in table.optimal_moves(code)
+
+    # Tablero vacío: todas las jugadas empatan con juego perfecto
+    assert len(table.optimal_moves(0)) == 9
+
+
+def test_oracle_prefers_binary_and_rejects_garbage(tmp_path):
+    assert OpponentOracle.shared("tictactoe_lookup.pkl").table is not None
+
+    garbage = tmp_path / "garbage.bin"
+    garbage.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        LookupTable(str(garbage))
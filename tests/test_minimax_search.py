@@ -0,0 +1,59 @@
+import math
+import random
+
+from src.ai.minimax import minimax_alpha_beta, minimax_bruteforce
+from src.ai.search import search
+from src.ai.transposition import MoveOrdering, TranspositionTable
+from src.game_logic.engine import create_board
+
+
+def random_position(rng):
+    board = create_board()
+    for _ in range(rng.randint(2, 6)):
+        if board.game_over:
+            break
+        board.make_move(*rng.choice(list(board.get_available_moves())))
+    return board
+
+
+def test_transposition_table_and_ordering_keep_minimax_values():
+    rng = random.Random(3)
+    # Tablas compartidas entre búsquedas: las cotas guardadas deben seguir siendo válidas
+    tt, ordering, bf_tt = TranspositionTable(), MoveOrdering(), TranspositionTable()
+    for _ in range(60):
+        board = random_position(rng)
+        player = board.turn
+        expected = minimax_bruteforce(board, 0, True, {"nodes": 0}, player)
+
+        window = sorted(rng.sample([-math.inf, -1, 0, 1, math.inf], 2))
+        plain = minimax_alpha_beta(board, 0, window[0], window[1], True, {"nodes": 0}, player)
+        tabled = minimax_alpha_beta(board, 0, window[0], window[1], True, {"nodes": 0}, player, tt, ordering)
+
+        assert minimax_bruteforce(board, 0, True, {"nodes": 0}, player, bf_tt) == expected
+        assert minimax_alpha_beta(board, 0, -math.inf, math.inf, True, {"nodes": 0}, player, tt, ordering) == expected
+        # Dentro de la ventana ambos son exactos; fuera, ambos deben quedar del mismo lado
+        if window[0] < expected < window[1]:
+            assert plain == tabled == expected
+        elif expected <= window[0]:
+            assert plain <= window[0] and tabled <= window[0]
+        else:
+            assert plain >= window[1] and tabled >= window[1]
+
+
+def test_anytime_search_matches_minimax_and_respects_budget():
+    rng = random.Random(5)
+    for _ in range(20):
+        board = random_position(rng)
+        if board.game_over:
+            continue
+        player = board.turn
+        expected = minimax_alpha_beta(board, 0, -math.inf, math.inf, True, {"nodes": 0}, player)
+        move, info = search(board)
+        assert info["completed"] and info["score"] == expected
+        assert move in board.get_available_moves()
+        # La ventana de la raíz se estrecha: las demás jugadas solo dan una cota que no supera a la elegida
+        assert info["root_scores"][move] == expected and max(info["root_scores"].values()) == expected
+
+        # Sin presupuesto para terminar ni una iteración igual debe devolver una jugada legal
+        move, info = search(board, max_nodes=1)
+        assert move in board.get_available_moves() and info["nodes"] <= 2
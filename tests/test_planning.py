@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from src.ai.oracle import OpponentOracle
+from src.ai.policy_evaluation import evaluate_policy
+from src.ai.q_table import action_index
+from src.ai.ql_agent import QLearningAgent
+from src.game_logic.engine import create_board
+from src.training.gym import train_with_decay
+from src.training.planning import PrioritizedSweeping
+
+
+def test_model_follows_move_and_master_reply():
+    agent = QLearningAgent(backend="array", canonical=False)
+    planner = PrioritizedSweeping(agent, reward_draw=0.25)
+    board = create_board()
+    for move in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+        board.make_move(*move)
+    state_id = board.state_id
+
+    win = action_index((0, 2))
+    assert planner.done[state_id, win] and planner.reward[state_id, win] == 1.0
+    # Tras (2, 2) el modelo sigue con la jugada del maestro
+    board.make_move(2, 2)
+    board.make_move(*OpponentOracle.shared().get_move(board))
+    loss = action_index((2, 2))
+    assert planner.done[state_id, loss] == board.game_over
+    assert planner.next_state[state_id, loss] == (-1 if board.game_over else board.state_id)
+    assert not planner.valid[state_id, action_index((0, 0))]  # Casilla ocupada
+
+
+def test_planning_budget_limits_backups():
+    agent = QLearningAgent(backend="array", canonical=False)
+    planner = PrioritizedSweeping(agent, planning_steps=3)
+    planner.plan(10)
+    assert planner.backups == 10
+    assert agent.q_table.values.any()
+
+    with pytest.raises(ValueError):
+        PrioritizedSweeping(QLearningAgent(backend="array", canonical=True))
+
+
+def test_planning_reaches_zero_losses_in_few_episodes():
+    random.seed(0)
+    agent = QLearningAgent(alpha=0.5, gamma=0.9, epsilon=1.0, backend="array", canonical=False)
+    planner = PrioritizedSweeping(agent, planning_steps=100)
+    train_with_decay(agent, episodes=100, epsilon_decay_gen=0.0005, planner=planner)
+    assert evaluate_policy(agent)[1] == 0
+
+
+def test_train_with_decay_rejects_a_mismatched_planner():
+    agent = QLearningAgent(backend="array", canonical=False)
+    with pytest.raises(ValueError):
+        train_with_decay(
+            agent, episodes=1, planner=PrioritizedSweeping(QLearningAgent(backend="array", canonical=False))
+        )
+    with pytest.raises(ValueError):
+        train_with_decay(agent, episodes=1, reward_draw_gen=0.2, planner=PrioritizedSweeping(agent, reward_draw=0.5))
@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from src.ai.oracle import OpponentOracle
+from src.ai.policy_evaluation import PolicyEvaluator, best_response, evaluate_policy, minimax_opponent
+from src.ai.ql_agent import QLearningAgent
+from src.training.gym import stop_check
+from tests.test_q_table import play_and_learn
+
+
+class OracleAgent:
+    """Agente perfecto: su política greedy es la jugada de la tabla."""
+
+    def __init__(self):
+        self.policy = minimax_opponent(OpponentOracle.shared())
+
+    def greedy_moves(self, board):
+        return [move for move, _ in self.policy(board)]
+
+
+def test_perfect_agent_never_loses_against_minimax():
+    wins, losses, draws = evaluate_policy(OracleAgent())
+    assert losses == 0
+    assert draws == pytest.approx(1.0)
+
+
+def test_untrained_agent_matches_random_play():
+    # Q-table vacía: todas las jugadas empatan y la política greedy es uniforme.
+    # Aleatorio contra aleatorio en 3x3: gana X el 58.49%, O el 28.81%, empate el 12.70%
+    agent = QLearningAgent(alpha=0.3, gamma=0.8, epsilon=0.5)
+    wins, losses, draws = evaluate_policy(agent, opponent="random")
+    assert wins + losses + draws == pytest.approx(1.0)
+    assert wins == pytest.approx((0.5849 + 0.2881) / 2, abs=1e-3)
+    assert draws == pytest.approx(0.1270, abs=1e-3)
+    assert agent.epsilon == 0.5
+
+
+def test_perfect_agent_is_not_exploitable():
+    result = best_response(OracleAgent())
+    assert result["exploitability"] == pytest.approx(0.0)
+    assert result["exploitable_states"] == []
+
+
+def test_best_response_without_table_matches_table():
+    # Sin tabla binaria los valores minimax se resuelven en la misma pasada
+    agent = QLearningAgent(alpha=0.3, gamma=0.8, epsilon=0.5)
+    with_table = best_response(agent)
+    without_table = best_response(agent, oracle=OpponentOracle("inexistente.bin"))
+    assert with_table["exploitability"] > 0.5
+    assert with_table["exploitability"] == pytest.approx(without_table["exploitability"])
+    assert with_table["exploitable_states"] == without_table["exploitable_states"]
+
+
+@pytest.mark.parametrize("backend", ["array", "dict"])
+def test_cached_evaluator_matches_full_evaluation(backend):
+    agent = QLearningAgent(alpha=0.3, gamma=0.8, epsilon=0.5, backend=backend)
+    evaluator = PolicyEvaluator(agent)
+    rng = random.Random(0)
+    for _ in range(10):
+        for _ in range(20):
+            play_and_learn(agent, rng.random())
+        assert evaluator.evaluate() == pytest.approx(evaluate_policy(agent), abs=1e-12)
+    # Sin actualizaciones intermedias la huella no cambia y se reutiliza el resultado
+    evaluator.evaluate()
+    assert evaluator.stats["cached"] >= 1
+    assert evaluator.stats["full"] == 1
+
+
+def test_stop_criteria_reject_untrained_agent():
+    agent = QLearningAgent(alpha=0.3, gamma=0.8, epsilon=0.5)
+    for criterion in ("exact", "exploitability"):
+        assert not stop_check(agent, criterion)()
+    assert agent.epsilon == 0.5
+    assert not stop_check(agent, "sampled")()
+    assert agent.epsilon == 0  # Igual que el criterio original: las partidas de prueba dejan epsilon en 0
+    with pytest.raises(ValueError):
+        stop_check(agent, "minimax")
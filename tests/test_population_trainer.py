@@ -0,0 +1,78 @@
+import numpy as np
+
+from src.ai.q_table import action_index
+from src.ai.ql_agent import GeneticQLAgent, QLearningAgent
+from src.game_logic.engine import create_board
+from src.game_logic.state_index import get_state_index
+from src.training import genetic_trainer
+from src.training.fitness_cache import FitnessCache
+from src.training.population_trainer import train_population
+from src.training.vector_env import MIN_EPSILON, VectorEnv, train_batched
+from src.training.worker_pool import WorkerPool
+
+
+def test_each_individual_uses_its_own_parameters():
+    genomes = [(0.0, 0.9, 0.001, 0.5), (0.5, 0.9, 0.001, 0.5), (0.5, 0.9, 0.002, 0.5)]
+    agents, episodes_to_optimal = train_population(genomes, episodes=200, rng=np.random.default_rng(0))
+
+    assert episodes_to_optimal == [200, 200, 200]
+    assert not agents[0].q_table.values.any()  # alpha = 0: no aprende nada
+    assert agents[1].q_table.values.any()
+    epsilons = [agent.training_state["epsilon"] for agent in agents[1:]]
+    assert np.allclose(epsilons, [0.8, 0.6])
+
+
+def test_population_backend_fills_fitness_and_cache(monkeypatch):
+    monkeypatch.setattr(genetic_trainer, "NUM_EPISODES", 300)
+    monkeypatch.setattr(genetic_trainer, "TRAINING_BACKEND", "population")
+    population = [GeneticQLAgent(i, gen=(0.1 + 0.2 * i, 0.9, 0.001)) for i in range(3)]
+    population.append(GeneticQLAgent(3, gen=(0.1, 0.9, 0.001)))
+
+    cache = FitnessCache()
+    with WorkerPool(max_workers=2) as pool:
+        genetic_trainer.evaluate_population(population, 1, 1, pool, cache=cache)
+    assert len(cache.results) == 3
+    assert all(0.0 <= individual.fitness <= 1.0 for individual in population)
+    assert population[3].fitness == population[0].fitness
+
+
+class FirstChoiceRng:
+    """rng fijo: con random() = 0.5 todas las partidas son de autojuego, epsilon 1 explora y epsilon 0 no, y
+    tanto la jugada al azar como el desempate greedy eligen la primera casilla candidata."""
+
+    def random(self, shape):
+        return np.full(shape, 0.5)
+
+
+def test_batched_updates_to_the_same_entry_use_the_mean_target():
+    board = create_board()
+    board.make_move(0, 0)
+    after_corner = board.state_id
+    board.make_move(1, 1)
+    after_center = board.state_id
+
+    q_values = np.zeros((1, get_state_index().num_states, 9), dtype=np.float32)
+    q_values[0, after_corner, action_index((1, 1))] = 1.0  # El greedy responde al centro, el explorador a (0, 1)
+    q_values[0, after_center, 8] = 1.0
+    ones = np.ones(1, dtype=np.float32)
+    env = VectorEnv(q_values, 0.5 * ones, 0.9 * ones, 0.5 * ones, minimax_ratio=0.0, rng=FirstChoiceRng())
+    # Dos partidas de la misma tabla abren en (0, 0) y la actualizan en el mismo paso con objetivos 0.9 y 0
+    env.play(np.zeros(2, dtype=np.int64), np.array([0.0, 1.0]))
+    assert np.isclose(q_values[0, 0, 0], 0.5 * 0.45)  # Una sola actualización hacia la media
+
+
+def test_train_batched_learns_and_records_training_state():
+    agent = QLearningAgent(alpha=0.5, gamma=0.9, backend="array", canonical=False)
+    agent, episodes_to_optimal = train_batched(agent, episodes=300, batch_size=64, rng=np.random.default_rng(0))
+    assert episodes_to_optimal == 300
+    assert agent.q_table.values.any()
+    assert agent.training_state == {"episode": 300, "epsilon": MIN_EPSILON}
+
+
+def test_train_batched_without_episodes_leaves_the_agent_untouched():
+    agent = QLearningAgent(alpha=0.5, gamma=0.9, backend="array", canonical=False)
+    agent.training_state = {"episode": 400, "epsilon": 0.6}
+    for decay in (None, 0.001):
+        assert train_batched(agent, episodes=0, epsilon_decay_gen=decay) == (agent, 0)
+    assert agent.training_state == {"episode": 400, "epsilon": 0.6}
+    assert not agent.q_table.values.any()
@@ -0,0 +1,103 @@
+import pickle
+import random
+
+import numpy as np
+
+from src.ai.q_table import ArrayQTable
+from src.ai.ql_agent import QLearningAgent
+from src.game_logic.engine import create_board
+from src.game_logic.symmetry import get_symmetry_table
+
+
+def play_and_learn(agent, seed):
+    """Partida de autojuego con actualizaciones TD, igual para ambos backends."""
+    rng = random.Random(seed)
+    board = create_board()
+    history = None
+    while not board.game_over:
+        state = agent.get_board_state_key(board)
+        action = rng.choice(list(board.get_available_moves()))
+        board.make_move(*action)
+        if history:
+            prev_state, prev_action = history
+            if board.game_over:
+                agent.learn(prev_state, prev_action, -1, None, [], True)
+            else:
+                next_state = agent.get_board_state_key(board)
+                agent.learn(prev_state, prev_action, 0, next_state, board.get_available_moves(), False)
+        history = (state, action)
+    agent.learn(history[0], history[1], 1 if board.winner else 0.5, None, [], True)
+
+
+def test_array_backend_matches_dict_backend(tmp_path):
+    dict_agent = QLearningAgent(alpha=0.3, gamma=0.8, backend="dict")
+    array_agent = QLearningAgent(alpha=0.3, gamma=0.8, backend="array")
+    for seed in range(200):
+        play_and_learn(dict_agent, seed)
+        play_and_learn(array_agent, seed)
+
+    converted = ArrayQTable.from_dict(dict_agent.q_table)
+    assert np.allclose(converted.values, array_agent.q_table.values, atol=1e-5)
+
+    # Un modelo dict guardado en disco debe cargarse en el backend array
+    model_path = tmp_path / "q_table.pkl"
+    dict_agent.save_model(str(model_path))
+    loaded = QLearningAgent(backend="array")
+    loaded.load_model(str(model_path))
+    assert np.allclose(loaded.q_table.values, converted.values)
+
+
+def test_array_backend_knows_only_visited_entries(tmp_path):
+    dict_agent = QLearningAgent(alpha=0.3, gamma=0.8, backend="dict")
+    array_agent = QLearningAgent(alpha=0.3, gamma=0.8, backend="array")
+    for seed in range(20):
+        play_and_learn(dict_agent, seed)
+        play_and_learn(array_agent, seed)
+    assert len(array_agent.q_table) == len(dict_agent.q_table)
+
+    # Las jugadas nunca visitadas no aparecen en la interfaz (ni con valor 0.0)
+    board = create_board()
+    for move in [(2, 2), (0, 0), (2, 1)]:
+        board.make_move(*move)
+        assert set(array_agent.get_q_values(board)) == set(dict_agent.get_q_values(board))
+    assert QLearningAgent(backend="array").get_q_values(board) == {}
+
+    # El modelo en disco es el dict clásico con las mismas claves
+    model_path = tmp_path / "q_table.pkl"
+    array_agent.save_model(str(model_path))
+    with open(model_path, "rb") as f:
+        assert set(pickle.load(f)) == set(dict_agent.q_table)
+
+
+def test_greedy_choice_is_legal_argmax():
+    agent = QLearningAgent(epsilon=0, backend="array")
+    board = create_board()
+    board.make_move(1, 1)
+    agent.q_table[(board.state_id, (0, 2))] = 0.7
+    agent.q_table[(board.state_id, (2, 0))] = 0.7
+    agent.q_table[(board.state_id, (1, 1))] = 5.0  # Casilla ocupada: nunca debe elegirse
+
+    choices = {agent.choose_action(board) for _ in range(50)}
+    assert choices == {(0, 2), (2, 0)}
+
+
+def test_canonical_mode_shares_values_across_symmetries():
+    table = get_symmetry_table()
+    assert table.num_states == 765  # Posiciones de 3x3 distintas salvo rotaciones y reflejos
+
+    for backend in ("array", "dict"):
+        agent = QLearningAgent(alpha=0.3, gamma=0.8, epsilon=0, backend=backend, canonical=True)
+        for seed in range(100):
+            play_and_learn(agent, seed)
+
+        # Esquina + borde contiguo y su imagen girada 90° deben ver los mismos valores Q (girados)
+        board, rotated = create_board(), create_board()
+        for move in [(0, 0), (0, 1)]:
+            board.make_move(*move)
+        for move in [(0, 2), (1, 2)]:
+            rotated.make_move(*move)
+        q_values, rotated_values = agent.get_q_values(board), agent.get_q_values(rotated)
+        assert q_values and {(col, 2 - row): q for (row, col), q in q_values.items()} == rotated_values
+
+        best = agent.choose_action(board)
+        assert q_values[best] == max(q_values.values())
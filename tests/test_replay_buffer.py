@@ -0,0 +1,61 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.ai.ql_agent import QLearningAgent
+from src.training.gym import train_with_decay
+from src.training.replay_buffer import ReplayBuffer
+
+
+def test_ring_buffer_overwrites_oldest_transitions():
+    buffer = ReplayBuffer(capacity=3)
+    for state_id in range(5):
+        buffer.push(state_id, (0, state_id % 3), 0.5, state_id + 1, state_id == 4)
+
+    assert len(buffer) == 3
+    assert buffer.states.dtype == np.uint16 and buffer.actions.dtype == np.int8
+    assert sorted(buffer.states.tolist()) == [2, 3, 4]
+    assert buffer.next_states.tolist() == [4, 0, 3]  # La terminal (estado 4) guarda 0 como estado siguiente
+
+
+def test_prioritized_sampling_follows_td_errors():
+    buffer = ReplayBuffer(capacity=5, prioritized=True, rng=np.random.default_rng(0))
+    for state_id in range(5):
+        buffer.push(state_id, (0, 0), 0.0, 0, True)
+    buffer.sample(5)  # Las transiciones nuevas entran con la misma prioridad
+    buffer.update_priorities(np.arange(5), np.array([0.0, 0.0, 0.0, 0.0, 10.0]))
+
+    indices, *_, weights = buffer.sample(2000)
+    assert np.mean(indices == 4) > 0.9
+    assert weights[indices == 4].max() < weights[indices != 4].min() == 1.0
+
+
+def test_batched_update_matches_sequential_learn():
+    agent = QLearningAgent(alpha=0.5, gamma=0.9, backend="array", canonical=False)
+    reference = QLearningAgent(alpha=0.5, gamma=0.9, backend="array", canonical=False)
+    reference.q_table.values[7] = agent.q_table.values[7] = np.linspace(-1, 1, 9)
+
+    buffer = ReplayBuffer(capacity=4)
+    buffer.push(3, (1, 1), 0.0, 7, False)
+    buffer.push(5, (0, 2), -1.0, None, True)
+    reference.learn(3, (1, 1), 0.0, 7, None, False)
+    reference.learn(5, (0, 2), -1.0, None, [], True)
+
+    states = np.array([3, 5])
+    td_errors = agent.q_table.update_batch(
+        states, np.array([4, 2]), buffer.rewards[:2], buffer.next_states[:2].astype(np.int64), buffer.done[:2], 0.5, 0.9
+    )
+    assert np.allclose(agent.q_table.values, reference.q_table.values)
+    assert np.allclose(td_errors, [0.9 * agent.q_table.max_q(7), -1.0])
+
+
+def test_train_with_decay_interleaves_replay():
+    random.seed(0)
+    agent = QLearningAgent(alpha=0.5, gamma=0.9, epsilon=1.0, backend="array", canonical=False)
+    buffer = ReplayBuffer(capacity=1000, prioritized=True, rng=np.random.default_rng(0))
+    train_with_decay(agent, episodes=50, replay=buffer, replay_steps=2)
+    assert len(buffer) > 50 * 5
+
+    with pytest.raises(ValueError):
+        train_with_decay(QLearningAgent(backend="dict"), episodes=1, replay=buffer)
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from src.ai.lookup_table import LookupTable
+from src.ai.retrograde import RetrogradeSolver
+
+
+class Interrupted(Exception):
+    pass
+
+
+def test_retrograde_matches_lookup_table_and_resumes(tmp_path):
+    output = str(tmp_path / "retro.bin")
+
+    def interrupt_midway(message):
+        if message.startswith("atrás nivel  5"):
+            raise Interrupted()
+
+    with pytest.raises(Interrupted):
+        RetrogradeSolver(output, 3, 3, 3, max_workers=2, chunk_size=500, log=interrupt_midway).solve()
+
+    # La segunda ejecución retoma desde el último nivel guardado
+    resumed = []
+    assert RetrogradeSolver(output, 3, 3, 3, max_workers=2, chunk_size=500, log=resumed.append).solve() == 5478
+    assert not any(message.startswith("adelante") for message in resumed)
+    assert not (tmp_path / "retro.bin.work").exists()  # Los niveles intermedios se borran al terminar
+
+    solved = LookupTable(output).records
+    reference = LookupTable("tictactoe_lookup.bin").records
+    # Las posiciones no terminales deben coincidir con la tabla de minimax (jugada, puntaje y máscara óptima)
+    non_terminal = reference["move"] >= 0
+    assert np.array_equal(solved[non_terminal], reference[non_terminal])
+    assert (solved["move"][~non_terminal] == -1).all()
@@ -0,0 +1,100 @@
+import os
+import pickle
+import random
+
+import numpy as np
+
+from src.ai.minimax_table import index_lookup_table
+from src.game_logic.engine import BOARD_ENGINES, create_board
+from src.game_logic.state_index import NUM_CODES, code_of, decode, get_state_index
+from src.game_logic.transitions import ARRAYS, TransitionTable, get_transition_table
+
+
+def test_reachable_state_count():
+    index = get_state_index()
+    assert index.num_states == 5478
+    assert index.codes == sorted(index.codes)
+    assert all(index.id_of_code(code) == i for i, code in enumerate(index.codes))
+
+
+def test_incremental_code_matches_matrix():
+    rng = random.Random(1)
+    index = get_state_index()
+    for engine in BOARD_ENGINES:
+        for _ in range(100):
+            board = create_board(engine)
+            while not board.game_over:
+                row, col = rng.choice(list(board.get_available_moves()))
+                prev_state = (board.turn, board.winner, board.game_over, board.win_info)
+                code_before = board.code
+
+                board.make_move(row, col)
+                board.undo_move(row, col, *prev_state)
+                assert board.code == code_before
+
+                board.make_move(row, col)
+                assert board.code == code_of(board.board)
+                assert decode(board.code) == board.board
+                assert index.id_of(board.board) == board.state_id >= 0
+
+
+def test_lookup_table_indexed_by_code():
+    with open("tictactoe_lookup.pkl", "rb") as f:
+        lookup_table = pickle.load(f)
+    moves_by_code = index_lookup_table(lookup_table)
+
+    assert len(moves_by_code) == NUM_CODES
+    for state_hash, move_data in list(lookup_table.items())[:200]:
+        matrix = [list(state_hash[i : i + 3]) for i in range(0, 9, 3)]
+        assert moves_by_code[code_of(matrix)] == move_data["move"]
+
+
+def test_transition_table_matches_board():
+    transitions = get_transition_table()
+    board = create_board()
+    seen = set()
+
+    def visit():
+        state = board.state_id
+        if state in seen:
+            return
+        seen.add(state)
+        assert transitions.terminal[state] == board.game_over
+        assert transitions.winner[state] == (board.winner or 0)
+        legal = [row * 3 + col for row, col in board.get_available_moves()] if not board.game_over else []
+        assert sorted(transitions.legal_mask[state].nonzero()[0].tolist()) == legal
+        for row, col in board.get_available_moves() if not board.game_over else ():
+            assert transitions.turn[state] == board.turn
+            prev_state = (board.turn, board.winner, board.game_over, board.win_info)
+            board.make_move(row, col)
+            assert transitions.next_state[state, row * 3 + col] == board.state_id
+            visit()
+            board.undo_move(row, col, *prev_state)
+
+    visit()
+    assert len(seen) == transitions.num_states
+
+
+def test_transition_table_disk_cache(tmp_path):
+    path = str(tmp_path / "lookup.transitions.npz")
+    built = TransitionTable()
+    built.save(path)
+    loaded = TransitionTable.load(path)
+    assert all(np.array_equal(getattr(loaded, name), getattr(built, name)) for name in ARRAYS)
+    assert loaded.num_states == built.num_states
+
+    # Tablas de otro índice de estados: se ignoran y se regeneran
+    np.savez(path, geometry=np.array(built.geometry), **{name: getattr(built, name)[:10] for name in ARRAYS})
+    assert TransitionTable.load(path) is None
+    assert TransitionTable.load(str(tmp_path / "missing.npz")) is None
+
+    # Archivo cortado a la mitad o sin alguna tabla: se trata como ausente
+    built.save(path)
+    with open(path, "rb") as f:
+        content = f.read()
+    with open(path, "wb") as f:
+        f.write(content[: len(content) // 2])
+    assert TransitionTable.load(path) is None
+    np.savez(path, geometry=np.array(built.geometry), codes=built.codes)
+    assert TransitionTable.load(path) is None
+    assert sorted(os.listdir(tmp_path)) == ["lookup.transitions.npz"]  # Sin temporales de save
@@ -0,0 +1,45 @@
+import pickle
+
+import numpy as np
+
+from src.ai.ql_agent import GeneticQLAgent, QLearningAgent
+from src.training.genetic_trainer import evaluate_individual_task
+from src.training.worker_pool import WorkerPool, default_workers
+
+
+def square_plus(value, offset):
+    return value * value + offset
+
+
+def test_pool_returns_every_task_result():
+    tasks = [(value, 1) for value in range(23)]
+    with WorkerPool(max_workers=2) as pool:
+        results = dict(pool.imap_unordered(square_plus, tasks, chunk_size=4))
+        # El mismo pool sirve para varias tandas (una por generación en el GA)
+        again = dict(pool.imap_unordered(square_plus, tasks[:3]))
+    assert results == {index: value * value + 1 for index, (value, _) in enumerate(tasks)}
+    assert again == {0: 1, 1: 2, 2: 5}
+
+
+def test_default_workers_is_positive():
+    assert default_workers() >= 1
+    assert default_workers(memory_per_worker=1 << 60) == 1
+
+
+def test_task_returns_compact_record_and_table_on_request(tmp_path):
+    individual = GeneticQLAgent(3, gen=(0.5, 0.9, 0.001))
+    record, _ = evaluate_individual_task({"agent": individual, "episodes": 300}, 1, 1, 0, 1)
+    assert set(record) == {"id", "fitness", "episodes_to_optimal"}
+    assert len(pickle.dumps(record)) < 200
+
+    table_path = str(tmp_path / "elite.pkl")
+    task = {"agent": individual, "episodes": 300, "keep_table": True, "table_path": table_path}
+    record, _ = evaluate_individual_task(task, 1, 1, 0, 1)
+    parent_copy = GeneticQLAgent(3, gen=(0.5, 0.9, 0.001))
+    parent_copy.apply_result(record)
+    assert parent_copy.fitness == record["fitness"]
+    assert np.array_equal(parent_copy.agent.q_table.values, individual.agent.q_table.values)
+
+    loaded = QLearningAgent()
+    loaded.load_model(parent_copy.table_path)
+    assert np.array_equal(loaded.q_table.values, individual.agent.q_table.values)